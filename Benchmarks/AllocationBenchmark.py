@@ -0,0 +1,116 @@
+# Benchmarks/AllocationBenchmark.py
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from PhySimEngine.Scenario import Scenario
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.LocalGravity import LocalGravity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+
+class AllocationBenchmark(Scenario):
+    """
+    Headless scene used to measure the memory traffic of the per-tick hot path.
+    Builds `count` bodies of the given kind in a world large enough to keep the density of BallDemo.
+    """
+
+    def __init__(self, kind: str, count: int):
+        self.kind = kind
+        self.count = count
+        self.size = int(900 * (count / 200) ** 0.5)
+        self.local_gravity_handler = LocalGravity(pygame.Vector2(0, 300))
+        self.global_gravity_handler = GlobalGravity(gravitational_constant=0.1)
+        super().__init__()
+
+    def configure(self) -> dict:
+        return {
+            "width": self.size,
+            "height": self.size,
+            "tps": 360,
+            "headless": True
+        }
+
+    def create_initial_entities(self):
+        random.seed(0)
+        if self.kind == "force_field":
+            for i in range(5):
+                self.entity_manager.add(
+                    ForceField(x=random.uniform(0, self.size), y=random.uniform(0, self.size), radius=self.size / 6,
+                               strength=500, direction_vector=pygame.Vector2(random.uniform(-1, 1), 1)))
+
+        for i in range(self.count):
+            x, y = random.uniform(0, self.size), random.uniform(0, self.size)
+            velocity = pygame.Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+            if self.kind == "gravity":
+                entity = GravityCircle(x=x, y=y, radius=10, color=(255, 255, 255), initial_velocity=velocity)
+            elif self.kind == "orbital":
+                entity = CircleOrbital(x=x, y=y, radius=5, color=(255, 255, 255), initial_velocity=velocity,
+                                       mass=random.uniform(5, 50))
+            else:
+                entity = ForceFieldCircle(x=x, y=y, radius=10, color=(255, 255, 255), initial_velocity=velocity)
+            self.entity_manager.add(entity)
+
+
+def measure(kind: str, count: int, ticks: int) -> dict:
+    """
+    Runs a scene and reports the traced memory traffic and garbage collector activity per tick.
+    :param kind: One of "gravity", "orbital" or "force_field".
+    :param count: Number of bodies.
+    :param ticks: Number of ticks for the timing and for the traced memory measurement.
+    :return: Dictionary with the measured values.
+    """
+    scenario = AllocationBenchmark(kind, count)
+    scenario.step(2)
+
+    collections = [0, 0.0]
+    started = [0.0]
+
+    def on_gc(phase, info):
+        if phase == "start":
+            started[0] = time.perf_counter()
+        else:
+            collections[0] += 1
+            collections[1] += time.perf_counter() - started[0]
+
+    gc.collect()
+    gc.callbacks.append(on_gc)
+    start_time = time.perf_counter()
+    scenario.step(ticks)
+    elapsed = time.perf_counter() - start_time
+    gc.callbacks.remove(on_gc)
+
+    # Tracing slows everything down, so the memory traffic is measured in separate ticks.
+    tracemalloc.start()
+    peak_per_tick = 0
+    for _ in range(ticks):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        scenario.step()
+        peak_per_tick = max(peak_per_tick, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        "kind": kind,
+        "count": count,
+        "peak_kib_per_tick": peak_per_tick / 1024,
+        "gc_collections": collections[0],
+        "gc_pause_ms": collections[1] * 1000,
+        "ms_per_tick": elapsed * 1000 / ticks,
+    }
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for kind, count in (("gravity", 1000), ("gravity", 10000), ("force_field", 1000), ("orbital", 1000)):
+        result = measure(kind, count, ticks)
+        print(f"{result['kind']:>11} {result['count']:>6}: {result['peak_kib_per_tick']:9.1f} KiB peak/tick, "
+              f"{result['gc_collections']:4d} GC runs ({result['gc_pause_ms']:7.2f} ms), "
+              f"{result['ms_per_tick']:8.2f} ms/tick")
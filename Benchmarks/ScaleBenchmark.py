@@ -0,0 +1,221 @@
+# Benchmarks/ScaleBenchmark.py
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from PhySimEngine.Profiler import Profiler
+from PhySimEngine.Scenario import Scenario
+from PhySimEngine.SpriteRenderer import SpriteRenderer
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.LocalGravity import LocalGravity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+SCENES = ("ball", "gravity", "force_field")
+SIZES = (100, 1000, 10000, 100000)
+# Above this many bodies the gravity scene uses Barnes-Hut, the exact sum would take minutes per tick.
+EXACT_GRAVITY_LIMIT = 1000
+PHASES = ("apply_changes", "broad_phase", "forces", "integrator", "collisions", "update")
+# Phases that changed by less than this are not reported by `compare`, short phases are dominated by timer noise.
+MIN_PHASE_CHANGE_MS = 0.05
+
+
+class ScaleBenchmark(Scenario):
+    """
+    Headless scenes modelled on the demos, scaled to `count` bodies at the density of the demo:
+    "ball" is BallDemo (local gravity and collisions), "gravity" is GravityDemo (N-body orbitals)
+    and "force_field" is ForceFieldDemo (circles pushed by force fields).
+    """
+
+    def __init__(self, scene: str, count: int, **overrides):
+        self.scene = scene
+        self.count = count
+        self.size = int(900 * (count / 200) ** 0.5)
+        self.local_gravity_handler = LocalGravity(pygame.Vector2(0, 300))
+        self.global_gravity_handler = GlobalGravity(gravitational_constant=0.1,
+                                                    theta=0.5 if count > EXACT_GRAVITY_LIMIT else None)
+        super().__init__(**overrides)
+
+    def configure(self) -> dict:
+        return {
+            "width": self.size,
+            "height": self.size,
+            "tps": 60,
+            "headless": True,
+            "seed": 0
+        }
+
+    def create_initial_entities(self):
+        if self.scene == "force_field":
+            for i in range(max(4, self.count // 1000)):
+                self.entity_manager.add(
+                    ForceField(x=random.uniform(0, self.size), y=random.uniform(0, self.size), radius=self.size / 8,
+                               strength=500, direction_vector=pygame.Vector2(random.uniform(-1, 1), 1)))
+
+        for i in range(self.count):
+            x, y = random.uniform(0, self.size), random.uniform(0, self.size)
+            velocity = pygame.Vector2(random.uniform(-50, 50), random.uniform(-50, 50))
+            color = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+            if self.scene == "ball":
+                entity = GravityCircle(x=x, y=y, radius=10, color=color, initial_velocity=velocity, restitution=0.3)
+            elif self.scene == "gravity":
+                entity = CircleOrbital(x=x, y=y, radius=random.randint(3, 8), color=color, initial_velocity=velocity,
+                                       mass=random.uniform(5, 50), restitution=0.5)
+            else:
+                entity = ForceFieldCircle(x=x, y=y, radius=10, color=color, initial_velocity=velocity)
+            self.entity_manager.add(entity)
+
+
+def measure(scene: str, count: int, ticks: int, time_budget: float) -> dict:
+    """
+    Runs a scene and reports its physics throughput, the time per phase, the time to render a frame
+    and the peak traced memory.
+    :param scene: One of `SCENES`.
+    :param count: Number of bodies.
+    :param ticks: Maximum number of measured ticks.
+    :param time_budget: Stops measuring after this many seconds, but runs at least one tick.
+    :return: Dictionary with the measured values.
+    """
+    profiler = Profiler(capacity=ticks, overlay=False)
+    scenario = ScaleBenchmark(scene, count, profiler=profiler)
+    scenario.step()
+    profiler.reset()
+    measured = 0
+    start_time = time.perf_counter()
+    while measured < ticks and (measured == 0 or time.perf_counter() - start_time < time_budget):
+        scenario.step()
+        measured += 1
+    elapsed = time.perf_counter() - start_time
+    phases = {phase: value for phase, value in profiler.get_averages(measured).items() if phase[:-3] in PHASES}
+
+    surface = pygame.Surface((scenario.width, scenario.height))
+    renderer = SpriteRenderer()
+    renderer.render(surface, scenario.entity_manager, (0, 20, 30))
+    frames = 0
+    render_start = time.perf_counter()
+    while frames < 10 and (frames == 0 or time.perf_counter() - render_start < time_budget / 4):
+        renderer.render(surface, scenario.entity_manager, (0, 20, 30))
+        frames += 1
+    render_time = (time.perf_counter() - render_start) / frames
+    scenario.close()
+
+    return {
+        "scene": scene,
+        "count": count,
+        "ticks": measured,
+        "ticks_per_second": measured / elapsed,
+        "ms_per_tick": elapsed * 1000 / measured,
+        "phase_ms": phases,
+        "render_ms": render_time * 1000,
+        "peak_mib": measure_peak_memory(scene, count, measured + 1) / 2 ** 20
+    }
+
+
+def measure_peak_memory(scene: str, count: int, ticks: int) -> int:
+    """
+    Repeats a whole run of a scene with tracing: building it, running its ticks and rendering a frame.
+    Tracing slows everything down, so it is kept out of the timed run.
+    :param scene: One of `SCENES`.
+    :param count: Number of bodies.
+    :param ticks: Number of ticks of the timed run, including the warm-up tick.
+    :return: The peak traced memory in bytes.
+    """
+    tracemalloc.start()
+    try:
+        scenario = ScaleBenchmark(scene, count, profiler=Profiler(capacity=ticks, overlay=False))
+        scenario.step(ticks)
+        SpriteRenderer().render(pygame.Surface((scenario.width, scenario.height)), scenario.entity_manager,
+                                (0, 20, 30))
+        scenario.close()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak_memory
+
+
+def run_suite(scenes, sizes, ticks: int, time_budget: float) -> dict:
+    results = []
+    for scene in scenes:
+        for count in sizes:
+            result = measure(scene, count, ticks, time_budget)
+            print(f"{scene:>11} {count:>6}: {result['ticks_per_second']:9.2f} ticks/s, "
+                  f"{result['render_ms']:8.2f} ms/frame, {result['peak_mib']:8.1f} MiB peak", flush=True)
+            results.append(result)
+    return {
+        "version": 1,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Compares two suite results and describes every scene that got slower, in total or in one of its phases,
+    or uses more memory.
+    :param baseline: The stored suite result.
+    :param current: The new suite result.
+    :param threshold: Relative change that is still accepted, e.g. 0.1 for 10%.
+    :return: One line per regression.
+    """
+    previous = {(result["scene"], result["count"]): result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get((result["scene"], result["count"]))
+        if old is None:
+            continue
+        name = f"{result['scene']} {result['count']}"
+        if result["ticks_per_second"] < old["ticks_per_second"] * (1 - threshold):
+            regressions.append(f"{name}: {old['ticks_per_second']:.2f} -> {result['ticks_per_second']:.2f} ticks/s")
+        for key, unit in (("render_ms", "ms/frame"), ("peak_mib", "MiB peak")):
+            if result[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name}: {old[key]:.2f} -> {result[key]:.2f} {unit}")
+        for phase, value in result["phase_ms"].items():
+            old_value = old["phase_ms"].get(phase)
+            if (old_value is not None and value > old_value * (1 + threshold)
+                    and value - old_value > MIN_PHASE_CHANGE_MS):
+                regressions.append(f"{name}: {old_value:.3f} -> {value:.3f} {phase[:-3]} ms/tick")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless physics, collision and rendering benchmarks at scale.")
+    parser.add_argument("command", choices=("run", "compare"),
+                        help="run: measure and save the results, compare: measure and check them against a baseline")
+    parser.add_argument("baseline", nargs="?", default="benchmark_baseline.json",
+                        help="JSON file the results are saved to or compared with")
+    parser.add_argument("--scenes", default=",".join(SCENES), help="comma separated scenes")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma separated body counts")
+    parser.add_argument("--ticks", type=int, default=50, help="maximum number of measured ticks per scene")
+    parser.add_argument("--time-budget", type=float, default=10.0, help="maximum measuring seconds per scene")
+    parser.add_argument("--threshold", type=float, default=0.1, help="accepted relative slowdown when comparing")
+    parser.add_argument("--current", help="compare this result file instead of measuring again")
+    args = parser.parse_args()
+
+    if args.command == "compare" and args.current:
+        with open(args.current) as file:
+            suite = json.load(file)
+    else:
+        suite = run_suite(args.scenes.split(","), [int(size) for size in args.sizes.split(",")],
+                          args.ticks, args.time_budget)
+
+    if args.command == "run":
+        with open(args.baseline, "w") as file:
+            json.dump(suite, file, indent=2)
+        print(f"Saved results to {args.baseline}")
+    else:
+        with open(args.baseline) as file:
+            found = compare(json.load(file), suite, args.threshold)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
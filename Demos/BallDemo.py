@@ -9,8 +9,8 @@ from PhySimObjects.PhysicsHandlers.LocalGravity import LocalGravity
 
 class BallDemo(Scenario):
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **overrides):
+        super().__init__(**overrides)
         self.local_gravity_handler = LocalGravity(pygame.Vector2(0, 300))
 
     def configure(self) -> dict:
@@ -18,11 +18,13 @@ class BallDemo(Scenario):
             "width": 1024,
             "height": 768,
             "title": "Physics Demo",
-            "tps": 360
+            "tps": 360,
+            "fixed_timestep": True,
+            "fps": 60
         }
 
     def create_initial_entities(self):
-        for i in range(200):
+        for i in range(self.config.get("balls", 200)):
             ball = GravityCircle(
                 x=randint(0, 1024),
                 y=randint(0, 768),
@@ -30,7 +32,7 @@ class BallDemo(Scenario):
                 color=(random() * 255, random() * 255, random() * 255),
                 initial_velocity=pygame.Vector2(random() * 100, random() * 100),
                 mass=1.0,
-                restitution=0.3
+                restitution=self.config.get("restitution", 0.3)
             )
             self.entity_manager.add(ball)
 
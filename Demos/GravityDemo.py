@@ -6,20 +6,22 @@ from PhySimEngine.Scenario import Scenario
 from PhySimObjects.CircleOrbital import CircleOrbital
 from PhySimObjects.GravityCircle import GravityCircle
 from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.VelocityVerletIntegrator import VelocityVerletIntegrator
 
 
 class GravityDemo(Scenario):
 
-    def __init__(self):
-        self.global_gravity_handler = GlobalGravity(gravitational_constant=0.1)
-        super().__init__()
+    def __init__(self, **overrides):
+        self.global_gravity_handler = GlobalGravity(gravitational_constant=overrides.get("G", 0.1))
+        super().__init__(**overrides)
 
     def configure(self) -> dict:
         return {
             "width": 1280,
             "height": 720,
             "title": "Orbital Collision Demo",
-            "tps": 300
+            "tps": 120,
+            "integrator": VelocityVerletIntegrator()
         }
 
     def create_initial_entities(self):
@@ -37,7 +39,7 @@ class GravityDemo(Scenario):
             )
         )
 
-        for i in range(10):
+        for i in range(self.config.get("bodies", 10)):
             self.entity_manager.add(
                 CircleOrbital(
                     x=random.randint(100, 700),
@@ -46,7 +48,7 @@ class GravityDemo(Scenario):
                     color=(random.randint(100, 255), random.randint(100, 255), random.randint(100, 255)),
                     initial_velocity=pygame.Vector2(random.randint(0, 100), random.randint(0, 100)),
                     mass=random.uniform(5, 50),
-                    restitution=0.5
+                    restitution=self.config.get("restitution", 0.5)
                 )
             )
 
@@ -0,0 +1,16 @@
+from Demos.GravityDemo import GravityDemo
+from PhySimEngine.SweepRunner import SweepRunner
+
+
+if __name__ == "__main__":
+    sweep = SweepRunner(
+        GravityDemo,
+        grid={
+            "G": [0.05, 0.1, 0.2],
+            "restitution": [0.3, 0.5],
+            "seed": [0, 1]
+        },
+        ticks=1200
+    )
+    rows = sweep.run()
+    print(SweepRunner.format_table(rows))
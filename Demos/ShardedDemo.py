@@ -0,0 +1,66 @@
+import argparse
+import time
+
+import numpy as np
+import pygame
+
+from PhySimEngine.ShardedWorld import ShardedWorld
+
+
+def create_world(bodies: int, columns: int, rows: int, seed: int = 0) -> ShardedWorld:
+    """
+    BallDemo scaled to the given number of bodies at the same density, split into columns x rows tiles.
+    """
+    scale = (bodies / 200) ** 0.5
+    width, height = int(1024 * scale), int(768 * scale)
+    world = ShardedWorld((0, 0, width, height), columns, rows, gravity=(0, 300), max_radius=10)
+    generator = np.random.default_rng(seed)
+    world.add_bodies(position=generator.uniform((0, 0), (width, height), (bodies, 2)),
+                     velocity=generator.uniform(0, 100, (bodies, 2)),
+                     radius=10, mass=1.0, restitution=0.3,
+                     color=generator.integers(0, 256, (bodies, 3)))
+    return world
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BallDemo with up to millions of bodies in tiles of worker processes.")
+    parser.add_argument("--bodies", type=int, default=100000)
+    parser.add_argument("--columns", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=2)
+    parser.add_argument("--tps", type=int, default=120, help="ticks per simulated second")
+    parser.add_argument("--ticks", type=int, default=0, help="run this many ticks headless and report the tick rate")
+    args = parser.parse_args()
+
+    # The workers are started before the window is opened.
+    world = create_world(args.bodies, args.columns, args.rows)
+    try:
+        if args.ticks:
+            start = time.perf_counter()
+            world.step(args.ticks, 1 / args.tps)
+            elapsed = time.perf_counter() - start
+            print(f"{args.bodies} bodies in {args.columns * args.rows} tiles: {args.ticks / elapsed:.2f} ticks/s")
+            busiest = max(world.tile_cpu_times) / args.ticks
+            print(f"busiest tile: {busiest * 1000:.1f} ms of CPU time per tick, "
+                  f"at most {1 / busiest:.2f} ticks/s with a core per tile")
+        else:
+            pygame.init()
+            screen = pygame.display.set_mode((1024, 768))
+            clock = pygame.time.Clock()
+            running, paused = True, False
+            while running:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                        running = False
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                        paused = not paused
+                start = time.perf_counter()
+                if not paused:
+                    world.step(1, 1 / args.tps)
+                tick_time = time.perf_counter() - start
+                world.render(screen)
+                pygame.display.set_caption(f"{args.bodies} bodies, tick {tick_time * 1000:.1f} ms")
+                pygame.display.flip()
+                clock.tick(60)
+            pygame.quit()
+    finally:
+        world.close()
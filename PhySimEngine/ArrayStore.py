@@ -0,0 +1,93 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from PhySimEngine.Entity import Entity
+
+
+class ArrayStore:
+    """
+    Structure-of-arrays storage for the physical state of entities.
+    Positions, velocities, forces, masses, radii and restitutions are kept in contiguous NumPy
+    arrays, one row per entity, so the physics can be computed by vectorized kernels.
+    While the store is active it holds the authoritative state; the entities only mirror it
+    and are refreshed with `push()` whenever they are read (e.g. before rendering).
+    The entities can't be views of the arrays, their positions and velocities are `pygame.Vector2`
+    objects that own their values, so a mirror written back on demand is the cheapest way to keep
+    every entity method working unchanged. `push()` only writes after the arrays changed.
+    """
+
+    def __init__(self, kinds: dict[type, int]):
+        """
+        Initializes an empty store.
+        :param kinds: Maps the supported entity classes to the integer kind stored per row.
+                      Entities that are not an instance of any of these classes are not stored.
+        """
+        if np is None:
+            raise ImportError("The array store requires NumPy. Install it with `pip install numpy`.")
+        self.kinds = kinds
+        self.entities: list[Entity] = []
+        self.rows: dict[int, int] = {}
+        self.position = np.zeros((0, 2))
+        self.velocity = np.zeros((0, 2))
+        self.force = np.zeros((0, 2))
+        self.mass = np.zeros(0)
+        self.radius = np.zeros(0)
+        self.restitution = np.zeros(0)
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.entities_stale = False
+
+    def get_kind(self, entity: Entity) -> int | None:
+        """
+        Returns the kind of the entity, or None if it is not supported by the store.
+        :param entity: The entity to classify.
+        """
+        for cls, kind in self.kinds.items():
+            if isinstance(entity, cls):
+                return kind
+        return None
+
+    def contains(self, entity: Entity) -> bool:
+        """
+        Checks if an entity is backed by the store.
+        :param entity: The entity to check.
+        :return: True if the entity has a row in the store, False otherwise.
+        """
+        return id(entity) in self.rows
+
+    def rebuild(self, entities: tuple[Entity, ...]):
+        """
+        Writes the current state back to the stored entities and reloads the arrays from the given entities.
+        Called whenever entities are added or removed.
+        :param entities: All entities of the entity manager.
+        """
+        self.push()
+        self.entities = [e for e in entities if self.get_kind(e) is not None]
+        self.rows = {id(e): row for row, e in enumerate(self.entities)}
+        self.pull()
+
+    def pull(self):
+        """Reloads all arrays from the attributes of the stored entities."""
+        entities = self.entities
+        count = len(entities)
+        self.position = np.array([(e.position.x, e.position.y) for e in entities], dtype=np.float64).reshape(count, 2)
+        self.velocity = np.array([(e.velocity.x, e.velocity.y) for e in entities], dtype=np.float64).reshape(count, 2)
+        self.force = np.zeros((count, 2))
+        self.mass = np.array([e.mass for e in entities], dtype=np.float64)
+        self.radius = np.array([e.radius for e in entities], dtype=np.float64)
+        self.restitution = np.array([e.restitution for e in entities], dtype=np.float64)
+        self.kind = np.array([self.get_kind(e) for e in entities], dtype=np.int8)
+        self.entities_stale = False
+
+    def push(self):
+        """
+        Writes the positions and velocities of the arrays back into the stored entities,
+        if they changed since the last push.
+        """
+        if not self.entities_stale:
+            return
+        self.entities_stale = False
+        for entity, position, velocity in zip(self.entities, self.position.tolist(), self.velocity.tolist()):
+            entity.position.update(position)
+            entity.velocity.update(velocity)
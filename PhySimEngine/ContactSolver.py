@@ -0,0 +1,309 @@
+from PhySimEngine.Entity import Entity
+
+# Keys of the warm starting cache for contacts with the world borders, paired with the entity id.
+LEFT, RIGHT, TOP, BOTTOM = -1, -2, -3, -4
+
+
+class ContactSolver:
+    """
+    Sequential impulse contact solver. Instead of resolving every pair once with its own impulse and
+    position correction, the contacts of a tick are collected first and their impulses are solved
+    together in `iterations` passes, so the impulses of a stack propagate from its top to the ground.
+    The accumulated impulse of every contact is cached by the ids of its entities and applied again
+    at the start of the next tick (warm starting), which lets resting stacks converge within a few
+    iterations. Overlaps beyond `slop` are removed by `position_iterations` passes of position correction
+    that don't add any velocity.
+
+    Entities opt in with `get_contact(other)`, which returns the contact normal pointing from the other
+    entity to this one, the penetration depth and the restitution, or None if they don't touch.
+    Entities that also implement `get_border_radius()` get contacts with the world borders.
+    The contact is taken from whichever entity of a pair returns one, and pairs without a contact are
+    still handed to `Scenario.resolve_pair`.
+    The solved velocity and position changes are written to `pending_velocity_change` and
+    `pending_position_correction`, so the entities apply them in their `update` phase as before.
+    Select it by returning `"contact_solver": ContactSolver()` from `Scenario.configure()`.
+    """
+
+    def __init__(self, iterations: int = 8, position_iterations: int = 3, warm_starting: bool = True,
+                 slop: float = 0.5, correction_factor: float = 0.2, restitution_threshold: float = 20.0):
+        """
+        :param iterations: Number of velocity passes over all contacts per tick.
+        :param position_iterations: Number of position correction passes over all contacts per tick.
+        :param warm_starting: Starts every contact from the impulse it ended with in the previous tick.
+        :param slop: Penetration depth that is left uncorrected, so resting contacts keep touching.
+        :param correction_factor: Fraction of the remaining penetration that is corrected per position pass.
+        :param restitution_threshold: Approach speed below which contacts don't bounce. It has to be larger
+                                      than the speed gravity adds in a tick, otherwise resting bodies jitter.
+        """
+        self.iterations = iterations
+        self.position_iterations = position_iterations
+        self.warm_starting = warm_starting
+        self.slop = slop
+        self.correction_factor = correction_factor
+        self.restitution_threshold = restitution_threshold
+        self.impulses: dict[tuple[int, int], float] = {}
+
+    def reset(self):
+        """Forgets the cached impulses, e.g. after the entities were replaced."""
+        self.impulses = {}
+
+    def solve(self, scenario, delta_time: float):
+        """
+        Collects the contacts of the candidate pairs of the broad phase and the world borders and solves them.
+        Called by the scenario in place of its narrow phase.
+        :param scenario: The scenario whose collisions are resolved.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        sleep_manager = scenario.sleep_manager
+        continuous = scenario.continuous_collisions
+
+        # Bodies are numbered in the order they are first touched and their state is kept in flat lists.
+        indices: dict[Entity, int] = {}
+        bodies = []
+        inverse_masses = []
+        velocities_x = []
+        velocities_y = []
+
+        def get_index(body: Entity) -> int:
+            index = indices.get(body)
+            if index is None:
+                index = indices[body] = len(bodies)
+                bodies.append(body)
+                mass = body.get_mass() if hasattr(body, 'get_mass') else 0.0
+                velocity = getattr(body, 'velocity', None)
+                if velocity is None or mass <= 0 or (sleep_manager is not None and sleep_manager.is_sleeping(body)):
+                    # Sleeping bodies are static obstacles until their island wakes up.
+                    inverse_masses.append(0.0)
+                    velocities_x.append(0.0 if velocity is None else velocity.x)
+                    velocities_y.append(0.0 if velocity is None else velocity.y)
+                else:
+                    inverse_mass = 1.0 / mass
+                    inverse_masses.append(inverse_mass)
+                    # The velocity the body would have at the end of the tick without any contact.
+                    force = getattr(body, 'force_accumulated', None)
+                    if force is None:
+                        velocities_x.append(velocity.x)
+                        velocities_y.append(velocity.y)
+                    else:
+                        velocities_x.append(velocity.x + force.x * inverse_mass * delta_time)
+                        velocities_y.append(velocity.y + force.y * inverse_mass * delta_time)
+            return index
+
+        # Contacts are stored as parallel lists: bodies, normal, penetration, restitution and cache key.
+        # Border contacts use -1 as the second body.
+        first = []
+        second = []
+        normals_x = []
+        normals_y = []
+        penetrations = []
+        restitutions = []
+        keys = []
+
+        for entity, other in scenario.entity_manager.get_collision_pairs():
+            if sleep_manager is not None and sleep_manager.is_sleeping(entity) and sleep_manager.is_sleeping(other):
+                continue
+            get_contact = getattr(entity, 'get_contact', None)
+            contact = None if get_contact is None else get_contact(other)
+            if contact is None and hasattr(other, 'get_contact'):
+                # Like `Scenario.resolve_pair`, the pair is solved whichever of the two entities knows the other.
+                contact = other.get_contact(entity)
+                if contact is not None:
+                    entity, other = other, entity
+            if contact is None:
+                if not entity.get_collision_shape().intersects(other.get_collision_shape(),
+                                                               entity.position, other.position):
+                    if not continuous or not scenario.resolve_swept_collision(entity, other, delta_time):
+                        continue
+                elif not scenario.resolve_pair(entity, other):
+                    continue
+                if sleep_manager is not None:
+                    # Both bodies were changed, so a sleeping one has to wake up to receive its part.
+                    sleep_manager.add_contact(entity, other)
+                    sleep_manager.add_touched(entity, other)
+                continue
+            if sleep_manager is not None:
+                sleep_manager.add_contact(entity, other)
+            first.append(get_index(entity))
+            second.append(get_index(other))
+            normals_x.append(contact[0])
+            normals_y.append(contact[1])
+            penetrations.append(contact[2])
+            restitutions.append(contact[3])
+            if entity.entity_id < other.entity_id:
+                keys.append((entity.entity_id, other.entity_id))
+            else:
+                keys.append((other.entity_id, entity.entity_id))
+
+        def add_border_contact(entity: Entity, border: int, normal_x: float, normal_y: float, penetration: float):
+            first.append(get_index(entity))
+            second.append(-1)
+            normals_x.append(normal_x)
+            normals_y.append(normal_y)
+            penetrations.append(penetration)
+            restitutions.append(getattr(entity, 'restitution', 0.0))
+            keys.append((entity.entity_id, border))
+
+        world_rect = scenario.world_rect
+        left, right, top, bottom = world_rect.left, world_rect.right, world_rect.top, world_rect.bottom
+        # Bodies slightly apart from a border get a contact as well, so they settle on it without bouncing.
+        margin = -self.slop
+        for entity in scenario.get_active_entities():
+            if not hasattr(entity, 'get_border_radius'):
+                continue
+            radius = entity.get_border_radius()
+            x, y = entity.position
+            if left + radius - x > margin:
+                add_border_contact(entity, LEFT, 1.0, 0.0, left + radius - x)
+            if x + radius - right > margin:
+                add_border_contact(entity, RIGHT, -1.0, 0.0, x + radius - right)
+            if top + radius - y > margin:
+                add_border_contact(entity, TOP, 0.0, 1.0, top + radius - y)
+            if y + radius - bottom > margin:
+                add_border_contact(entity, BOTTOM, 0.0, -1.0, y + radius - bottom)
+
+        if not first:
+            self.impulses = {}
+            return
+
+        self.solve_velocities(first, second, normals_x, normals_y, penetrations, restitutions, keys,
+                              inverse_masses, velocities_x, velocities_y, delta_time)
+        corrections_x, corrections_y = self.solve_positions(first, second, normals_x, normals_y, penetrations,
+                                                            inverse_masses)
+
+        for index, body in enumerate(bodies):
+            if inverse_masses[index] == 0.0:
+                continue
+            velocity = body.velocity
+            force = getattr(body, 'force_accumulated', None)
+            change_x = velocities_x[index] - velocity.x
+            change_y = velocities_y[index] - velocity.y
+            if force is not None:
+                change_x -= force.x * inverse_masses[index] * delta_time
+                change_y -= force.y * inverse_masses[index] * delta_time
+            body.pending_velocity_change.x += change_x
+            body.pending_velocity_change.y += change_y
+            body.pending_position_correction.x += corrections_x[index]
+            body.pending_position_correction.y += corrections_y[index]
+
+    def solve_velocities(self, first: list[int], second: list[int], normals_x: list[float], normals_y: list[float],
+                         penetrations: list[float], restitutions: list[float], keys: list[tuple[int, int]],
+                         inverse_masses: list[float], velocities_x: list[float], velocities_y: list[float],
+                         delta_time: float):
+        """
+        Solves the normal impulses of all contacts and updates the body velocities in place.
+        Contacts that are still apart (negative penetration) only keep the bodies from closing the gap
+        within the tick. Restitution is applied in a final pass, after the resting contacts have been solved,
+        so a bounce doesn't fight the warm started impulses of a stack. The warm starting cache stores the
+        impulses from before that pass, as a bounce applied again in the next tick makes piles jitter.
+        """
+        count = len(first)
+        cached = self.impulses if self.warm_starting else {}
+        impulses = [0.0] * count
+        normal_masses = [0.0] * count
+        target_velocities = [0.0] * count
+        approach_velocities = [0.0] * count
+
+        active = []
+        for i in range(count):
+            a, b = first[i], second[i]
+            normal_x, normal_y = normals_x[i], normals_y[i]
+            inverse_mass_a = inverse_masses[a]
+            inverse_mass_b = inverse_masses[b] if b >= 0 else 0.0
+            if inverse_mass_a + inverse_mass_b == 0:
+                continue
+            active.append(i)
+            normal_masses[i] = 1.0 / (inverse_mass_a + inverse_mass_b)
+
+            velocity_along_normal = velocities_x[a] * normal_x + velocities_y[a] * normal_y
+            if b >= 0:
+                velocity_along_normal -= velocities_x[b] * normal_x + velocities_y[b] * normal_y
+            approach_velocities[i] = velocity_along_normal
+            if penetrations[i] < 0:
+                target_velocities[i] = penetrations[i] / delta_time
+
+            impulse = cached.get(keys[i], 0.0)
+            if impulse:
+                impulses[i] = impulse
+                velocities_x[a] += normal_x * impulse * inverse_mass_a
+                velocities_y[a] += normal_y * impulse * inverse_mass_a
+                if b >= 0:
+                    velocities_x[b] -= normal_x * impulse * inverse_mass_b
+                    velocities_y[b] -= normal_y * impulse * inverse_mass_b
+
+        rows = [(i, first[i], second[i], normals_x[i], normals_y[i], normal_masses[i], target_velocities[i],
+                 inverse_masses[first[i]], inverse_masses[second[i]] if second[i] >= 0 else 0.0) for i in active]
+        for iteration in range(self.iterations):
+            self.relax(rows, impulses, velocities_x, velocities_y)
+        # The bounce of the restitution pass belongs to this tick only. Warm starting the next tick with it
+        # pushes resting neighbours apart again, so the cache keeps the impulses of the resting contacts.
+        self.impulses = dict(zip(keys, impulses))
+
+        threshold = -self.restitution_threshold
+        bounces = [row[:6] + (-restitutions[row[0]] * approach_velocities[row[0]],) + row[7:] for row in rows
+                   if approach_velocities[row[0]] < threshold and impulses[row[0]] > 0.0 and penetrations[row[0]] >= 0]
+        if bounces:
+            self.relax(bounces, impulses, velocities_x, velocities_y)
+
+    @staticmethod
+    def relax(rows: list[tuple], impulses: list[float], velocities_x: list[float], velocities_y: list[float]):
+        """
+        Runs one pass over the given contacts, changing the impulse of each so the bodies reach the target
+        velocity along its normal, and updates the impulses and body velocities in place.
+        :param rows: Per contact its index, the indices of both bodies (-1 for a border), the normal, the normal
+                     mass, the target velocity along the normal and the inverse masses of both bodies.
+        """
+        for i, a, b, normal_x, normal_y, normal_mass, target_velocity, inverse_mass_a, inverse_mass_b in rows:
+            if b >= 0:
+                velocity_along_normal = ((velocities_x[a] - velocities_x[b]) * normal_x
+                                         + (velocities_y[a] - velocities_y[b]) * normal_y)
+            else:
+                velocity_along_normal = velocities_x[a] * normal_x + velocities_y[a] * normal_y
+            # Contacts can only push, so the accumulated impulse is clamped instead of each step.
+            previous = impulses[i]
+            impulse = previous + (target_velocity - velocity_along_normal) * normal_mass
+            if impulse < 0.0:
+                impulse = 0.0
+            impulses[i] = impulse
+            change = impulse - previous
+            velocities_x[a] += normal_x * change * inverse_mass_a
+            velocities_y[a] += normal_y * change * inverse_mass_a
+            if b >= 0:
+                velocities_x[b] -= normal_x * change * inverse_mass_b
+                velocities_y[b] -= normal_y * change * inverse_mass_b
+
+    def solve_positions(self, first: list[int], second: list[int], normals_x: list[float], normals_y: list[float],
+                        penetrations: list[float], inverse_masses: list[float]) -> tuple[list[float], list[float]]:
+        """
+        Pushes overlapping bodies apart without changing their velocities.
+        The penetration of a contact is updated linearly from the corrections of the earlier passes.
+        :return: The position correction of every body along x and y.
+        """
+        corrections_x = [0.0] * len(inverse_masses)
+        corrections_y = [0.0] * len(inverse_masses)
+        slop = self.slop
+        correction_factor = self.correction_factor
+
+        for iteration in range(self.position_iterations):
+            for i in range(len(first)):
+                a, b = first[i], second[i]
+                inverse_mass_a = inverse_masses[a]
+                inverse_mass_b = inverse_masses[b] if b >= 0 else 0.0
+                inverse_mass_sum = inverse_mass_a + inverse_mass_b
+                if inverse_mass_sum == 0:
+                    continue
+                normal_x, normal_y = normals_x[i], normals_y[i]
+                separation = corrections_x[a] * normal_x + corrections_y[a] * normal_y
+                if b >= 0:
+                    separation -= corrections_x[b] * normal_x + corrections_y[b] * normal_y
+                penetration = penetrations[i] - separation - slop
+                if penetration <= 0:
+                    continue
+
+                impulse = correction_factor * penetration / inverse_mass_sum
+                corrections_x[a] += normal_x * impulse * inverse_mass_a
+                corrections_y[a] += normal_y * impulse * inverse_mass_a
+                if b >= 0:
+                    corrections_x[b] -= normal_x * impulse * inverse_mass_b
+                    corrections_y[b] -= normal_y * impulse * inverse_mass_b
+
+        return corrections_x, corrections_y
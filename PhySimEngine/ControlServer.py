@@ -0,0 +1,276 @@
+import asyncio
+import inspect
+import json
+import math
+import types
+import typing
+from collections import deque
+
+import pygame
+
+from PhySimEngine.Entity import Entity
+
+
+class ControlServer:
+    """
+    Local TCP endpoint to observe and steer a scenario that runs with `Scenario.run_async()`.
+    Clients exchange newline-delimited JSON. Every `every`-th tick all clients receive a telemetry line
+    `{"type": "telemetry", "tick": ..., "entities": ..., "tick_ms": ..., "kinetic_energy": ..., "paused": ...,
+    "speed": ...}`. Commands are sent one JSON object per line:
+        {"command": "pause"}  toggles the pause, {"command": "pause", "paused": true} sets it
+        {"command": "set_speed", "speed": 2.0}
+        {"command": "add", "entity": "CircleOrbital", "args": {"x": 100, "y": 100, ..., "initial_velocity": [0, 50]}}
+        {"command": "remove", "entity_id": 3}
+    They are queued and applied by the scenario between two frames, and each one is answered with
+    a `{"type": "reply", ...}` line. Added entities are built from the classes in `entity_types`. Their arguments
+    are checked against the annotations of the constructor before the entity is queued: numbers have to be
+    finite, `pygame.Vector2` parameters take a list of two numbers and tuple parameters a list of numbers.
+    The speed has to be a finite, non-negative number.
+    The physics loop never waits for a client: telemetry is written without awaiting the socket and is
+    dropped for clients whose unsent output exceeds `max_buffer` bytes.
+    Select it by returning `"control_server": ControlServer(...)` from `Scenario.configure()`.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, every: int = 1,
+                 entity_types: dict[str, type] | None = None, max_buffer: int = 65536):
+        """
+        :param host: Interface to listen on. Keep the default to only accept local clients.
+        :param port: Port to listen on, 0 picks a free one that is stored in `port` once started.
+        :param every: Sends telemetry only every n-th tick.
+        :param entity_types: Entity classes that clients may add, by name.
+        :param max_buffer: Unsent bytes of a client above which its telemetry is dropped.
+        """
+        self.host = host
+        self.port = port
+        self.every = every
+        self.entity_types = entity_types or {}
+        self.max_buffer = max_buffer
+        self.server: asyncio.Server | None = None
+        self.clients: list[asyncio.StreamWriter] = []
+        self.client_tasks: set[asyncio.Task] = set()
+        self.commands: deque[tuple[asyncio.StreamWriter, dict]] = deque()
+        self.entities: tuple[Entity, ...] | None = None
+        self.bodies: list[Entity] = []
+        self.dropped = 0
+
+    async def start(self):
+        """Starts listening. Called by `Scenario.run_async()`."""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops listening, disconnects all clients and waits until their connections are handled."""
+        if self.server is not None:
+            self.server.close()
+        for writer in self.clients:
+            writer.close()
+        self.clients = []
+        tasks = list(self.client_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self.client_tasks.add(task)
+        self.clients.append(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("a command has to be a JSON object")
+                except ValueError as error:
+                    self.send(writer, {"type": "reply", "ok": False, "error": str(error)})
+                    continue
+                self.commands.append((writer, message))
+        except (ConnectionError, ValueError):
+            # ValueError is raised for lines longer than the stream limit.
+            pass
+        except asyncio.CancelledError:
+            # Cancelled by `stop`, which closes the connection.
+            pass
+        finally:
+            if writer in self.clients:
+                self.clients.remove(writer)
+            writer.close()
+            self.client_tasks.discard(task)
+
+    def send(self, writer: asyncio.StreamWriter, message: dict) -> bool:
+        """
+        Queues a message for a client without waiting for it to be sent.
+        :param writer: The stream of the client.
+        :param message: The message to send as a JSON line.
+        :return: False if the message was dropped because the client doesn't keep up.
+        """
+        if writer.is_closing() or writer.transport.get_write_buffer_size() > self.max_buffer:
+            return False
+        writer.write(json.dumps(message).encode() + b"\n")
+        return True
+
+    def apply_commands(self, scenario):
+        """
+        Applies all queued commands to the scenario and answers them.
+        Called by the scenario between two frames.
+        :param scenario: The running scenario.
+        """
+        while self.commands:
+            writer, message = self.commands.popleft()
+            command = message.get("command")
+            try:
+                reply = self.execute(scenario, command, message)
+            except (KeyError, TypeError, ValueError) as error:
+                reply = {"ok": False, "error": f"{type(error).__name__}: {error.args[0] if error.args else ''}"}
+            else:
+                reply["ok"] = True
+            reply["type"] = "reply"
+            reply["command"] = command
+            self.send(writer, reply)
+
+    def execute(self, scenario, command: str, message: dict) -> dict:
+        """
+        Runs a single command.
+        :param scenario: The running scenario.
+        :param command: The name of the command.
+        :param message: The whole command message with its arguments.
+        :return: The values of the reply.
+        """
+        if command == "pause":
+            paused = message.get("paused")
+            if paused is None or bool(paused) != scenario.paused:
+                scenario.pause()
+            return {"paused": scenario.paused}
+        if command == "set_speed":
+            speed = self.convert_argument("speed", float, message["speed"])
+            if speed < 0:
+                raise ValueError(f"speed has to be at least 0, not {speed}")
+            scenario.set_speed(float(speed))
+            return {"speed": scenario.speed}
+        if command == "add":
+            entity = self.create_entity(message["entity"], message.get("args", {}))
+            scenario.entity_manager.add(entity)
+            return {"entity_id": entity.entity_id}
+        if command == "remove":
+            entity_id = message["entity_id"]
+            if not is_number(entity_id) or isinstance(entity_id, float) and not entity_id.is_integer():
+                raise TypeError(f"entity_id has to be an integer, not {entity_id!r}")
+            entity_id = int(entity_id)
+            entity = scenario.entity_manager.get_entity(entity_id)
+            if entity is None:
+                raise KeyError(f"no entity with id {entity_id}")
+            scenario.entity_manager.remove(entity)
+            return {"entity_id": entity_id}
+        raise ValueError(f"unknown command {command!r}")
+
+    def create_entity(self, name: str, arguments: dict) -> Entity:
+        """
+        Builds an entity of one of the `entity_types` from JSON arguments.
+        :param name: The name of the entity type.
+        :param arguments: The keyword arguments of its constructor.
+        :return: The entity. Any error its constructor raises is turned into a ValueError.
+        """
+        cls = self.entity_types.get(name)
+        if cls is None:
+            raise KeyError(f"unknown entity type {name!r}")
+        if not isinstance(arguments, dict):
+            raise TypeError("the arguments of an entity have to be a JSON object")
+        parameters = inspect.signature(cls, eval_str=True).parameters
+        converted = {}
+        for key, value in arguments.items():
+            parameter = parameters.get(key)
+            if parameter is None or parameter.kind not in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY):
+                raise TypeError(f"{name} has no parameter {key!r}")
+            converted[key] = self.convert_argument(key, parameter.annotation, value)
+        missing = [key for key, parameter in parameters.items()
+                   if parameter.default is parameter.empty and key not in converted
+                   and parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY)]
+        if missing:
+            raise TypeError(f"{name} is missing the arguments {', '.join(missing)}")
+        try:
+            return cls(**converted)
+        except Exception as error:
+            # Whatever the constructor raises for the values of a client is answered instead of ending the loop.
+            raise ValueError(f"{name} rejected its arguments with {type(error).__name__}: {error}") from error
+
+    def convert_argument(self, key: str, annotation, value):
+        """
+        Checks a JSON value against the annotation of a parameter and converts it to the annotated type.
+        :param key: The name of the parameter, used in error messages.
+        :param annotation: The annotation of the parameter, `inspect.Parameter.empty` if it has none.
+        :param value: The value decoded from JSON.
+        :return: The converted value.
+        """
+        if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+            options = typing.get_args(annotation)
+            if value is None and type(None) in options:
+                return None
+            for option in options:
+                if option is not type(None):
+                    try:
+                        return self.convert_argument(key, option, value)
+                    except (TypeError, ValueError):
+                        pass
+            raise TypeError(f"{key} has to be a {annotation}, not {value!r}")
+        if annotation is bool:
+            if not isinstance(value, bool):
+                raise TypeError(f"{key} has to be true or false, not {value!r}")
+            return value
+        if annotation in (int, float) or annotation is inspect.Parameter.empty:
+            if annotation is inspect.Parameter.empty and isinstance(value, (bool, str)):
+                return value
+            if not is_number(value):
+                raise TypeError(f"{key} has to be a number, not {value!r}")
+            if not math.isfinite(value):
+                raise ValueError(f"{key} has to be finite, not {value!r}")
+            return value
+        if annotation is pygame.Vector2:
+            if not isinstance(value, list) or len(value) != 2:
+                raise TypeError(f"{key} has to be a list of two numbers, not {value!r}")
+            return pygame.Vector2([self.convert_argument(key, float, item) for item in value])
+        if annotation is tuple or typing.get_origin(annotation) is tuple:
+            if not isinstance(value, list):
+                raise TypeError(f"{key} has to be a list of numbers, not {value!r}")
+            return tuple(self.convert_argument(key, float, item) for item in value)
+        if annotation is str:
+            if not isinstance(value, str):
+                raise TypeError(f"{key} has to be a string, not {value!r}")
+            return value
+        raise TypeError(f"{key} of type {annotation} can't be set by a client")
+
+    def record(self, scenario, tick_time: float):
+        """
+        Sends the telemetry of the current tick to all clients, if it is sent in this tick.
+        Called by the scenario after every tick.
+        :param scenario: The running scenario.
+        :param tick_time: Wall time of the tick in seconds.
+        """
+        if not self.clients or scenario.tick_count % self.every:
+            return
+        scenario.entity_manager.sync_entities()
+        entities = scenario.entity_manager.get_entities()
+        if entities is not self.entities:
+            self.entities = entities
+            self.bodies = [entity for entity in entities if hasattr(entity, 'mass') and hasattr(entity, 'velocity')]
+        message = {
+            "type": "telemetry",
+            "tick": scenario.tick_count,
+            "entities": len(entities),
+            "tick_ms": tick_time * 1000,
+            "kinetic_energy": sum(0.5 * body.mass * body.velocity.length_squared() for body in self.bodies),
+            "paused": scenario.paused,
+            "speed": scenario.speed
+        }
+        for writer in self.clients:
+            if not self.send(writer, message):
+                self.dropped += 1
+
+
+def is_number(value) -> bool:
+    """Checks if a JSON value is a number. JSON booleans decode to bool, which is a subclass of int."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
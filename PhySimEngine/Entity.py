@@ -3,9 +3,16 @@ from abc import abstractmethod, ABC
 import pygame
 
 class Entity(ABC):
-    """Abstract base class for all game objects."""
+    """
+    Abstract base class for all game objects.
+    The classes of the framework declare `__slots__` to keep entities small and attribute access fast.
+    Mixins declare empty slots and the concrete classes list all of their attributes.
+    """
+    __slots__ = ("position", "entity_id")
+
     def __init__(self, x: int, y: int):
         self.position: pygame.Vector2 = pygame.Vector2(x, y)
+        self.entity_id: int | None = None
 
     @abstractmethod
     def calculate_physics(self, delta_time: float, scenario: 'Scenario'):
@@ -1,18 +1,41 @@
+from collections.abc import Iterator
+
+from PhySimEngine.ArrayStore import ArrayStore
 from PhySimEngine.Entity import Entity
+from PhySimEngine.SpatialHash import SpatialHash
 
 
 class EntityManager:
-    """Manages all entities, handling safe addition and removal."""
+    """
+    Manages all entities, handling safe addition and removal.
+    Every entity gets a stable `entity_id` when it is added. The entities are stored by id, so removing
+    one is O(1), and readers share a read-only snapshot that is only rebuilt when entities were added or removed.
+    Queries by type (`entities_of`) and for collidable entities (`collidables`) use indexes that are
+    updated incrementally in `apply_changes`, so entities don't have to scan all others with `isinstance`.
+    """
     def __init__(self):
-        self.entities = []
+        self.entities_by_id: dict[int, Entity] = {}
+        self.entities: tuple[Entity, ...] = ()
+        self.next_id = 0
         self.to_add = []
-        self.to_remove = []
+        self.to_remove = set()
+        self.type_indexes: dict[type, dict[int, Entity]] = {}
+        self.type_snapshots: dict[type, tuple[Entity, ...]] = {}
+        self.collidable_index: dict[int, Entity] = {}
+        self.collidable_snapshot: tuple[Entity, ...] = ()
+        self.broad_phase = SpatialHash()
+        self.pair_first = []
+        self.pair_second = []
+        self.array_store = None
 
     def add(self, entity: Entity):
         """
-        Adds an entity to the queue.
+        Adds an entity to the queue and assigns its id.
         :param entity: The entity to add.
         """
+        if entity.entity_id is None:
+            entity.entity_id = self.next_id
+            self.next_id += 1
         self.to_add.append(entity)
 
     def remove(self, entity: Entity):
@@ -20,20 +43,137 @@ class EntityManager:
         Removes an entity from the queue.
         :param entity: The entity to remove.
         """
-        self.to_remove.append(entity)
+        if entity.entity_id is not None:
+            self.to_remove.add(entity.entity_id)
+
+    def get_entities(self) -> tuple[Entity, ...]:
+        """
+        Returns all entities. The tuple is shared by all callers and only rebuilt
+        in `apply_changes`, so it is cheap to call from every entity.
+        Returns: Tuple of all entities in the order they were added.
+        """
+        return self.entities
+
+    def get_entity(self, entity_id: int) -> Entity | None:
+        """
+        Returns the entity with the given id.
+        :param entity_id: The id assigned by `add`.
+        Returns: The entity, or None if no such entity is managed.
+        """
+        return self.entities_by_id.get(entity_id)
+
+    def entities_of(self, cls: type) -> tuple[Entity, ...]:
+        """
+        Returns all entities that are instances of the given class.
+        The index of a class is built on its first query and kept up to date by `apply_changes` afterwards.
+        :param cls: The class (or mixin) to look up.
+        Returns: Tuple of the matching entities in the order they were added.
+        """
+        snapshot = self.type_snapshots.get(cls)
+        if snapshot is None:
+            index = self.type_indexes.get(cls)
+            if index is None:
+                index = {entity_id: entity for entity_id, entity in self.entities_by_id.items() if isinstance(entity, cls)}
+                self.type_indexes[cls] = index
+            snapshot = tuple(index.values())
+            self.type_snapshots[cls] = snapshot
+        return snapshot
+
+    def collidables(self) -> tuple[Entity, ...]:
+        """
+        Returns all entities that take part in collisions, i.e. that have a collision shape.
+        Returns: Tuple of the collidable entities in the order they were added.
+        """
+        return self.collidable_snapshot
+
+    def restore(self, entities: list[Entity], next_id: int):
+        """
+        Replaces all entities with the given ones, keeping their ids. Used to load snapshots.
+        :param entities: The entities in the order they are updated, each with its `entity_id` set.
+        :param next_id: The id handed out to the next added entity.
+        """
+        self.entities_by_id.clear()
+        self.to_add.clear()
+        self.to_remove.clear()
+        self.type_indexes.clear()
+        self.type_snapshots.clear()
+        self.collidable_index.clear()
+        self.entities = ()
+        self.collidable_snapshot = ()
+        self.next_id = next_id
+        self.to_add.extend(entities)
+        if self.to_add:
+            self.apply_changes()
+        elif self.array_store is not None:
+            self.array_store.rebuild(self.entities)
+
+    def enable_array_store(self, kinds: dict[type, int]) -> ArrayStore:
+        """
+        Keeps the physical state of the supported entities in a NumPy-backed ArrayStore.
+        :param kinds: Maps the supported entity classes to the integer kind stored per row.
+        :return: The created array store.
+        """
+        self.array_store = ArrayStore(kinds)
+        self.array_store.rebuild(self.entities)
+        return self.array_store
 
-    def get_entities(self) -> list[Entity]:
+    def sync_entities(self):
         """
-        Returns all entities in the queue.
-        Returns: List of all entities.
+        Writes the state of the array store back into its entities, if a physics backend changed it.
+        Call it before reading the positions or velocities of entities while an array store is enabled.
         """
-        return self.entities[:]
+        if self.array_store is not None:
+            self.array_store.push()
 
     def apply_changes(self):
         """Safely adds or removes queued entities between frames."""
-        if self.to_add:
-            self.entities.extend(self.to_add)
-            self.to_add.clear()
-        if self.to_remove:
-            self.entities = [e for e in self.entities if e not in self.to_remove]
-            self.to_remove.clear()
\ No newline at end of file
+        if not (self.to_add or self.to_remove):
+            return
+
+        collidables_changed = False
+        for entity in self.to_add:
+            self.entities_by_id[entity.entity_id] = entity
+            if hasattr(entity, 'get_collision_shape'):
+                self.collidable_index[entity.entity_id] = entity
+                collidables_changed = True
+            for cls, index in self.type_indexes.items():
+                if isinstance(entity, cls):
+                    index[entity.entity_id] = entity
+                    self.type_snapshots.pop(cls, None)
+        self.to_add.clear()
+        for entity_id in self.to_remove:
+            if self.entities_by_id.pop(entity_id, None) is None:
+                continue
+            if self.collidable_index.pop(entity_id, None) is not None:
+                collidables_changed = True
+            for cls, index in self.type_indexes.items():
+                if index.pop(entity_id, None) is not None:
+                    self.type_snapshots.pop(cls, None)
+        self.to_remove.clear()
+
+        self.entities = tuple(self.entities_by_id.values())
+        if collidables_changed:
+            self.collidable_snapshot = tuple(self.collidable_index.values())
+        if self.array_store is not None:
+            self.array_store.rebuild(self.entities)
+
+    def update_broad_phase(self, sweep_time: float = 0.0):
+        """
+        Rebuilds the broad phase from the current entity positions.
+        Should be called once per tick, before the collision pairs are queried.
+        :param sweep_time: Also finds pairs that only meet while moving for this time, used for continuous collisions.
+        """
+        self.broad_phase.rebuild(self.collidable_snapshot, sweep_time)
+        self.pair_first, self.pair_second = self.broad_phase.get_pairs()
+
+    def clear_collision_pairs(self):
+        """Forgets the pairs of the last broad phase update, e.g. when no entity can collide in this tick."""
+        self.pair_first = []
+        self.pair_second = []
+
+    def get_collision_pairs(self) -> Iterator[tuple[Entity, Entity]]:
+        """
+        Returns the candidate collision pairs found by the last broad phase update.
+        Returns: Iterator over unordered entity pairs, each pair appearing once.
+        """
+        return zip(self.pair_first, self.pair_second)
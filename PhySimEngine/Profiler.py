@@ -0,0 +1,172 @@
+import csv
+import json
+from array import array
+
+import pygame
+
+
+class Profiler:
+    """
+    Records the wall time of the phases of every frame in a fixed-size ring buffer.
+    A frame is one iteration of the game loop, or one tick when the scenario is driven with `step()`.
+    Times of a phase that runs several times per frame (e.g. physics substeps) are summed.
+    Scenarios without a profiler skip all timing, so disabling it costs nothing.
+    """
+    PHASES = ("events", "apply_changes", "broad_phase", "forces", "integrator", "collisions", "update",
+              "physics", "render")
+    COUNTERS = ("ticks", "entities", "pairs")
+    OVERLAY_FRAMES = 60
+
+    def __init__(self, capacity: int = 600, per_class: bool = False, overlay: bool = True):
+        """
+        :param capacity: Number of frames kept in the ring buffer.
+        :param per_class: Also times `calculate_physics` and `update` per entity class. This adds two clock
+                          reads per entity and call, so it is off by default.
+        :param overlay: Draws the averages of the last frames on top of the scene. Toggled with F3.
+        """
+        self.capacity = capacity
+        self.per_class = per_class
+        self.overlay = overlay
+        self.frames = 0
+        self.row = -1
+        self.times = {phase: array('d', bytes(8 * capacity)) for phase in self.PHASES}
+        self.counters = {counter: array('q', bytes(8 * capacity)) for counter in self.COUNTERS}
+        self.class_times: dict[str, array] = {}
+        self.font = None
+
+    def begin_frame(self):
+        """Starts a new row in the ring buffer, overwriting the oldest frame once it is full."""
+        self.row = self.frames % self.capacity
+        self.frames += 1
+        row = self.row
+        for values in self.times.values():
+            values[row] = 0.0
+        for values in self.counters.values():
+            values[row] = 0
+        for values in self.class_times.values():
+            values[row] = 0.0
+
+    def reset(self):
+        """Forgets all recorded frames, e.g. to skip warm-up ticks."""
+        self.frames = 0
+        self.row = -1
+
+    def add_time(self, phase: str, seconds: float):
+        """
+        Adds time to a phase of the current frame.
+        :param phase: One of `PHASES`.
+        :param seconds: Elapsed wall time in seconds.
+        """
+        self.times[phase][self.row] += seconds
+
+    def add_class_time(self, class_name: str, seconds: float):
+        """
+        Adds time spent in the methods of an entity class to the current frame.
+        :param class_name: Name of the entity class.
+        :param seconds: Elapsed wall time in seconds.
+        """
+        values = self.class_times.get(class_name)
+        if values is None:
+            values = array('d', bytes(8 * self.capacity))
+            self.class_times[class_name] = values
+        values[self.row] += seconds
+
+    def set_counter(self, counter: str, value: int):
+        """
+        Sets a counter of the current frame.
+        :param counter: One of `COUNTERS`.
+        :param value: The counted value.
+        """
+        self.counters[counter][self.row] = value
+
+    def add_counter(self, counter: str, value: int = 1):
+        self.counters[counter][self.row] += value
+
+    def get_rows(self) -> list[int]:
+        """Returns the ring buffer rows of the recorded frames, from the oldest to the newest."""
+        if self.frames <= self.capacity:
+            return list(range(self.frames))
+        return [(self.frames + i) % self.capacity for i in range(self.capacity)]
+
+    def get_frames(self) -> list[dict]:
+        """
+        Returns the recorded frames, from the oldest to the newest, with times in milliseconds.
+        """
+        rows = self.get_rows()
+        first_frame = self.frames - len(rows)
+        frames = []
+        for i, row in enumerate(rows):
+            frame = {"frame": first_frame + i}
+            frame.update({f"{phase}_ms": 1000.0 * values[row] for phase, values in self.times.items()})
+            frame.update({counter: values[row] for counter, values in self.counters.items()})
+            frame.update({f"{name}_ms": 1000.0 * values[row] for name, values in self.class_times.items()})
+            frames.append(frame)
+        return frames
+
+    def get_averages(self, frame_count: int) -> dict:
+        """
+        Returns the average times in milliseconds and counters of the last frames.
+        :param frame_count: Number of frames to average over.
+        """
+        rows = self.get_rows()[-frame_count:]
+        if not rows:
+            return {}
+        averages = {f"{phase}_ms": 1000.0 * sum(values[row] for row in rows) / len(rows)
+                    for phase, values in self.times.items()}
+        averages.update({counter: sum(values[row] for row in rows) / len(rows)
+                         for counter, values in self.counters.items()})
+        averages.update({f"{name}_ms": 1000.0 * sum(values[row] for row in rows) / len(rows)
+                         for name, values in self.class_times.items()})
+        return averages
+
+    def export_csv(self, path: str):
+        """
+        Writes the recorded frames to a CSV file, one row per frame.
+        :param path: The file to write.
+        """
+        frames = self.get_frames()
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(frames[0]) if frames else ["frame"])
+            writer.writeheader()
+            writer.writerows(frames)
+
+    def export_json(self, path: str):
+        """
+        Writes the recorded frames to a JSON file as a list of objects.
+        :param path: The file to write.
+        """
+        with open(path, "w") as file:
+            json.dump(self.get_frames(), file, indent=1)
+
+    def render_overlay(self, surface: pygame.Surface) -> pygame.Rect | None:
+        """
+        Draws the averages of the last frames in the top left corner of the surface.
+        :param surface: The surface to draw on.
+        :return: The area that was drawn, or None if nothing was recorded yet.
+        """
+        averages = self.get_averages(self.OVERLAY_FRAMES)
+        if not averages:
+            return None
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, 20)
+
+        ticks = averages["ticks"]
+        lines = [
+            f"tick {averages['physics_ms'] / ticks if ticks else 0.0:.2f} ms   "
+            f"physics {averages['physics_ms']:.2f} ms   render {averages['render_ms']:.2f} ms",
+            f"entities {averages['entities']:.0f}   pairs {averages['pairs']:.0f}",
+            "   ".join(f"{phase} {averages[f'{phase}_ms']:.2f}"
+                       for phase in ("apply_changes", "broad_phase", "forces", "integrator", "collisions", "update"))
+        ]
+        lines.extend(f"{name[:-3]} {value:.2f} ms" for name, value in averages.items()
+                     if name[:-3] in self.class_times)
+
+        y = 5
+        area = pygame.Rect(5, 5, 0, 0)
+        for line in lines:
+            text = self.font.render(line, True, (255, 255, 255), (0, 0, 0))
+            area.union_ip(surface.blit(text, (5, y)))
+            y += text.get_height() + 2
+        return area
+
@@ -1,9 +1,14 @@
+import asyncio
+import random
+import time
 from abc import abstractmethod, ABC
 
 import pygame
 
 from PhySimEngine.EntityManager import EntityManager
 from PhySimEngine.InputManager import InputManager
+from PhySimEngine.Snapshot import read_snapshot, write_snapshot
+from PhySimEngine.SpriteRenderer import SpriteRenderer
 
 
 class Scenario(ABC):
@@ -13,24 +18,62 @@ class Scenario(ABC):
     inherit from this class and implement the abstract methods.
     """
 
-    def __init__(self):
+    def __init__(self, **overrides):
+        """
+        :param overrides: Settings that replace the ones returned by `configure()`,
+                          e.g. `headless=True` or scenario specific parameters of a sweep.
+        """
         config = self.configure()
+        config.update(overrides)
+        self.config = config
         self.width = config.get("width", 800)
         self.height = config.get("height", 600)
         self.title = config.get("title", "Pygame Framework")
         self.tps = config.get("tps", 60)
+        self.fixed_timestep = config.get("fixed_timestep", False)
+        self.fps = config.get("fps", self.tps)
+        self.max_substeps = config.get("max_substeps", 8)
+        self.physics_backend = config.get("physics_backend", None)
+        self.parallel_forces = config.get("parallel_forces", None)
+        self.integrator = config.get("integrator", None)
+        self.continuous_collisions = config.get("continuous_collisions", False)
+        self.sleep_manager = config.get("sleep_manager", None)
+        self.contact_solver = config.get("contact_solver", None)
+        self.force_field_grid = config.get("force_field_grid", None)
+        self.recorder = config.get("recorder", None)
+        self.control_server = config.get("control_server", None)
+        self.profiler = config.get("profiler", None)
+        self.headless = config.get("headless", False)
+        self.seed = config.get("seed", None)
+        self.batched_rendering = config.get("batched_rendering", True)
+        self.dirty_rendering = config.get("dirty_rendering", False)
+        self.world_rect = pygame.Rect(config.get("bounds", (0, 0, self.width, self.height)))
 
-        pygame.init()
-        pygame.display.set_caption(self.title)
-        self.display_surface = pygame.display.set_mode((self.width, self.height))
+        if self.headless:
+            self.display_surface = None
+        else:
+            pygame.init()
+            pygame.display.set_caption(self.title)
+            self.display_surface = pygame.display.set_mode((self.width, self.height))
         self.clock = pygame.time.Clock()
         self.running = False
         self.paused = False
         self.speed = 1.0
+        self.tick_count = 0
+        self.force_evaluations = 0
+        self.accumulator = 0.0
+        self.previous_positions = {}
+        self.overlay_rect = None
+        self.rendered_frame = None
 
-        self.input_manager = InputManager()
+        self.input_manager = None if self.headless else InputManager()
+        self.renderer = SpriteRenderer() if self.batched_rendering and not self.headless else None
         self.entity_manager = EntityManager()
+        if self.physics_backend is not None:
+            self.physics_backend.attach(self)
 
+        if self.seed is not None:
+            random.seed(self.seed)
         self.create_initial_entities()
 
     @abstractmethod
@@ -42,7 +85,25 @@ class Scenario(ABC):
             "width": 1280,
             "height": 720,
             "title": "My Awesome Simulation",
-            "tps": 60
+            "tps": 60,
+            "fixed_timestep": False,  # True advances physics in constant 1 / tps substeps
+            "fps": 60,  # render rate of the fixed timestep loop, defaults to tps
+            "max_substeps": 8,  # cap of physics substeps per rendered frame
+            "physics_backend": None,  # optional, e.g. ArrayPhysics() for NumPy kernels
+            "parallel_forces": None,  # optional, e.g. ParallelForces(workers=8) for multi-process forces
+            "integrator": None,  # optional, e.g. VelocityVerletIntegrator(), defaults to semi-implicit Euler
+            "continuous_collisions": False,  # True also catches contacts that happen between two ticks
+            "sleep_manager": None,  # optional, e.g. SleepManager() to skip bodies that came to rest
+            "contact_solver": None,  # optional, e.g. ContactSolver(iterations=8) for stable stacks at low tps
+            "force_field_grid": None,  # optional, e.g. ForceFieldGrid(cell_size=8) for O(1) force field lookups
+            "recorder": None,  # optional, e.g. TrajectoryRecorder("run.traj", every=10) to stream states to disk
+            "control_server": None,  # optional, e.g. ControlServer(port=8765) to steer run_async() over a socket
+            "profiler": None,  # optional, e.g. Profiler() to time the phases of every frame, F3 toggles its overlay
+            "headless": False,  # True never opens a window, drive it with step() / run_for()
+            "seed": None,  # seeds `random` before create_initial_entities for reproducible scenes
+            "batched_rendering": True,  # draw cached sprites with one blits call instead of per-entity draws
+            "dirty_rendering": False,  # True only redraws and updates the areas of the window that changed
+            "bounds": (0, 0, 1280, 720)  # world borders, defaults to (0, 0, width, height)
         }
         """
         pass
@@ -51,7 +112,7 @@ class Scenario(ABC):
     def create_initial_entities(self):
         """
         Use `self.entity_manager.add()` to create the starting
-        objects for your game.
+        objects for your game. Scenario specific settings can be read from `self.config`.
         """
         pass
 
@@ -59,6 +120,13 @@ class Scenario(ABC):
         """Stops the game loop, leading to a clean exit."""
         self.running = False
 
+    def close(self):
+        """Releases the worker processes, shared memory and open files of optional subsystems."""
+        if self.parallel_forces is not None:
+            self.parallel_forces.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
     def pause(self):
         """Toggles the paused state of the game loop."""
         self.paused = not self.paused
@@ -69,42 +137,453 @@ class Scenario(ABC):
         """Sets the speed of the game."""
         self.speed = speed
 
-    def run(self):
-        """Starts and manages the main game loop."""
-        self.running = True
-        while self.running:
-            raw_delta_time_ms = self.clock.tick(self.tps)
+    def save_snapshot(self, path: str):
+        """
+        Writes the state of all entities and the tick count to a binary snapshot file, together with the
+        per-body state of the integrator and the sleep manager and the impulses cached by the contact solver.
+        Queued additions and removals are applied first.
+        Handlers and configuration are not saved, they come from the scenario class that loads the snapshot.
+        :param path: The file to write.
+        """
+        self.entity_manager.apply_changes()
+        self.entity_manager.sync_entities()
+        state = {}
+        if self.integrator is not None:
+            state["integrator_states"] = self.integrator.states
+        if self.sleep_manager is not None:
+            state["sleep"] = self.sleep_manager.get_state()
+        if self.contact_solver is not None:
+            state["contact_impulses"] = self.contact_solver.impulses
+        write_snapshot(path, self.entity_manager.get_entities(), self.tick_count, self.entity_manager.next_id,
+                       state)
+
+    def load_snapshot(self, path: str, allowed_classes: tuple[type, ...] = ()):
+        """
+        Replaces all entities with the ones of a snapshot file written by `save_snapshot`
+        and continues from its tick count. Only entity and shape classes that are already imported are
+        restored, see `read_snapshot`, so a crafted file can't run code when it is loaded.
+        :param path: The file to read.
+        :param allowed_classes: Further classes that entity attributes in the snapshot may hold.
+        """
+        entities, tick_count, next_id, state = read_snapshot(path, allowed_classes)
+        self.entity_manager.restore(entities, next_id)
+        self.tick_count = tick_count
+        self.accumulator = 0.0
+        self.previous_positions = {}
+        # The state of the subsystems is keyed by entity ids, which the restored entities keep.
+        if self.integrator is not None:
+            self.integrator.states = dict(state.get("integrator_states", {}))
+        if self.contact_solver is not None:
+            self.contact_solver.reset()
+            self.contact_solver.impulses.update(state.get("contact_impulses", {}))
+        if self.sleep_manager is not None:
+            self.sleep_manager.reset()
+            self.sleep_manager.set_state(state.get("sleep", {}))
+            self.sleep_manager.refresh(self.entity_manager)
+        if self.recorder is not None:
+            self.recorder.restart()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.stop()
+    def evaluate_forces(self, delta_time: float):
+        """
+        Runs the `calculate_physics` phase of all entities on their current state.
+        Multi-stage integrators call it again for every intermediate state of a tick.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        self.force_evaluations += 1
+        if self.parallel_forces is not None:
+            self.parallel_forces.compute(self)
 
-            self.input_manager.update()
+        if self.profiler is not None and self.profiler.per_class:
+            self.profile_entities("calculate_physics", delta_time)
+            return
+        for entity in self.get_active_entities():
+            entity.calculate_physics(delta_time, self)
 
-            if self.input_manager.is_pressed(pygame.K_SPACE):
-                self.pause()
-            if self.input_manager.is_pressed(pygame.K_ESCAPE):
-                self.stop()
-            if self.input_manager.is_pressed(pygame.K_PLUS):
-                self.set_speed(self.speed + 0.2)
-            if self.input_manager.is_pressed(pygame.K_MINUS):
-                self.set_speed(self.speed - 0.2)
+    def profile_entities(self, method: str, delta_time: float):
+        """
+        Calls a phase method on all entities and adds the time of every call to the profiler, by entity class.
+        :param method: Either "calculate_physics" or "update".
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        add_class_time = self.profiler.add_class_time
+        for entity in self.get_active_entities():
+            start = time.perf_counter()
+            getattr(entity, method)(delta_time, self)
+            add_class_time(type(entity).__name__, time.perf_counter() - start)
 
-            if not self.paused:
-                delta_time = self.speed * raw_delta_time_ms / 1000.0
+    def get_active_entities(self) -> tuple:
+        """
+        Returns the entities whose `calculate_physics` and `update` phases run in this tick,
+        i.e. all entities except the ones the sleep manager put to sleep.
+        """
+        if self.sleep_manager is not None:
+            return self.sleep_manager.get_awake_entities()
+        return self.entity_manager.get_entities()
+
+    def update_broad_phase(self, delta_time: float):
+        """
+        Finds the candidate collision pairs of the tick. Skipped while every body is asleep.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        if self.sleep_manager is not None and not self.sleep_manager.has_awake_bodies():
+            self.entity_manager.clear_collision_pairs()
+            return
+        self.entity_manager.update_broad_phase(delta_time if self.continuous_collisions else 0.0)
+
+    def resolve_collisions(self, delta_time: float = 0.0):
+        """
+        Runs the narrow phase over the candidate pairs of the broad phase.
+        Every unordered pair is visited once and handed to `resolve_pair`, so the result does not depend on
+        the order in which the broad phase lists the two entities. With continuous collisions, pairs that
+        don't intersect yet are checked for a contact within the tick.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        if self.contact_solver is not None:
+            self.contact_solver.solve(self, delta_time)
+            return
+        if self.sleep_manager is not None:
+            self.resolve_collisions_with_sleeping(delta_time)
+            return
+        continuous = self.continuous_collisions
+        for entity, other in self.entity_manager.get_collision_pairs():
+            if entity.get_collision_shape().intersects(other.get_collision_shape(), entity.position, other.position):
+                self.resolve_pair(entity, other)
+            elif continuous:
+                self.resolve_swept_collision(entity, other, delta_time)
+
+    def resolve_collisions_with_sleeping(self, delta_time: float):
+        """
+        Same as `resolve_collisions`, but skips pairs of two sleeping bodies and reports every contact
+        to the sleep manager, which builds the islands from them and wakes the sleeping bodies that were hit.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        continuous = self.continuous_collisions
+        add_contact = self.sleep_manager.add_contact
+        add_touched = self.sleep_manager.add_touched
+        is_sleeping = self.sleep_manager.is_sleeping
+        for entity, other in self.entity_manager.get_collision_pairs():
+            if is_sleeping(entity) and is_sleeping(other):
+                continue
+            if entity.get_collision_shape().intersects(other.get_collision_shape(), entity.position, other.position):
+                self.resolve_pair(entity, other)
+            elif not continuous or not self.resolve_swept_collision(entity, other, delta_time):
+                continue
+            add_contact(entity, other)
+            add_touched(entity, other)
+
+    @staticmethod
+    def resolve_pair(entity, other) -> bool:
+        """
+        Resolves the collision of two intersecting entities. `resolve_collision` of the first entity is called,
+        and if it doesn't return True, i.e. it doesn't handle entities like the other one, the one of the
+        second entity. An entity that handles a pair updates both entities, see `Collision.resolve_collision`.
+        :param entity: The first entity of the pair.
+        :param other: The second entity of the pair.
+        :return: True if one of the entities handled the collision.
+        """
+        return entity.resolve_collision(other) is True or other.resolve_collision(entity) is True
+
+    def resolve_swept_collision(self, entity, other, delta_time: float) -> bool:
+        """
+        Resolves the contact of two entities that don't intersect now, but would touch within the tick
+        if both kept their current velocity. The collision is resolved at the time of impact and the
+        position correction rewinds the changed velocity to that time, so after the tick each entity
+        is where it would be had it bounced off the other at the moment of contact.
+        :param entity: The first entity of the pair.
+        :param other: The second entity of the pair.
+        :param delta_time: Time in seconds that the tick covers.
+        :return: True if the entities touch within the tick and the collision was resolved.
+        """
+        velocity = getattr(entity, 'velocity', None)
+        other_velocity = getattr(other, 'velocity', None)
+        if velocity is None and other_velocity is None:
+            return False
+        relative_velocity = pygame.Vector2(0, 0)
+        if velocity is not None:
+            relative_velocity += velocity
+        if other_velocity is not None:
+            relative_velocity -= other_velocity
+
+        time = entity.get_collision_shape().get_time_of_impact(other.get_collision_shape(), entity.position,
+                                                               other.position, relative_velocity, delta_time)
+        if time is None:
+            return False
+
+        participants = [(body, body.position, body.velocity) for body in (entity, other)
+                        if getattr(body, 'velocity', None) is not None]
+        changes = []
+        for body, position, body_velocity in participants:
+            body.position = position + body_velocity * time
+            pending = getattr(body, 'pending_velocity_change', None)
+            changes.append(None if pending is None else pending.copy())
+        self.resolve_pair(entity, other)
+
+        for (body, position, body_velocity), before in zip(participants, changes):
+            body.position = position
+            if before is not None and hasattr(body, 'pending_position_correction'):
+                body.pending_position_correction -= (body.pending_velocity_change - before) * time
+        return True
+
+    def physics_step(self, delta_time: float):
+        """
+        Advances the simulation by a single tick.
+        With a profiler the time of every phase is added to it, without one the tick does no timing
+        beyond the tick time a control server reports.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        profiler = self.profiler
+        if profiler is not None or self.control_server is not None:
+            tick_start = start = time.perf_counter()
+
+        self.entity_manager.apply_changes()
+        if self.sleep_manager is not None:
+            self.sleep_manager.refresh(self.entity_manager)
+        if self.force_field_grid is not None:
+            self.force_field_grid.refresh(self)
+        if self.recorder is not None:
+            # Records the state before the first tick of the run, later ticks are recorded after they ran.
+            self.recorder.record(self)
+        if profiler is not None:
+            start = self.end_phase("apply_changes", start)
+
+        if self.physics_backend is not None:
+            self.physics_backend.step(self, delta_time)
+        else:
+            self.update_broad_phase(delta_time)
+            if profiler is not None:
+                start = self.end_phase("broad_phase", start)
 
-                self.entity_manager.apply_changes()
+            self.evaluate_forces(delta_time)
+            if self.sleep_manager is not None:
+                self.sleep_manager.check_forces(self, delta_time)
+            if profiler is not None:
+                start = self.end_phase("forces", start)
+            if self.integrator is not None:
+                self.integrator.evaluate_stages(self, delta_time)
+                if profiler is not None:
+                    start = self.end_phase("integrator", start)
 
-                for entity in self.entity_manager.get_entities():
-                    entity.calculate_physics(delta_time, self)
+            self.resolve_collisions(delta_time)
+            if self.sleep_manager is not None:
+                self.sleep_manager.wake_touched()
+            if profiler is not None:
+                start = self.end_phase("collisions", start)
 
-                for entity in self.entity_manager.get_entities():
+            if profiler is not None and profiler.per_class:
+                self.profile_entities("update", delta_time)
+            else:
+                for entity in self.get_active_entities():
                     entity.update(delta_time, self)
+            if self.sleep_manager is not None:
+                self.sleep_manager.update(delta_time)
+            if profiler is not None:
+                self.end_phase("update", start)
 
-            self.display_surface.fill((20, 0, 30) if self.paused else (0, 20, 30))
+        self.tick_count += 1
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if self.control_server is not None:
+            self.control_server.record(self, time.perf_counter() - tick_start)
+
+        if profiler is not None:
+            profiler.add_time("physics", time.perf_counter() - tick_start)
+            profiler.add_counter("ticks")
+            profiler.set_counter("entities", len(self.entity_manager.get_entities()))
+            profiler.set_counter("pairs", len(self.entity_manager.pair_first))
+
+    def end_phase(self, phase: str, start: float) -> float:
+        """
+        Adds the time since the start of a phase to the profiler.
+        :param phase: One of `Profiler.PHASES`.
+        :param start: The `time.perf_counter()` value at the start of the phase.
+        :return: The current `time.perf_counter()` value, which starts the next phase.
+        """
+        now = time.perf_counter()
+        self.profiler.add_time(phase, now - start)
+        return now
+
+    def step(self, n: int = 1):
+        """
+        Advances the simulation by n ticks of a fixed length of 1 / tps seconds,
+        as fast as possible and without rendering.
+        :param n: Number of ticks to simulate.
+        """
+        delta_time = 1.0 / self.tps
+        for _ in range(n):
+            if self.profiler is not None:
+                self.profiler.begin_frame()
+            self.physics_step(delta_time)
+
+        self.entity_manager.sync_entities()
+
+    def run_for(self, seconds: float):
+        """
+        Advances the simulation by the given amount of simulated time using fixed ticks.
+        :param seconds: Simulated time in seconds.
+        """
+        self.step(round(seconds * self.tps))
+
+    def advance_fixed(self, frame_time: float):
+        """
+        Adds the elapsed frame time to the accumulator and consumes it in constant ticks of 1 / tps seconds.
+        At most `max_substeps` ticks are run per call, any backlog beyond that is dropped so a slow
+        frame cannot snowball into ever more physics work.
+        :param frame_time: Elapsed simulated time in seconds since the last call.
+        """
+        delta_time = 1.0 / self.tps
+        self.accumulator += frame_time
+        substeps = 0
+        while self.accumulator >= delta_time and substeps < self.max_substeps:
+            substeps += 1
+            if self.accumulator - delta_time < delta_time or substeps == self.max_substeps:
+                self.store_previous_positions()
+            self.physics_step(delta_time)
+            self.accumulator -= delta_time
+
+        if substeps == self.max_substeps:
+            self.accumulator = min(self.accumulator, delta_time)
+
+    def store_previous_positions(self):
+        """Remembers the current position of every entity to interpolate rendering between ticks."""
+        self.entity_manager.sync_entities()
+        self.previous_positions = {entity: entity.position.copy() for entity in self.entity_manager.get_entities()}
+
+    def render(self, interpolation: float | None = None):
+        """
+        Draws all entities onto the display surface.
+        With dirty rendering only the changed areas are redrawn and pushed to the window, and frames
+        in which no tick ran (e.g. while paused) are skipped unless the profiler overlay is shown.
+        :param interpolation: Fraction between the previous and the current tick at which the entities
+                              are drawn. None draws them at their current position.
+        """
+        background_color = (20, 0, 30) if self.paused else (0, 20, 30)
+        frame = (self.tick_count, interpolation, background_color)
+        if self.dirty_rendering and frame == self.rendered_frame and self.overlay_rect is None:
+            return
+        self.rendered_frame = frame
+
+        if self.profiler is not None:
+            start = time.perf_counter()
+        self.entity_manager.sync_entities()
+
+        dirty_rects = None
+        if self.renderer is not None and self.dirty_rendering:
+            dirty_rects = self.renderer.render_dirty(self.display_surface, self.entity_manager, background_color,
+                                                     self.previous_positions, interpolation,
+                                                     [self.overlay_rect] if self.overlay_rect else ())
+        elif self.renderer is not None:
+            self.renderer.render(self.display_surface, self.entity_manager, background_color,
+                                 self.previous_positions, interpolation)
+        else:
+            self.display_surface.fill(background_color)
             for entity in self.entity_manager.get_entities():
-                entity.render(self.display_surface)
+                previous_position = self.previous_positions.get(entity) if interpolation is not None else None
+                if previous_position is None:
+                    entity.render(self.display_surface)
+                else:
+                    current_position = entity.position
+                    entity.position = previous_position.lerp(current_position, interpolation)
+                    entity.render(self.display_surface)
+                    entity.position = current_position
 
+        self.overlay_rect = None
+        if self.profiler is not None:
+            if self.profiler.overlay:
+                self.overlay_rect = self.profiler.render_overlay(self.display_surface)
+            self.profiler.add_time("render", time.perf_counter() - start)
+        if dirty_rects is None:
             pygame.display.flip()
+        elif dirty_rects or self.overlay_rect:
+            pygame.display.update(dirty_rects + [self.overlay_rect] if self.overlay_rect else dirty_rects)
 
-        pygame.quit()
\ No newline at end of file
+    def run(self):
+        """Starts and manages the main game loop."""
+        if self.headless:
+            self.running = True
+            while self.running:
+                self.step()
+            self.close()
+            return
+
+        self.running = True
+        while self.running:
+            self.run_frame(self.clock.tick(self.fps if self.fixed_timestep else self.tps))
+
+        self.close()
+        pygame.quit()
+
+    async def run_async(self):
+        """
+        Same as `run`, but as a coroutine that yields to the asyncio event loop between frames instead of
+        blocking in the frame limiter, so other tasks run alongside the simulation, e.g. with
+        `asyncio.run(scenario.run_async())`. A "control_server" is started with it and its commands are
+        applied between frames. Headless scenarios advance fixed ticks as fast as possible and yield after
+        every tick, they don't advance while paused.
+        """
+        if self.control_server is not None:
+            await self.control_server.start()
+        self.running = True
+        try:
+            if self.headless:
+                while self.running:
+                    if self.control_server is not None:
+                        self.control_server.apply_commands(self)
+                    if self.paused:
+                        await asyncio.sleep(1.0 / self.tps)
+                    else:
+                        self.step()
+                        await asyncio.sleep(0)
+                return
+
+            frame_time = 1.0 / (self.fps if self.fixed_timestep else self.tps)
+            next_frame = time.perf_counter()
+            while self.running:
+                # Frames that fell behind are dropped instead of being run back to back.
+                next_frame = max(next_frame + frame_time, time.perf_counter())
+                await asyncio.sleep(next_frame - time.perf_counter())
+                if self.control_server is not None:
+                    self.control_server.apply_commands(self)
+                self.run_frame(self.clock.tick())
+        finally:
+            if self.control_server is not None:
+                await self.control_server.stop()
+            self.close()
+            if not self.headless:
+                pygame.quit()
+
+    def run_frame(self, raw_delta_time_ms: float):
+        """
+        Handles the input, advances the physics and renders a single frame of the game loop.
+        :param raw_delta_time_ms: Wall time in milliseconds since the previous frame.
+        """
+        if self.profiler is not None:
+            self.profiler.begin_frame()
+            start = time.perf_counter()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.stop()
+
+        self.input_manager.update()
+
+        if self.input_manager.is_pressed(pygame.K_SPACE):
+            self.pause()
+        if self.input_manager.is_pressed(pygame.K_ESCAPE):
+            self.stop()
+        if self.input_manager.is_pressed(pygame.K_PLUS):
+            self.set_speed(self.speed + 0.2)
+        if self.input_manager.is_pressed(pygame.K_MINUS):
+            self.set_speed(self.speed - 0.2)
+        if self.profiler is not None:
+            if self.input_manager.is_pressed(pygame.K_F3):
+                self.profiler.overlay = not self.profiler.overlay
+            self.profiler.add_time("events", time.perf_counter() - start)
+
+        if self.fixed_timestep:
+            if not self.paused:
+                self.advance_fixed(self.speed * raw_delta_time_ms / 1000.0)
+            self.render(min(self.accumulator * self.tps, 1.0))
+        else:
+            if not self.paused:
+                self.physics_step(self.speed * raw_delta_time_ms / 1000.0)
+            self.render()
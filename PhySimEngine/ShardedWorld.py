@@ -0,0 +1,547 @@
+import time
+from itertools import product
+from multiprocessing import Process, Queue, resource_tracker
+from queue import Empty
+from multiprocessing.shared_memory import SharedMemory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import pygame
+
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.ArrayPhysics import ArrayPhysics
+
+# Offsets (column, row) of the neighbour tiles that exchange halos and migrating bodies.
+NEIGHBOUR_OFFSETS = tuple((column, row) for row in (-1, 0, 1) for column in (-1, 0, 1) if column or row)
+EXCHANGE_KINDS = ("halo", "migrate")
+# Layout of one body in the shared memory through which neighbouring tiles exchange bodies.
+RECORD = None if np is None else np.dtype([
+    ("ids", np.int64), ("position", np.float64, 2), ("velocity", np.float64, 2), ("mass", np.float64),
+    ("radius", np.float64), ("restitution", np.float64), ("color", np.uint8, 3)], align=True)
+
+
+class BodyArrays:
+    """
+    Structure-of-arrays state of GravityCircle-style bodies, with the same fields as the ArrayStore,
+    so the ArrayPhysics kernels run on it directly. Only the fields in `FIELDS` are sent between processes.
+    """
+    FIELDS = ("ids", "position", "velocity", "mass", "radius", "restitution", "color")
+
+    def __init__(self, ids, position, velocity, mass, radius, restitution, color):
+        self.ids = ids
+        self.position = position
+        self.velocity = velocity
+        self.mass = mass
+        self.radius = radius
+        self.restitution = restitution
+        self.color = color
+        self.force = np.zeros_like(position)
+        self.kind = np.full(len(ids), ArrayPhysics.GRAVITY_CIRCLE, dtype=np.int8)
+
+    def __reduce__(self):
+        return BodyArrays, tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def empty(cls) -> "BodyArrays":
+        return cls(np.zeros(0, dtype=np.int64), np.zeros((0, 2)), np.zeros((0, 2)), np.zeros(0), np.zeros(0),
+                   np.zeros(0), np.zeros((0, 3), dtype=np.uint8))
+
+    @classmethod
+    def concatenate(cls, parts: list["BodyArrays"]) -> "BodyArrays":
+        if len(parts) == 1:
+            return parts[0]
+        return cls(*(np.concatenate([getattr(part, name) for part in parts]) for name in cls.FIELDS))
+
+    def select(self, rows) -> "BodyArrays":
+        """
+        Returns a copy of some of the bodies.
+        :param rows: A boolean mask or an index array.
+        """
+        return BodyArrays(*(getattr(self, name)[rows] for name in self.FIELDS))
+
+    def write_records(self, records):
+        """
+        Copies the bodies into an array of `RECORD`s.
+        :param records: The target array, as long as this one.
+        """
+        for name in self.FIELDS:
+            records[name] = getattr(self, name)
+
+    @classmethod
+    def from_records(cls, records) -> "BodyArrays":
+        """Copies bodies out of an array of `RECORD`s."""
+        return cls(*(records[name].copy() for name in cls.FIELDS))
+
+
+class Outbox:
+    """
+    Shared memory through which a tile hands bodies to its neighbours without pickling them.
+    The segment holds a region of `capacity` records for every neighbour and kind of exchange. Only the name
+    of the segment, the start of the region and the number of bodies are sent to the neighbour, which copies
+    the bodies out of the segment.
+    A tile writes a region again one tick later, after its neighbours have copied it. When a region is too
+    small the outbox moves to a segment twice the size it needs. Neighbours may still copy from the old one
+    until they finish the next tick, so it is unlinked once the tile itself is two ticks further.
+    """
+
+    def __init__(self, neighbours: list[int], capacity: int = 256):
+        """
+        :param neighbours: The tile indices of the neighbours.
+        :param capacity: Initial number of bodies per region.
+        """
+        self.regions = {key: region for region, key in enumerate(product(EXCHANGE_KINDS, neighbours))}
+        self.capacity = 0
+        self.memory: SharedMemory | None = None
+        self.retired: list[tuple[int, SharedMemory]] = []
+        self.allocate(capacity, 0)
+
+    def allocate(self, capacity: int, tick: int):
+        if self.memory is not None:
+            self.retired.append((tick, self.memory))
+        self.capacity = capacity
+        self.memory = SharedMemory(create=True, size=max(1, len(self.regions) * capacity * RECORD.itemsize))
+
+    def write(self, kind: str, tick: int, outgoing: dict[int, BodyArrays]) -> dict[int, tuple[str, int, int]]:
+        """
+        Writes the bodies for every neighbour into its region.
+        :param kind: "halo" or "migrate".
+        :param tick: The current tick of the tile.
+        :param outgoing: The bodies for every neighbour, by tile index.
+        :return: The segment name, first record and number of bodies for every neighbour.
+        """
+        while self.retired and self.retired[0][0] <= tick - 2:
+            memory = self.retired.pop(0)[1]
+            memory.close()
+            memory.unlink()
+        largest = max((len(bodies) for bodies in outgoing.values()), default=0)
+        if largest > self.capacity:
+            self.allocate(2 * largest, tick)
+        locations = {}
+        for neighbour, bodies in outgoing.items():
+            start = self.regions[(kind, neighbour)] * self.capacity
+            if len(bodies):
+                bodies.write_records(np.ndarray((len(bodies),), RECORD, buffer=self.memory.buf,
+                                                offset=start * RECORD.itemsize))
+            locations[neighbour] = (self.memory.name, start, len(bodies))
+        return locations
+
+    def close(self):
+        for _, memory in self.retired:
+            memory.close()
+            memory.unlink()
+        self.retired = []
+        self.memory.close()
+        self.memory.unlink()
+
+
+class TileWorker:
+    """
+    Owns the bodies inside one tile of a ShardedWorld and advances them in lockstep with its neighbours.
+    Runs in its own process and is controlled through its command queue.
+    The bodies are kept in a BodyArrays rather than an EntityManager of entities, a tile holds tens of
+    thousands of them and only ever runs the array kernels on them.
+    """
+
+    def __init__(self, index: int, columns: int, rows: int, world: tuple, gravity: tuple, halo: float,
+                 commands: Queue, inboxes: list[Queue], results: Queue):
+        self.index = index
+        self.columns = columns
+        self.rows = rows
+        self.column = index % columns
+        self.row = index // columns
+        self.world_rect = pygame.Rect(world)
+        self.tile_width = self.world_rect.width / columns
+        self.tile_height = self.world_rect.height / rows
+        self.left = self.world_rect.left + self.column * self.tile_width
+        self.top = self.world_rect.top + self.row * self.tile_height
+        self.right = self.left + self.tile_width
+        self.bottom = self.top + self.tile_height
+        self.gravity = np.array(gravity, dtype=np.float64)
+        self.halo = halo
+        self.commands = commands
+        self.inboxes = inboxes
+        self.inbox = inboxes[index]
+        self.results = results
+        self.neighbours = {}
+        for offset_x, offset_y in NEIGHBOUR_OFFSETS:
+            column, row = self.column + offset_x, self.row + offset_y
+            if 0 <= column < columns and 0 <= row < rows:
+                self.neighbours[(offset_x, offset_y)] = row * columns + column
+        self.bodies = BodyArrays.empty()
+        self.physics = ArrayPhysics()
+        self.tick = 0
+        self.pending: dict[tuple, list] = {}
+        self.outbox = Outbox(list(self.neighbours.values()))
+        self.mailboxes: dict[int, SharedMemory] = {}
+        self.frame = None
+        self.frame_view = None
+        self.frame_surface = None
+
+    def run(self):
+        handlers = {"add": self.add, "step": self.step, "clear": self.clear, "draw": self.draw,
+                    "gather": self.gather}
+        while True:
+            command, *arguments = self.commands.get()
+            if command == "stop":
+                break
+            try:
+                reply = handlers[command](*arguments)
+            except Exception as error:
+                self.results.put((self.index, error))
+                break
+            self.results.put((self.index, reply))
+        self.outbox.close()
+        for memory in self.mailboxes.values():
+            memory.close()
+        self.frame_surface = None
+        self.frame_view = None
+        if self.frame is not None:
+            self.frame.close()
+
+    def add(self, bodies: BodyArrays) -> int:
+        self.bodies = BodyArrays.concatenate([self.bodies, bodies])
+        return len(self.bodies)
+
+    def gather(self) -> BodyArrays:
+        return self.bodies
+
+    def exchange(self, kind: str, outgoing: dict[int, BodyArrays]) -> list[BodyArrays]:
+        """
+        Sends bodies to every neighbour and waits for the bodies of all neighbours in the current tick.
+        The bodies go through the shared memory of the outboxes, the queues only carry where to find them.
+        Bodies of neighbours that are already ahead are kept until they are due.
+        :param kind: "halo" or "migrate".
+        :param outgoing: The bodies for every neighbour, by tile index.
+        :return: The received bodies, ordered by the index of the sending tile so every run is reproducible.
+        """
+        for neighbour, location in self.outbox.write(kind, self.tick, outgoing).items():
+            self.inboxes[neighbour].put((kind, self.tick, self.index, *location))
+        key = (kind, self.tick)
+        received = self.pending.pop(key, [])
+        while len(received) < len(self.neighbours):
+            message_kind, tick, sender, *location = self.inbox.get()
+            # Copied right away, the segment named in a message outlives it by at least a tick.
+            bodies = self.receive(sender, *location)
+            if (message_kind, tick) == key:
+                received.append((sender, bodies))
+            else:
+                self.pending.setdefault((message_kind, tick), []).append((sender, bodies))
+        received.sort(key=lambda message: message[0])
+        return [bodies for sender, bodies in received]
+
+    def receive(self, sender: int, name: str, start: int, count: int) -> BodyArrays:
+        """
+        Copies bodies out of the outbox of a neighbour.
+        The messages of a neighbour arrive in order, so once it names a new segment the old one isn't needed.
+        :param sender: The tile index of the neighbour.
+        :param name: The name of its outbox segment.
+        :param start: The first record of the bodies.
+        :param count: The number of bodies.
+        """
+        if not count:
+            return BodyArrays.empty()
+        memory = self.mailboxes.get(sender)
+        if memory is None or memory.name != name:
+            if memory is not None:
+                memory.close()
+            memory = self.mailboxes[sender] = SharedMemory(name=name)
+        return BodyArrays.from_records(np.ndarray((count,), RECORD, buffer=memory.buf,
+                                                  offset=start * RECORD.itemsize))
+
+    def get_halos(self) -> dict[int, BodyArrays]:
+        """Returns the bodies close enough to each neighbour to touch one of its bodies."""
+        x = self.bodies.position[:, 0]
+        y = self.bodies.position[:, 1]
+        near_x = {-1: x < self.left + self.halo, 1: x >= self.right - self.halo}
+        near_y = {-1: y < self.top + self.halo, 1: y >= self.bottom - self.halo}
+        halos = {}
+        for (offset_x, offset_y), neighbour in self.neighbours.items():
+            if offset_x and offset_y:
+                rows = near_x[offset_x] & near_y[offset_y]
+            else:
+                rows = near_x[offset_x] if offset_x else near_y[offset_y]
+            halos[neighbour] = self.bodies.select(rows)
+        return halos
+
+    def get_migrants(self) -> tuple[BodyArrays, dict[int, BodyArrays]]:
+        """
+        Splits the bodies into the ones that stay in the tile and the ones that moved to a neighbour.
+        Bodies that crossed more than one tile in a tick are handed on one tile per tick.
+        """
+        position = self.bodies.position
+        column = np.clip(np.floor((position[:, 0] - self.world_rect.left) / self.tile_width), 0, self.columns - 1)
+        row = np.clip(np.floor((position[:, 1] - self.world_rect.top) / self.tile_height), 0, self.rows - 1)
+        offset_x = np.clip(column - self.column, -1, 1)
+        offset_y = np.clip(row - self.row, -1, 1)
+        migrants = {}
+        for (neighbour_x, neighbour_y), neighbour in self.neighbours.items():
+            migrants[neighbour] = self.bodies.select((offset_x == neighbour_x) & (offset_y == neighbour_y))
+        return self.bodies.select((offset_x == 0) & (offset_y == 0)), migrants
+
+    def step(self, count: int, delta_time: float) -> tuple[int, float]:
+        """
+        Advances the tile by a number of ticks, with the same kernels and in the same order as ArrayPhysics.
+        :return: The number of bodies owned by the tile afterwards and the CPU time the ticks took in seconds,
+                 which leaves out the time spent waiting for the neighbours.
+        """
+        cpu_start = time.process_time()
+        for _ in range(count):
+            self.tick += 1
+            ghosts = [ghost for ghost in self.exchange("halo", self.get_halos()) if len(ghost)]
+            bodies = self.bodies
+            owned = len(bodies)
+            # Contacts with the ghosts of the neighbours are resolved here and in the neighbour alike,
+            # each tile keeps the changes of its own bodies.
+            velocity_change, position_correction = self.physics.resolve_collisions(
+                BodyArrays.concatenate([bodies, *ghosts]))
+            bodies.force = bodies.mass[:, None] * self.gravity
+            self.physics.integrate(bodies, delta_time, velocity_change[:owned], position_correction[:owned])
+            self.physics.bounce_off_borders(bodies, self.world_rect)
+
+            residents, migrants = self.get_migrants()
+            self.bodies = BodyArrays.concatenate([residents, *self.exchange("migrate", migrants)])
+        return len(self.bodies), time.process_time() - cpu_start
+
+    def clear(self, frame_name: str, width: int, height: int, background: tuple):
+        """Fills the area of the tile in the shared frame with the background color."""
+        if self.frame is None or self.frame.name != frame_name:
+            self.frame_surface = None
+            self.frame_view = None
+            if self.frame is not None:
+                self.frame.close()
+            self.frame = SharedMemory(name=frame_name)
+            self.frame_view = np.ndarray((height, width, 4), dtype=np.uint8, buffer=self.frame.buf)
+            self.frame_surface = pygame.image.frombuffer(self.frame.buf, (width, height), "RGBX")
+        left = round(self.column * width / self.columns)
+        right = round((self.column + 1) * width / self.columns)
+        top = round(self.row * height / self.rows)
+        bottom = round((self.row + 1) * height / self.rows)
+        self.frame_view[top:bottom, left:right, :3] = background
+
+    def draw(self):
+        """
+        Draws the bodies of the tile into the shared frame, scaled from the world to the frame.
+        Bodies smaller than a pixel are set as single pixels, larger ones are drawn as circles.
+        """
+        height, width = self.frame_view.shape[:2]
+        scale_x = width / self.world_rect.width
+        scale_y = height / self.world_rect.height
+        bodies = self.bodies
+        x = ((bodies.position[:, 0] - self.world_rect.left) * scale_x).astype(np.int64)
+        y = ((bodies.position[:, 1] - self.world_rect.top) * scale_y).astype(np.int64)
+        radius = bodies.radius * scale_x
+        small = radius < 1
+        visible = small & (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        self.frame_view[y[visible], x[visible], :3] = bodies.color[visible]
+        for row in np.flatnonzero(~small):
+            pygame.draw.circle(self.frame_surface, bodies.color[row].tolist(), (x[row], y[row]), radius[row])
+
+
+def _run_tile(*arguments):
+    TileWorker(*arguments).run()
+
+
+class ShardedWorld:
+    """
+    Domain-decomposed world of GravityCircle-style bodies (local gravity, collisions and world borders)
+    for simulations far beyond what a single process can hold.
+    The world is split into `columns` x `rows` tiles and each tile is owned by a worker process that keeps its
+    bodies in NumPy arrays and advances them with the ArrayPhysics kernels. Every tick the tiles exchange the
+    bodies within `2 * max_radius` of their borders as ghosts, so contacts across a border are resolved,
+    and afterwards hand the bodies that left them to the neighbouring tile. Neighbours exchange the bodies
+    through the shared memory of their outboxes and tell each other where to find them through their queues,
+    the coordinator only starts the ticks. `render` assembles a frame of the whole world, every worker draws
+    its bodies into a shared memory frame that is blitted onto the target surface.
+    Worker processes are started on first use, call `close` to stop them.
+    """
+
+    def __init__(self, world_rect, columns: int = 2, rows: int = 2, gravity=(0, 300), max_radius: float = 10.0,
+                 background: tuple = (0, 20, 30)):
+        """
+        :param world_rect: The world borders, e.g. (0, 0, 100000, 75000).
+        :param columns: Number of tiles along x.
+        :param rows: Number of tiles along y. Each of the columns * rows tiles runs in its own process.
+        :param gravity: The gravity acceleration of all bodies, like LocalGravity.
+        :param max_radius: Largest radius of a body. Sets the width of the ghost regions.
+        :param background: Color of the rendered frames.
+        """
+        if np is None:
+            raise ImportError("ShardedWorld requires NumPy. Install it with `pip install numpy`.")
+        self.world_rect = pygame.Rect(world_rect)
+        self.columns = columns
+        self.rows = rows
+        self.gravity = tuple(gravity)
+        self.max_radius = max_radius
+        self.halo = 2 * max_radius
+        self.background = background
+        if self.world_rect.width / columns < self.halo or self.world_rect.height / rows < self.halo:
+            raise ValueError("Tiles have to be at least 2 * max_radius wide and high.")
+        self.processes: list[Process] = []
+        self.commands: list[Queue] = []
+        self.results = None
+        self.frame = None
+        self.frame_surface = None
+        self.next_id = 0
+        self.tick_count = 0
+        self.body_count = 0
+        self.tile_cpu_times: list[float] = []
+
+    def start(self):
+        """Starts the worker processes. Called on first use."""
+        if self.processes:
+            return
+        # Started before the workers, so they share it and attaching to the frame doesn't register it twice.
+        resource_tracker.ensure_running()
+        tiles = self.columns * self.rows
+        self.commands = [Queue() for _ in range(tiles)]
+        inboxes = [Queue() for _ in range(tiles)]
+        self.results = Queue()
+        for index in range(tiles):
+            process = Process(target=_run_tile, daemon=True,
+                              args=(index, self.columns, self.rows, tuple(self.world_rect), self.gravity, self.halo,
+                                    self.commands[index], inboxes, self.results))
+            process.start()
+            self.processes.append(process)
+
+    def call(self, command: str, *arguments) -> list:
+        """
+        Runs a command on all workers and waits for their replies.
+        :return: The replies, by tile index.
+        """
+        self.start()
+        for queue in self.commands:
+            queue.put((command, *arguments))
+        return self.collect()
+
+    def collect(self) -> list:
+        """
+        Waits for the reply of every worker to the last command.
+        A failed worker leaves its neighbours waiting for it, so all workers are killed in that case.
+        :return: The replies, by tile index.
+        """
+        replies = [None] * len(self.commands)
+        for _ in self.commands:
+            while True:
+                try:
+                    index, reply = self.results.get(timeout=1.0)
+                    break
+                except Empty:
+                    if all(process.is_alive() for process in self.processes):
+                        continue
+                    self.terminate()
+                    raise RuntimeError("A tile worker stopped unexpectedly.")
+            if isinstance(reply, Exception):
+                self.terminate()
+                raise RuntimeError(f"Tile {index} failed") from reply
+            replies[index] = reply
+        return replies
+
+    def terminate(self):
+        """Kills all worker processes, e.g. after one of them failed and left its neighbours waiting."""
+        for process in self.processes:
+            process.terminate()
+        self.close()
+
+    def add_bodies(self, position, velocity, radius, mass, restitution, color) -> range:
+        """
+        Adds bodies to the tiles that contain them.
+        :param position: Array of shape (n, 2).
+        :param velocity: Array of shape (n, 2).
+        :param radius: Array of n radii, at most `max_radius`.
+        :param mass: Array of n masses.
+        :param restitution: Array of n restitutions.
+        :param color: Array of shape (n, 3) with RGB colors.
+        :return: The ids of the added bodies.
+        """
+        position = np.asarray(position, dtype=np.float64).reshape(-1, 2)
+        count = len(position)
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (count,)).copy()
+        if count and radius.max() > self.max_radius:
+            raise ValueError(f"Bodies may not be larger than max_radius ({self.max_radius}).")
+        ids = np.arange(self.next_id, self.next_id + count, dtype=np.int64)
+        bodies = BodyArrays(ids, position, np.asarray(velocity, dtype=np.float64).reshape(-1, 2).copy(),
+                            np.broadcast_to(np.asarray(mass, dtype=np.float64), (count,)).copy(), radius,
+                            np.broadcast_to(np.asarray(restitution, dtype=np.float64), (count,)).copy(),
+                            np.broadcast_to(np.asarray(color, dtype=np.uint8), (count, 3)).copy())
+        self.next_id += count
+
+        tile_width = self.world_rect.width / self.columns
+        tile_height = self.world_rect.height / self.rows
+        column = np.clip(np.floor((position[:, 0] - self.world_rect.left) / tile_width), 0, self.columns - 1)
+        row = np.clip(np.floor((position[:, 1] - self.world_rect.top) / tile_height), 0, self.rows - 1)
+        tile = (row * self.columns + column).astype(np.int64)
+        self.start()
+        for index, queue in enumerate(self.commands):
+            queue.put(("add", bodies.select(tile == index)))
+        self.collect()
+        self.body_count += count
+        return range(ids[0], ids[-1] + 1) if count else range(0)
+
+    def add_entities(self, entities: list[GravityCircle]) -> range:
+        """
+        Adds the state of GravityCircles. The entities themselves are not kept.
+        :param entities: The circles to add.
+        :return: The ids of the added bodies, in the order of the entities.
+        """
+        return self.add_bodies([(e.position.x, e.position.y) for e in entities],
+                               [(e.velocity.x, e.velocity.y) for e in entities],
+                               [e.radius for e in entities], [e.mass for e in entities],
+                               [e.restitution for e in entities], [tuple(e.color)[:3] for e in entities])
+
+    def step(self, n: int = 1, delta_time: float = 1 / 60):
+        """
+        Advances all tiles by n ticks.
+        The CPU time every tile spent on them is stored in `tile_cpu_times`. With a core per tile the
+        busiest tile bounds the tick rate, as the tiles wait for each other every tick.
+        :param n: Number of ticks. The tiles run them without waiting for the coordinator in between.
+        :param delta_time: Time in seconds that every tick covers.
+        """
+        replies = self.call("step", n, delta_time)
+        self.tile_cpu_times = [cpu_time for count, cpu_time in replies]
+        self.tick_count += n
+
+    def render(self, surface: pygame.Surface):
+        """
+        Draws the whole world scaled onto the surface. Every tile draws its own bodies in parallel.
+        :param surface: The surface to draw on, e.g. the display surface.
+        """
+        width, height = surface.get_size()
+        if self.frame_surface is None or self.frame_surface.get_size() != (width, height):
+            self.release_frame()
+            self.frame = SharedMemory(create=True, size=width * height * 4)
+            self.frame_surface = pygame.image.frombuffer(self.frame.buf, (width, height), "RGBX")
+        # All tiles clear their area before any tile draws, bodies on a border may reach into the next tile.
+        self.call("clear", self.frame.name, width, height, self.background)
+        self.call("draw")
+        surface.blit(self.frame_surface, (0, 0))
+
+    def get_bodies(self) -> BodyArrays:
+        """Collects the state of all bodies from the tiles, ordered by id."""
+        bodies = BodyArrays.concatenate([BodyArrays.empty(), *self.call("gather")])
+        return bodies.select(np.argsort(bodies.ids, kind='stable'))
+
+    def release_frame(self):
+        self.frame_surface = None
+        if self.frame is not None:
+            self.frame.close()
+            self.frame.unlink()
+            self.frame = None
+
+    def close(self):
+        """Stops the worker processes and releases the shared frame."""
+        for queue, process in zip(self.commands, self.processes):
+            if process.is_alive():
+                queue.put(("stop",))
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        self.commands = []
+        self.release_frame()
@@ -0,0 +1,316 @@
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimEngine.EntityManager import EntityManager
+from PhySimObjects.SimpleObjects.Movable import Movable
+
+
+class SleepManager:
+    """
+    Puts resting bodies to sleep, so the scenario can skip their physics.
+    A `Movable` body is at rest while its speed stays below
+    `velocity_threshold` and it stays within `distance_threshold` of the position where it came to rest.
+    The distance check lets bodies that jitter in place inside a pile sleep, while bodies that slowly slide
+    along the floor stay awake. Bodies that touch form an island, and an island falls asleep once all of its
+    bodies have been at rest for `rest_time` seconds. Sleeping bodies keep colliding as static obstacles
+    and wake up, together with their island, as soon as a moving body touches them.
+    A sleeping body that a collision pushes is woken in the same tick, so it receives its share of the
+    collision. The forces on sleeping bodies are still evaluated every tick, and a body wakes once its
+    acceleration differs by more than `acceleration_threshold` from the one it had when it fell asleep,
+    e.g. after the gravity vector changed. Removing an entity wakes the sleeping bodies it touched,
+    added entities wake the bodies they hit like any moving body.
+    The rest state of every body is kept here, keyed by entity id. The scenario saves it with snapshots
+    through `get_state` and restores it with `set_state`.
+    """
+
+    def __init__(self, velocity_threshold: float = 50.0, distance_threshold: float = 5.0, rest_time: float = 0.5,
+                 acceleration_threshold: float = 10.0):
+        """
+        :param velocity_threshold: Speed below which a body counts as resting.
+        :param distance_threshold: Distance a resting body may move away from where it came to rest.
+        :param rest_time: Seconds an island has to rest before it falls asleep.
+        :param acceleration_threshold: Change of the acceleration by the forces on a sleeping body that wakes it.
+        """
+        self.velocity_threshold = velocity_threshold
+        self.distance_threshold = distance_threshold
+        self.rest_time = rest_time
+        self.acceleration_threshold = acceleration_threshold
+        self.entities: tuple[Entity, ...] | None = None
+        self.bodies: list[Entity] = []
+        self.awake_entities: tuple[Entity, ...] = ()
+        self.awake_bodies: list[Entity] = []
+        self.sleeping_bodies: list[Entity] = []
+        self.sleeping_ids: set[int] = set()
+        self.rest_times: dict[int, float] = {}
+        self.rest_positions: dict[int, pygame.Vector2] = {}
+        self.sleep_forces: dict[int, pygame.Vector2] = {}
+        self.contact_first: list[Entity] = []
+        self.contact_second: list[Entity] = []
+        self.touched: list[Entity] = []
+
+    def reset(self):
+        """Forgets the entities and their rest state, e.g. before the ones of a snapshot replace them."""
+        self.entities = None
+        self.bodies = []
+        self.sleeping_ids = set()
+        self.rest_times = {}
+        self.rest_positions = {}
+        self.sleep_forces = {}
+
+    def get_state(self) -> dict:
+        """Returns the rest state of all bodies, keyed by entity id, for `Scenario.save_snapshot`."""
+        return {"sleeping": set(self.sleeping_ids), "rest_times": dict(self.rest_times),
+                "rest_positions": {entity_id: pygame.Vector2(position)
+                                   for entity_id, position in self.rest_positions.items()},
+                "sleep_forces": {entity_id: pygame.Vector2(force) for entity_id, force in self.sleep_forces.items()}}
+
+    def set_state(self, state: dict):
+        """
+        Restores the rest state returned by `get_state`, after `reset`.
+        :param state: The state of the bodies, which keep their entity ids.
+        """
+        self.sleeping_ids = set(state.get("sleeping", ()))
+        self.rest_times = dict(state.get("rest_times", {}))
+        self.rest_positions = dict(state.get("rest_positions", {}))
+        self.sleep_forces = dict(state.get("sleep_forces", {}))
+
+    def is_sleeping(self, entity: Entity) -> bool:
+        """
+        Checks if an entity is asleep.
+        :param entity: The entity to check.
+        :return: True if the entity is a body that was put to sleep and hasn't woken since.
+        """
+        return entity.entity_id in self.sleeping_ids
+
+    def refresh(self, entity_manager: EntityManager):
+        """
+        Picks up the bodies if entities were added or removed since the last call,
+        and wakes the sleeping bodies that touched a removed entity.
+        :param entity_manager: The entity manager of the scenario.
+        """
+        entities = entity_manager.get_entities()
+        if entities is self.entities:
+            return
+        previous_entities = self.entities or ()
+        self.entities = entities
+        self.bodies = [entity for entity in entities if isinstance(entity, Movable)]
+        if previous_entities:
+            current = set(entities)
+            removed = [entity for entity in previous_entities if entity not in current]
+            if removed:
+                for entity in removed:
+                    self.forget(entity)
+                self.wake_neighbours(removed)
+        self.sort_entities()
+
+    def wake_neighbours(self, removed: list[Entity]):
+        """
+        Wakes the sleeping bodies that touch any of the given entities, as they may have rested on them.
+        Call `sort_entities` afterwards to update the awake entities.
+        :param removed: The entities that were removed.
+        """
+        sleepers = [body for body in self.bodies if self.is_sleeping(body)]
+        if not sleepers:
+            return
+        for entity in removed:
+            shape = entity.get_collision_shape() if hasattr(entity, 'get_collision_shape') else None
+            radius = shape.get_bounding_radius() if shape is not None else None
+            for body in sleepers:
+                if not self.is_sleeping(body):
+                    continue
+                body_radius = body.get_collision_shape().get_bounding_radius()
+                if radius is None or body_radius is None:
+                    self.wake(body)
+                    continue
+                reach = radius + body_radius + self.distance_threshold
+                if entity.position.distance_squared_to(body.position) <= reach * reach:
+                    self.wake(body)
+
+    def forget(self, entity: Entity):
+        """
+        Drops the rest state of a removed entity.
+        :param entity: The removed entity.
+        """
+        self.sleeping_ids.discard(entity.entity_id)
+        self.rest_times.pop(entity.entity_id, None)
+        self.rest_positions.pop(entity.entity_id, None)
+        self.sleep_forces.pop(entity.entity_id, None)
+
+    def wake_all(self):
+        """Wakes all bodies."""
+        for body in self.bodies:
+            self.wake(body)
+        self.sort_entities()
+
+    def wake(self, body: Entity):
+        """
+        Wakes a single body. Call `sort_entities` afterwards to update the awake entities.
+        :param body: The body to wake.
+        """
+        entity_id = body.entity_id
+        if entity_id in self.sleeping_ids and hasattr(body, 'force_accumulated'):
+            # Awake bodies start a tick without force, the one evaluated while asleep would be added twice.
+            body.force_accumulated.update(0, 0)
+        self.sleeping_ids.discard(entity_id)
+        self.rest_times.pop(entity_id, None)
+        self.rest_positions.pop(entity_id, None)
+        self.sleep_forces.pop(entity_id, None)
+
+    def put_to_sleep(self, body: Entity):
+        """
+        Stops a body and puts it to sleep. Call `sort_entities` afterwards to update the awake entities.
+        :param body: The body to put to sleep.
+        """
+        entity_id = body.entity_id
+        self.sleeping_ids.add(entity_id)
+        self.rest_positions.pop(entity_id, None)
+        self.sleep_forces.pop(entity_id, None)
+        body.velocity.update(0, 0)
+        if hasattr(body, 'force_accumulated'):
+            body.force_accumulated.update(0, 0)
+
+    def sort_entities(self):
+        sleeping_ids = self.sleeping_ids
+        self.awake_entities = tuple(entity for entity in self.entities or () if entity.entity_id not in sleeping_ids)
+        self.awake_bodies = [body for body in self.bodies if body.entity_id not in sleeping_ids]
+        self.sleeping_bodies = [body for body in self.bodies if body.entity_id in sleeping_ids]
+
+    def check_forces(self, scenario, delta_time: float):
+        """
+        Evaluates the forces on all sleeping bodies and wakes the ones whose acceleration changed by more than
+        `acceleration_threshold` since the first tick they slept. Called by the scenario after the forces
+        of the awake entities were evaluated.
+        :param scenario: The scenario the bodies belong to.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        threshold_squared = self.acceleration_threshold * self.acceleration_threshold
+        changed = False
+        for body in self.sleeping_bodies:
+            force = getattr(body, 'force_accumulated', None)
+            if force is None:
+                continue
+            force.update(0, 0)
+            body.calculate_physics(delta_time, scenario)
+            sleep_force = self.sleep_forces.get(body.entity_id)
+            if sleep_force is None:
+                self.sleep_forces[body.entity_id] = pygame.Vector2(force)
+                continue
+            mass = getattr(body, 'mass', 0.0)
+            if mass > 0 and force.distance_squared_to(sleep_force) > threshold_squared * mass * mass:
+                self.wake(body)
+                changed = True
+        if changed:
+            self.sort_entities()
+
+    def add_touched(self, entity: Entity, other: Entity):
+        """
+        Records two entities whose collision was resolved by `resolve_collision`, which changes the velocity
+        of both. A sleeping one of them is woken by `wake_touched`, so that change is applied.
+        :param entity: The first entity of the collision.
+        :param other: The second entity of the collision.
+        """
+        if entity.entity_id in self.sleeping_ids:
+            self.touched.append(entity)
+        elif other.entity_id in self.sleeping_ids:
+            self.touched.append(other)
+
+    def wake_touched(self):
+        """
+        Wakes the sleeping bodies recorded by `add_touched` in the current tick. They keep their rest time and
+        the force evaluated in this tick, so a light touch lets their island fall asleep again right away.
+        Called by the scenario after the collisions were resolved.
+        """
+        if not self.touched:
+            return
+        for body in self.touched:
+            self.sleeping_ids.discard(body.entity_id)
+            self.rest_positions[body.entity_id] = pygame.Vector2(body.position)
+            self.sleep_forces.pop(body.entity_id, None)
+        self.touched.clear()
+        self.sort_entities()
+
+    def get_awake_entities(self) -> tuple[Entity, ...]:
+        """Returns all entities that are not asleep, including entities that never sleep."""
+        return self.awake_entities
+
+    def has_awake_bodies(self) -> bool:
+        """Checks if any movable body is awake. Without one, no collision can happen."""
+        return bool(self.awake_bodies)
+
+    def add_contact(self, entity: Entity, other: Entity):
+        """
+        Records two touching entities of the current tick. At least one of them has to be awake.
+        :param entity: The first entity of the contact.
+        :param other: The second entity of the contact.
+        """
+        self.contact_first.append(entity)
+        self.contact_second.append(other)
+
+    def update(self, delta_time: float):
+        """
+        Advances the rest time of all awake bodies and puts islands to sleep or wakes them,
+        based on the contacts recorded in the current tick.
+        :param delta_time: Time in seconds that the tick covered.
+        """
+        threshold_squared = self.velocity_threshold * self.velocity_threshold
+        distance_squared = self.distance_threshold * self.distance_threshold
+        rest_times = self.rest_times
+        rest_positions = self.rest_positions
+        for body in self.awake_bodies:
+            entity_id = body.entity_id
+            rest_position = rest_positions.get(entity_id)
+            if (body.velocity.length_squared() < threshold_squared and rest_position is not None
+                    and body.position.distance_squared_to(rest_position) <= distance_squared):
+                rest_times[entity_id] = rest_times.get(entity_id, 0.0) + delta_time
+            else:
+                rest_times[entity_id] = 0.0
+                if rest_position is None:
+                    rest_positions[entity_id] = pygame.Vector2(body.position)
+                else:
+                    rest_position.update(body.position)
+
+        parents = {}
+
+        def find(body):
+            root = body
+            while parents.get(root, root) is not root:
+                root = parents[root]
+            while body is not root:
+                parents[body], body = root, parents[body]
+            return root
+
+        touched_sleepers = {}
+        for entity, other in zip(self.contact_first, self.contact_second):
+            if isinstance(entity, Movable) and isinstance(other, Movable):
+                root, other_root = find(entity), find(other)
+                if root is not other_root:
+                    parents[root] = other_root
+                if self.is_sleeping(entity):
+                    touched_sleepers[entity] = None
+                elif self.is_sleeping(other):
+                    touched_sleepers[other] = None
+        self.contact_first.clear()
+        self.contact_second.clear()
+
+        islands: dict[Entity, list[Entity]] = {}
+        for body in self.awake_bodies:
+            islands.setdefault(find(body), []).append(body)
+        for body in touched_sleepers:
+            islands.setdefault(find(body), []).append(body)
+
+        changed = False
+        for island in islands.values():
+            if all(self.is_sleeping(body) or rest_times.get(body.entity_id, 0.0) >= self.rest_time
+                   for body in island):
+                for body in island:
+                    if not self.is_sleeping(body):
+                        self.put_to_sleep(body)
+                        changed = True
+            elif any(not self.is_sleeping(body) and rest_times.get(body.entity_id, 0.0) == 0.0 for body in island):
+                # Only a moving body wakes the island, bodies that are resting next to it may join it later.
+                for body in island:
+                    if self.is_sleeping(body):
+                        self.wake(body)
+                        changed = True
+        if changed:
+            self.sort_entities()
@@ -0,0 +1,248 @@
+import io
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimObjects.SimpleObjects.Shape import Shape
+
+MAGIC = b"PHYSNAP\0"
+VERSION = 1
+
+# magic, version, tick count, next entity id, section count
+FILE_HEADER = struct.Struct("<8sHqqI")
+# class name length, entity count, column count
+SECTION_HEADER = struct.Struct("<HIH")
+# column name length, column kind, typecode, values per entity
+COLUMN_HEADER = struct.Struct("<HccH")
+OBJECTS_HEADER = struct.Struct("<Q")
+ALIGNMENT = 8
+
+VECTOR, FLOAT, INT, BOOL, INT_TUPLE, NONE = b"v", b"f", b"i", b"b", b"t", b"n"
+COLUMN_KINDS = {pygame.Vector2: (VECTOR, "d"), float: (FLOAT, "d"), int: (INT, "q"), bool: (BOOL, "b")}
+# Classes besides entities and shapes that the pickled attributes of a snapshot may contain.
+SAFE_CLASSES = (pygame.Vector2, pygame.Vector3, pygame.Rect, pygame.Color, complex, bytearray)
+
+
+def find_class(module_name: str, qualname: str, allowed_classes: tuple[type, ...] = ()) -> type:
+    """
+    Looks up a class named in a snapshot. Nothing is imported: the class has to be loaded already,
+    e.g. by the scenario that loads the snapshot, and it has to be an Entity or Shape subclass,
+    one of `SAFE_CLASSES` or one of the given allowed classes.
+    :param module_name: The module of the class.
+    :param qualname: The qualified name of the class within its module.
+    :param allowed_classes: Further classes the snapshot may contain.
+    :return: The class.
+    """
+    cls = sys.modules.get(module_name)
+    for part in qualname.split("."):
+        cls = getattr(cls, part, None)
+    if not (isinstance(cls, type) and (issubclass(cls, (Entity, Shape)) or cls in SAFE_CLASSES
+                                       or cls in allowed_classes)):
+        raise ValueError(f"{module_name}.{qualname} is not an imported entity, shape or allowed class")
+    return cls
+
+
+class SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that only creates the classes `find_class` accepts and never calls any other function."""
+
+    def __init__(self, data: bytes, allowed_classes: tuple[type, ...]):
+        super().__init__(io.BytesIO(data))
+        self.allowed_classes = allowed_classes
+
+    def find_class(self, module_name: str, name: str) -> type:
+        return find_class(module_name, name, self.allowed_classes)
+
+
+def get_attribute_names(entity: Entity) -> list[str]:
+    """
+    Returns the names of all instance attributes of an entity, from its `__slots__` and its `__dict__`.
+    :param entity: The entity to inspect.
+    :return: The attribute names in a stable order.
+    """
+    names = []
+    for cls in reversed(type(entity).__mro__):
+        slots = cls.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and name not in names:
+                names.append(name)
+    names.extend(name for name in getattr(entity, "__dict__", ()) if name not in names)
+    return names
+
+
+def get_column_kind(values: list) -> tuple[bytes, str, int] | None:
+    """
+    Finds the typed column layout that can store the given attribute values of all entities of a class.
+    :param values: The values of one attribute, one per entity.
+    :return: The column kind, the array typecode and the number of values per entity,
+             or None if the values have to be pickled.
+    """
+    value_type = type(values[0])
+    if not all(type(value) is value_type for value in values):
+        return None
+    if value_type in COLUMN_KINDS:
+        kind, typecode = COLUMN_KINDS[value_type]
+        return kind, typecode, 2 if kind == VECTOR else 1
+    if values[0] is None:
+        return NONE, "b", 0
+    if value_type is tuple:
+        width = len(values[0])
+        if all(len(value) == width and all(type(item) is int for item in value) for value in values):
+            return INT_TUPLE, "q", width
+    return None
+
+
+def write_snapshot(path: str, entities: tuple[Entity, ...], tick_count: int, next_id: int,
+                   state: dict | None = None):
+    """
+    Writes the state of the given entities to a snapshot file.
+    Entities are grouped by class. Attributes holding the same type (`pygame.Vector2`, float, int, bool,
+    tuples of ints such as colors, or None) on every entity of a class are stored as aligned typed arrays,
+    one column per attribute. All other attributes (shapes, integrator state, ...) are pickled once per class.
+    :param path: The file to write.
+    :param entities: The entities in the order they are updated.
+    :param tick_count: The tick count of the scenario.
+    :param next_id: The next entity id of the entity manager.
+    :param state: State of the scenario's subsystems that is not kept on the entities, e.g. the impulses
+                  cached by the contact solver. It is pickled after the entities and may only contain
+                  builtin types and `SAFE_CLASSES`.
+    """
+    groups: dict[type, list[int]] = {}
+    for order, entity in enumerate(entities):
+        groups.setdefault(type(entity), []).append(order)
+
+    with open(path, "wb") as file:
+        file.write(FILE_HEADER.pack(MAGIC, VERSION, tick_count, next_id, len(groups)))
+        for cls, orders in groups.items():
+            members = [entities[order] for order in orders]
+            names = get_attribute_names(members[0])
+            columns = [("order", INT, "q", 1, array("q", orders))]
+            objects = [{} for _ in members]
+
+            for name in names:
+                values = [getattr(member, name, objects) for member in members]
+                column_kind = get_column_kind(values)
+                if column_kind is not None:
+                    kind, typecode, width = column_kind
+                    data = array(typecode)
+                    if kind == VECTOR:
+                        for value in values:
+                            data.append(value.x)
+                            data.append(value.y)
+                    elif kind == INT_TUPLE:
+                        for value in values:
+                            data.extend(value)
+                    elif kind != NONE:
+                        data.extend(values)
+                    columns.append((name, kind, typecode, width, data))
+                else:
+                    for entity_objects, value in zip(objects, values):
+                        if value is not objects:
+                            entity_objects[name] = value
+
+            class_name = f"{cls.__module__}:{cls.__qualname__}".encode()
+            file.write(SECTION_HEADER.pack(len(class_name), len(members), len(columns)))
+            file.write(class_name)
+            for name, kind, typecode, width, data in columns:
+                encoded_name = name.encode()
+                file.write(COLUMN_HEADER.pack(len(encoded_name), kind, typecode.encode(), width))
+                file.write(encoded_name)
+                file.write(bytes(-file.tell() % ALIGNMENT))
+                data.tofile(file)
+
+            blob = pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL)
+            file.write(OBJECTS_HEADER.pack(len(blob)))
+            file.write(blob)
+
+        blob = pickle.dumps(state or {}, protocol=pickle.HIGHEST_PROTOCOL)
+        file.write(OBJECTS_HEADER.pack(len(blob)))
+        file.write(blob)
+
+
+def read_snapshot(path: str, allowed_classes: tuple[type, ...] = ()) -> tuple[list[Entity], int, int, dict]:
+    """
+    Reads the entities of a snapshot file written by `write_snapshot`.
+    The file is memory-mapped and the typed columns are read in place, without copying them first.
+    All entities are built right away, as every one of them takes part in the next tick.
+    Snapshots are pickle based, so a crafted file could run code if any class were accepted. Loading
+    therefore never imports modules and only creates the classes `find_class` accepts: imported Entity
+    and Shape subclasses, `SAFE_CLASSES` and the given allowed classes.
+    :param path: The file to read.
+    :param allowed_classes: Further classes that pickled entity attributes may contain.
+    :return: The entities in their original order, the tick count, the next entity id and the scenario state
+             passed to `write_snapshot`.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        buffer = memoryview(mapped)
+        try:
+            magic, version, tick_count, next_id, section_count = FILE_HEADER.unpack_from(buffer, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a PhySim snapshot")
+            if version != VERSION:
+                raise ValueError(f"{path} has snapshot version {version}, only version {VERSION} can be read")
+            offset = FILE_HEADER.size
+
+            entities = {}
+            for _ in range(section_count):
+                name_length, count, column_count = SECTION_HEADER.unpack_from(buffer, offset)
+                offset += SECTION_HEADER.size
+                module_name, qualname = bytes(buffer[offset:offset + name_length]).decode().split(":")
+                offset += name_length
+                cls = find_class(module_name, qualname)
+                if not issubclass(cls, Entity):
+                    raise ValueError(f"{module_name}.{qualname} is not an entity class")
+
+                members = [cls.__new__(cls) for _ in range(count)]
+                orders = None
+                for _ in range(column_count):
+                    name_length, kind, typecode, width = COLUMN_HEADER.unpack_from(buffer, offset)
+                    offset += COLUMN_HEADER.size
+                    name = bytes(buffer[offset:offset + name_length]).decode()
+                    offset += name_length
+                    offset += -offset % ALIGNMENT
+                    typecode = typecode.decode()
+                    size = count * width * array(typecode).itemsize
+                    data = buffer[offset:offset + size].cast(typecode)
+                    offset += size
+
+                    if name == "order":
+                        orders = data.tolist()
+                    elif kind == VECTOR:
+                        values = data.tolist()
+                        for i, member in enumerate(members):
+                            setattr(member, name, pygame.Vector2(values[2 * i], values[2 * i + 1]))
+                    elif kind == INT_TUPLE:
+                        values = data.tolist()
+                        for i, member in enumerate(members):
+                            setattr(member, name, tuple(values[width * i:width * (i + 1)]))
+                    elif kind == NONE:
+                        for member in members:
+                            setattr(member, name, None)
+                    elif kind == BOOL:
+                        for member, value in zip(members, data.tolist()):
+                            setattr(member, name, bool(value))
+                    else:
+                        for member, value in zip(members, data.tolist()):
+                            setattr(member, name, value)
+                    data.release()
+
+                blob_length, = OBJECTS_HEADER.unpack_from(buffer, offset)
+                offset += OBJECTS_HEADER.size
+                objects = SnapshotUnpickler(buffer[offset:offset + blob_length], allowed_classes).load()
+                offset += blob_length
+                for member, entity_objects in zip(members, objects):
+                    for name, value in entity_objects.items():
+                        setattr(member, name, value)
+                entities.update(zip(orders, members))
+
+            blob_length, = OBJECTS_HEADER.unpack_from(buffer, offset)
+            offset += OBJECTS_HEADER.size
+            state = SnapshotUnpickler(buffer[offset:offset + blob_length], allowed_classes).load()
+        finally:
+            buffer.release()
+
+    return [entities[order] for order in sorted(entities)], tick_count, next_id, state
@@ -0,0 +1,98 @@
+from PhySimEngine.Entity import Entity
+
+
+class SpatialHash:
+    """
+    Uniform grid broad phase for collision detection.
+    Every collidable entity is bucketed by the cell that contains its centre. The cell size is
+    kept at least as large as the biggest diameter, so two overlapping entities are always in the
+    same or in neighbouring cells. If any shape has no bounding radius, all entities fall back to a single
+    cell and every pair is a candidate.
+    The entities are sorted by cell and every cell is a slice of that order, so rebuilding the grid
+    does not allocate a bucket per cell.
+    """
+    # Cells are keyed by cell_x * ROW_STRIDE + cell_y, plain ints need no allocation per entity.
+    ROW_STRIDE = 1 << 32
+    # Only half of the 8 neighbours are visited, which yields every unordered pair exactly once.
+    NEIGHBOUR_OFFSETS = (ROW_STRIDE - 1, ROW_STRIDE, ROW_STRIDE + 1, 1)
+
+    def __init__(self):
+        self.cell_size = 1.0
+        self.entities: list[Entity] = []
+        self.cell_starts: dict[int, int] = {}
+        self.cell_ends: dict[int, int] = {}
+
+    def rebuild(self, entities: list[Entity], sweep_time: float = 0.0):
+        """
+        Rebuilds the grid from the current positions of the given entities.
+        :param entities: Entities that provide a collision shape via `get_collision_shape()`.
+        :param sweep_time: Grows every bounding radius by the distance the entity travels in this time,
+                           so pairs that only meet during the coming tick are found as well.
+        """
+        self.entities = []
+        self.cell_starts = {}
+        self.cell_ends = {}
+        if not entities:
+            return
+
+        radii = [entity.get_collision_shape().get_bounding_radius() for entity in entities]
+        if None in radii:
+            # A shape without a known bound can touch anything, so every entity shares a single cell.
+            self.entities = list(entities)
+            self.cell_starts[0] = 0
+            self.cell_ends[0] = len(entities)
+            return
+        if sweep_time > 0:
+            max_radius = max(radius + (entity.velocity.length() * sweep_time if hasattr(entity, 'velocity') else 0.0)
+                             for radius, entity in zip(radii, entities))
+        else:
+            max_radius = max(radii)
+        self.cell_size = max(2 * max_radius, 1.0)
+
+        cell_size = self.cell_size
+        row_stride = self.ROW_STRIDE
+        keys = [int(e.position.x // cell_size) * row_stride + int(e.position.y // cell_size) for e in entities]
+        order = sorted(range(len(entities)), key=keys.__getitem__)
+        self.entities = [entities[i] for i in order]
+
+        cell_starts = self.cell_starts
+        cell_ends = self.cell_ends
+        index = 0
+        for i in order:
+            key = keys[i]
+            if key not in cell_starts:
+                cell_starts[key] = index
+            index += 1
+            cell_ends[key] = index
+
+    def get_pairs(self) -> tuple[list[Entity], list[Entity]]:
+        """
+        Returns all candidate pairs from the grid. Each unordered pair is returned once.
+        The pairs are stored in two parallel lists instead of a list of tuples, which avoids
+        allocating a tuple per pair and keeps the garbage collector quiet.
+        Returns: Two lists, the i-th pair is (first[i], second[i]).
+        """
+        first = []
+        second = []
+        entities = self.entities
+        cell_starts = self.cell_starts
+        cell_ends = self.cell_ends
+        for key in cell_starts:
+            start = cell_starts[key]
+            end = cell_ends[key]
+            for i in range(start, end - 1):
+                entity = entities[i]
+                for j in range(i + 1, end):
+                    first.append(entity)
+                    second.append(entities[j])
+
+            for offset in self.NEIGHBOUR_OFFSETS:
+                neighbour_start = cell_starts.get(key + offset)
+                if neighbour_start is not None:
+                    neighbour_end = cell_ends[key + offset]
+                    for i in range(start, end):
+                        entity = entities[i]
+                        for j in range(neighbour_start, neighbour_end):
+                            first.append(entity)
+                            second.append(entities[j])
+        return first, second
@@ -0,0 +1,227 @@
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimEngine.EntityManager import EntityManager
+
+
+class SpriteRenderer:
+    """
+    Draws all entities of a scenario with as few Python-level draw calls as possible.
+    Entities providing `get_sprite(renderer)` are drawn from cached, pre-rasterized sprites with a single
+    `Surface.blits` call. Entities providing `render_static(surface)` are drawn once onto a cached background
+    layer. Both are only looked up again when entities are added or removed or `invalidate` is called,
+    so entities changing their color, size or static drawing at runtime have to call `invalidate`.
+    All other entities fall back to their own `render` method, and so do entities whose class overrides `render`
+    below the class that provides `get_sprite` or `render_static`, as the sprite would not match their drawing.
+    `render_dirty` only redraws the areas of sprites that moved since the previous frame.
+    """
+
+    def __init__(self, max_dirty_fraction: float = 0.25):
+        """
+        :param max_dirty_fraction: Share of moved sprites above which `render_dirty` redraws the whole surface,
+                                   as restoring many small areas becomes slower than a single full redraw.
+        """
+        self.sprites: dict[tuple, tuple[pygame.Surface, int]] = {}
+        self.entities: tuple[Entity, ...] | None = None
+        self.sprite_entities: list[tuple[Entity, pygame.Surface, int]] = []
+        self.static_entities: list[Entity] = []
+        self.other_entities: list[Entity] = []
+        self.static_layer: pygame.Surface | None = None
+        self.static_layer_color = None
+        self.max_dirty_fraction = max_dirty_fraction
+        self.drawn_sequence: list[tuple] | None = None
+        self.dirty_surface: pygame.Surface | None = None
+        self.batched_methods: dict[type, str | None] = {}
+
+    def get_circle_sprite(self, radius: float, color, ring_radius: float = 0) -> tuple[pygame.Surface, int]:
+        """
+        Returns a cached sprite of a filled circle, optionally surrounded by a one pixel wide ring.
+        :param radius: Radius of the filled circle in pixels.
+        :param color: Color of the circle and the ring.
+        :param ring_radius: Radius of the ring in pixels, 0 draws no ring.
+        :return: The sprite and the offset from its top left corner to the circle center.
+        """
+        key = (int(radius), tuple(color), int(ring_radius))
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            radius, color, ring_radius = key
+            offset = max(radius, ring_radius)
+            surface = pygame.Surface((2 * offset + 1, 2 * offset + 1))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            colorkey = (0, 0, 0) if color[:3] != (0, 0, 0) else (255, 0, 255)
+            surface.fill(colorkey)
+            pygame.draw.circle(surface, color, (offset, offset), radius)
+            if ring_radius:
+                pygame.draw.circle(surface, color, (offset, offset), ring_radius, 1)
+            surface.set_colorkey(colorkey, pygame.RLEACCEL)
+            sprite = (surface, offset)
+            self.sprites[key] = sprite
+        return sprite
+
+    def invalidate(self):
+        """Looks up the sprites and redraws the static layer in the next frame."""
+        self.entities = None
+
+    def get_batched_method(self, cls: type) -> str | None:
+        """
+        Returns how entities of a class are batched: "get_sprite", "render_static" or None to call their `render`.
+        A method only counts if it is defined on the same class as `render` or on a subclass of it.
+        :param cls: The class of the entities.
+        """
+        if cls in self.batched_methods:
+            return self.batched_methods[cls]
+        owners = {}
+        for base in reversed(cls.__mro__):
+            for name in ("get_sprite", "render_static", "render"):
+                if name in base.__dict__:
+                    owners[name] = base
+        method = None
+        for name in ("get_sprite", "render_static"):
+            if name in owners and ("render" not in owners or issubclass(owners[name], owners["render"])):
+                method = name
+                break
+        self.batched_methods[cls] = method
+        return method
+
+    def sort_entities(self, entities: tuple[Entity, ...]):
+        self.entities = entities
+        self.sprite_entities = []
+        self.static_entities = []
+        self.other_entities = []
+        for entity in entities:
+            method = self.get_batched_method(type(entity))
+            if method == "get_sprite":
+                self.sprite_entities.append((entity, *entity.get_sprite(self)))
+            elif method == "render_static":
+                self.static_entities.append(entity)
+            else:
+                self.other_entities.append(entity)
+        self.static_layer = None
+
+    def get_blit_sequence(self, previous_positions: dict, interpolation: float | None) -> list[tuple]:
+        """
+        Returns the sprites of all sprite entities with the position of their top left corner.
+        :param previous_positions: Positions of the entities in the previous tick, used for interpolation.
+        :param interpolation: Fraction between the previous and the current tick, None uses the current positions.
+        """
+        if interpolation is None or not previous_positions:
+            return [(sprite, (int(entity.position.x) - offset, int(entity.position.y) - offset))
+                    for entity, sprite, offset in self.sprite_entities]
+
+        blit_sequence = []
+        for entity, sprite, offset in self.sprite_entities:
+            position = entity.position
+            previous_position = previous_positions.get(entity)
+            if previous_position is not None:
+                position = previous_position.lerp(position, interpolation)
+            blit_sequence.append((sprite, (int(position.x) - offset, int(position.y) - offset)))
+        return blit_sequence
+
+    def update_static_layer(self, surface: pygame.Surface, background_color) -> bool:
+        """
+        Redraws the static layer if it is missing or the surface size or the background color changed.
+        :return: True if the layer was redrawn.
+        """
+        if (self.static_layer is not None and self.static_layer.get_size() == surface.get_size()
+                and self.static_layer_color == background_color):
+            return False
+        self.static_layer = pygame.Surface(surface.get_size(), 0, surface)
+        self.static_layer.fill(background_color)
+        self.static_layer_color = background_color
+        for entity in self.static_entities:
+            entity.render_static(self.static_layer)
+        return True
+
+    def render(self, surface: pygame.Surface, entity_manager: EntityManager, background_color,
+               previous_positions: dict | None = None, interpolation: float | None = None):
+        """
+        Draws the background, the static layer and all entities onto the surface.
+        :param surface: The surface to draw on.
+        :param entity_manager: The entity manager holding the entities to draw.
+        :param background_color: Color the surface is filled with.
+        :param previous_positions: Positions of the entities in the previous tick, used for interpolation.
+        :param interpolation: Fraction between the previous and the current tick at which the entities
+                              are drawn. None draws them at their current position.
+        """
+        entities = entity_manager.get_entities()
+        if entities is not self.entities:
+            self.sort_entities(entities)
+        self.update_static_layer(surface, background_color)
+        self.draw_frame(surface, self.get_blit_sequence(previous_positions, interpolation),
+                        previous_positions, interpolation)
+        self.drawn_sequence = None
+
+    def draw_frame(self, surface: pygame.Surface, blit_sequence: list[tuple], previous_positions: dict | None,
+                   interpolation: float | None):
+        surface.blit(self.static_layer, (0, 0))
+        surface.blits(blit_sequence, False)
+
+        if interpolation is None:
+            previous_positions = None
+        for entity in self.other_entities:
+            previous_position = previous_positions.get(entity) if previous_positions else None
+            if previous_position is None:
+                entity.render(surface)
+            else:
+                current_position = entity.position
+                entity.position = previous_position.lerp(current_position, interpolation)
+                entity.render(surface)
+                entity.position = current_position
+
+    def render_dirty(self, surface: pygame.Surface, entity_manager: EntityManager, background_color,
+                     previous_positions: dict | None = None, interpolation: float | None = None,
+                     extra_rects: list[pygame.Rect] = ()) -> list[pygame.Rect] | None:
+        """
+        Same as `render`, but only redraws the regions of the surface that changed since the previous call,
+        by restoring them from the static layer and drawing the sprites that overlap them.
+        The whole surface is redrawn when entities were added or removed, the static layer or the surface
+        changed, an entity without a sprite has to be drawn, or more than `max_dirty_fraction` of the
+        sprites moved.
+        :param surface: The surface to draw on. It must keep the content of the previous call.
+        :param entity_manager: The entity manager holding the entities to draw.
+        :param background_color: Color the surface is filled with.
+        :param previous_positions: Positions of the entities in the previous tick, used for interpolation.
+        :param interpolation: Fraction between the previous and the current tick at which the entities
+                              are drawn. None draws them at their current position.
+        :param extra_rects: Areas that were drawn over since the previous call, e.g. an overlay.
+        :return: The changed areas to pass to `pygame.display.update`, or None if the whole surface was redrawn.
+        """
+        entities = entity_manager.get_entities()
+        if entities is not self.entities:
+            self.sort_entities(entities)
+        redrawn = self.update_static_layer(surface, background_color)
+        blit_sequence = self.get_blit_sequence(previous_positions, interpolation)
+        drawn_sequence = self.drawn_sequence
+        if redrawn or drawn_sequence is None or surface is not self.dirty_surface or self.other_entities:
+            self.draw_frame(surface, blit_sequence, previous_positions, interpolation)
+            self.drawn_sequence = blit_sequence
+            self.dirty_surface = surface
+            return None
+        if blit_sequence == drawn_sequence:
+            dirty_rects = list(extra_rects)
+        else:
+            limit = self.max_dirty_fraction * len(blit_sequence)
+            dirty_rects = []
+            for (sprite, position), (_, drawn_position) in zip(blit_sequence, drawn_sequence):
+                if position != drawn_position:
+                    if len(dirty_rects) >= limit:
+                        self.draw_frame(surface, blit_sequence, previous_positions, interpolation)
+                        self.drawn_sequence = blit_sequence
+                        return None
+                    size = sprite.get_size()
+                    dirty_rects.append(pygame.Rect(position, size).union(drawn_position, size))
+            dirty_rects.extend(extra_rects)
+        self.drawn_sequence = blit_sequence
+        if not dirty_rects:
+            return dirty_rects
+
+        # Restores all areas first, then redraws the sprites overlapping each area, clipped to it.
+        static_layer = self.static_layer
+        surface.blits([(static_layer, rect, rect) for rect in dirty_rects], False)
+        rects = [pygame.Rect(position, sprite.get_size()) for sprite, position in blit_sequence]
+        for rect in dirty_rects:
+            surface.set_clip(rect)
+            surface.blits([blit_sequence[i] for i in rect.collidelistall(rects)], False)
+        surface.set_clip(None)
+        return dirty_rects
@@ -0,0 +1,119 @@
+import csv
+import itertools
+import os
+import time
+from multiprocessing import Pool
+from typing import Callable
+
+
+def default_metrics(scenario) -> dict:
+    """
+    Summary of the final state of a scenario: number of entities and the total kinetic energy and momentum
+    of all entities that have a mass and a velocity.
+    :param scenario: The scenario after its run.
+    :return: The metrics by column name.
+    """
+    kinetic_energy = 0.0
+    momentum_x = 0.0
+    momentum_y = 0.0
+    for entity in scenario.entity_manager.get_entities():
+        if hasattr(entity, 'get_mass') and hasattr(entity, 'velocity'):
+            mass = entity.get_mass()
+            kinetic_energy += 0.5 * mass * entity.velocity.length_squared()
+            momentum_x += mass * entity.velocity.x
+            momentum_y += mass * entity.velocity.y
+    return {
+        "entities": len(scenario.entity_manager.get_entities()),
+        "kinetic_energy": kinetic_energy,
+        "momentum": (momentum_x ** 2 + momentum_y ** 2) ** 0.5
+    }
+
+
+def _run_configuration(task: tuple) -> dict:
+    scenario_class, configuration, ticks, metrics = task
+    start = time.perf_counter()
+    scenario = scenario_class(**{**configuration, "headless": True})
+    try:
+        scenario.step(ticks)
+        row = dict(configuration)
+        row["ticks"] = scenario.tick_count
+        row.update(metrics(scenario))
+    finally:
+        scenario.close()
+    row["seconds"] = time.perf_counter() - start
+    return row
+
+
+class SweepRunner:
+    """
+    Runs a scenario class headless for every combination of a parameter grid and collects summary metrics.
+    Every configuration is passed to the scenario as config overrides and runs for a fixed number of ticks
+    of length 1 / tps, so with a `seed` in the grid or the configuration every run is reproducible.
+    The runs are distributed over a process pool; the scenario class and the metrics function have to be
+    importable at module level so they can be sent to the workers.
+    """
+
+    def __init__(self, scenario_class: type, grid: dict[str, list], ticks: int,
+                 metrics: Callable[..., dict] = default_metrics, workers: int | None = None):
+        """
+        :param scenario_class: The Scenario subclass to run, constructed with the configuration as keyword arguments.
+        :param grid: Maps config keys to the values to try, e.g. {"G": [0.05, 0.1], "seed": [0, 1, 2]}.
+        :param ticks: Number of ticks every configuration is run for.
+        :param metrics: Function returning the metrics of a scenario after its run, by column name.
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        """
+        self.scenario_class = scenario_class
+        self.grid = grid
+        self.ticks = ticks
+        self.metrics = metrics
+        self.workers = workers or os.cpu_count() or 1
+
+    def get_configurations(self) -> list[dict]:
+        """
+        Returns all combinations of the grid values, in the order of the grid keys.
+        """
+        keys = list(self.grid)
+        return [dict(zip(keys, values)) for values in itertools.product(*(self.grid[key] for key in keys))]
+
+    def run(self) -> list[dict]:
+        """
+        Runs all configurations and returns one row per configuration, in the order of `get_configurations`.
+        Each row holds the configuration, the number of ticks, the metrics and the wall time of the run.
+        """
+        tasks = [(self.scenario_class, configuration, self.ticks, self.metrics)
+                 for configuration in self.get_configurations()]
+        if self.workers == 1 or len(tasks) <= 1:
+            return [_run_configuration(task) for task in tasks]
+        with Pool(min(self.workers, len(tasks))) as pool:
+            rows = pool.map(_run_configuration, tasks, chunksize=1)
+            # Lets the workers exit on their own. Once a window was opened, SDL ignores the SIGTERM
+            # `terminate` sends to the workers it forked, which would wait forever.
+            pool.close()
+            pool.join()
+        return rows
+
+    @staticmethod
+    def format_table(rows: list[dict]) -> str:
+        """
+        Formats result rows as an aligned text table.
+        :param rows: The rows returned by `run`.
+        """
+        if not rows:
+            return ""
+        columns = list(rows[0])
+        cells = [columns] + [[f"{row[c]:.6g}" if isinstance(row[c], float) else str(row[c]) for c in columns]
+                             for row in rows]
+        widths = [max(len(line[i]) for line in cells) for i in range(len(columns))]
+        return "\n".join("  ".join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+
+    @staticmethod
+    def write_csv(rows: list[dict], path: str):
+        """
+        Writes result rows to a CSV file.
+        :param rows: The rows returned by `run`.
+        :param path: The file to write.
+        """
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]) if rows else [])
+            writer.writeheader()
+            writer.writerows(rows)
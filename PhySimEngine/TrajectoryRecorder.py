@@ -0,0 +1,227 @@
+import mmap
+import os
+import struct
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAGIC = b"PHYTRAJ\0"
+VERSION = 1
+
+# magic, version, record size, tick interval
+FILE_HEADER = struct.Struct("<8sHHI")
+# tick, entity id, position x, position y, velocity x, velocity y
+RECORD = struct.Struct("<qqdddd")
+
+
+class TrajectoryRecorder:
+    """
+    Streams the position and velocity of every entity to an append-only file while the scenario runs.
+    Every recorded tick appends one fixed-width record per entity. Records are collected in a buffer of
+    `chunk_records` records and written whenever it is full, so memory use does not grow with the run length.
+    The state before the first tick of a run is recorded as well, e.g. tick 0.
+    Opening an existing file of the same layout and tick interval appends to it, e.g. after restarting a run
+    from a snapshot. When a run restarts at a tick that is already in the file, e.g. from an earlier snapshot,
+    the records from that tick on are dropped first, so the ticks in the file keep increasing.
+    Use a `TrajectoryReader` to access the records by tick.
+    """
+
+    def __init__(self, path: str, every: int = 1, chunk_records: int = 65536):
+        """
+        :param path: The file to append the records to.
+        :param every: Records only every n-th tick.
+        :param chunk_records: Number of records that are buffered before they are written to the file.
+        """
+        self.path = path
+        self.every = every
+        self.chunk_records = chunk_records
+        self.buffer = bytearray(chunk_records * RECORD.size)
+        self.buffered = 0
+        self.file = None
+        self.last_tick = None
+
+    def open(self, tick: int):
+        """
+        Opens the file for appending, creating it if needed.
+        :param tick: The first tick that is recorded, records of this and later ticks are dropped from the file.
+        """
+        self.file = open(self.path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION, RECORD.size, self.every))
+            return
+        with open(self.path, "rb") as existing:
+            magic, version, record_size, every = FILE_HEADER.unpack(existing.read(FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a trajectory file of version {VERSION}")
+        if every != self.every:
+            self.close()
+            raise ValueError(f"{self.path} records every {every}th tick, not every {self.every}th")
+        self.truncate(tick)
+
+    def truncate(self, tick: int):
+        """
+        Drops the records of the given tick and all later ones from the file.
+        :param tick: The first tick to drop.
+        """
+        self.flush()
+        reader = TrajectoryReader(self.path)
+        try:
+            index = reader.find(tick)
+        finally:
+            reader.close()
+        self.file.truncate(FILE_HEADER.size + index * RECORD.size)
+
+    def record(self, scenario):
+        """
+        Appends the state of all entities of the scenario, if the current tick is recorded and wasn't yet.
+        Called by the scenario before the first tick of a run and after every tick.
+        :param scenario: The scenario to record.
+        """
+        tick = scenario.tick_count
+        if tick % self.every or tick == self.last_tick:
+            return
+        if self.file is None:
+            self.open(tick)
+        elif self.last_tick is None or tick < self.last_tick:
+            # The run restarted, e.g. from a snapshot, so the records it replaces are dropped.
+            self.truncate(tick)
+        self.last_tick = tick
+        scenario.entity_manager.sync_entities()
+
+        buffer = self.buffer
+        pack_into = RECORD.pack_into
+        record_size = RECORD.size
+        for entity in scenario.entity_manager.get_entities():
+            if self.buffered == self.chunk_records:
+                self.flush()
+            position = entity.position
+            velocity = getattr(entity, "velocity", None)
+            if velocity is None:
+                pack_into(buffer, self.buffered * record_size, tick, entity.entity_id, position.x, position.y, 0.0, 0.0)
+            else:
+                pack_into(buffer, self.buffered * record_size, tick, entity.entity_id,
+                          position.x, position.y, velocity.x, velocity.y)
+            self.buffered += 1
+
+    def restart(self):
+        """
+        Records the next recorded tick again, replacing the records of it and all later ticks in the file.
+        Called by the scenario when it loads a snapshot.
+        """
+        self.last_tick = None
+
+    def flush(self):
+        """Writes the buffered records to the file."""
+        if self.buffered:
+            with memoryview(self.buffer) as view:
+                self.file.write(view[:self.buffered * RECORD.size])
+            self.buffered = 0
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        """Writes the buffered records and closes the file."""
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+        self.last_tick = None
+
+
+class TrajectoryReader:
+    """
+    Memory-maps a file written by a `TrajectoryRecorder` for random access by tick.
+    The records of a tick are contiguous and ticks only increase, so a tick is found by binary search
+    without reading the whole file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        header = self.file.read(FILE_HEADER.size)
+        if len(header) < FILE_HEADER.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a trajectory file")
+        magic, version, record_size, self.every = FILE_HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.file.close()
+            raise ValueError(f"{path} is not a trajectory file of version {VERSION}")
+        self.record_count = (size - FILE_HEADER.size) // RECORD.size
+        self.mapped = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.record_count else None
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def get_record(self, index: int) -> tuple[int, int, float, float, float, float]:
+        """
+        Returns a single record.
+        :param index: Index of the record in the file.
+        :return: The tick, entity id, position x, position y, velocity x and velocity y.
+        """
+        return RECORD.unpack_from(self.mapped, FILE_HEADER.size + index * RECORD.size)
+
+    def get_tick_of(self, index: int) -> int:
+        return struct.unpack_from("<q", self.mapped, FILE_HEADER.size + index * RECORD.size)[0]
+
+    def find(self, tick: int) -> int:
+        """
+        Returns the index of the first record of the first tick that is not smaller than the given one.
+        :param tick: The tick to look up.
+        """
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_tick_of(middle) < tick:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def get_tick(self, tick: int) -> list[tuple[int, int, float, float, float, float]]:
+        """
+        Returns all records of a tick.
+        :param tick: The tick to read.
+        :return: The records of the tick, empty if the tick was not recorded.
+        """
+        start = self.find(tick)
+        end = self.find(tick + 1)
+        return list(RECORD.iter_unpack(self.mapped[FILE_HEADER.size + start * RECORD.size:
+                                                   FILE_HEADER.size + end * RECORD.size]))
+
+    def get_ticks(self) -> list[int]:
+        """Returns all recorded ticks in increasing order."""
+        ticks = []
+        index = 0
+        while index < self.record_count:
+            tick = self.get_tick_of(index)
+            ticks.append(tick)
+            index = self.find(tick + 1)
+        return ticks
+
+    def as_array(self):
+        """
+        Returns all records as a memory-mapped NumPy structured array with the fields
+        tick, entity_id, x, y, vx and vy. Requires NumPy.
+        """
+        if np is None:
+            raise ImportError("TrajectoryReader.as_array requires NumPy. Install it with `pip install numpy`.")
+        dtype = np.dtype([("tick", "<i8"), ("entity_id", "<i8"), ("x", "<f8"), ("y", "<f8"),
+                          ("vx", "<f8"), ("vy", "<f8")])
+        if not self.record_count:
+            return np.empty(0, dtype=dtype)
+        return np.frombuffer(self.mapped, dtype=dtype, count=self.record_count, offset=FILE_HEADER.size)
+
+    def close(self):
+        """Closes the file. Arrays returned by `as_array` stay valid and keep the mapping alive until released."""
+        if self.mapped is not None:
+            try:
+                self.mapped.close()
+            except BufferError:
+                # An array of `as_array` still views the mapping, it is unmapped when the array is released.
+                pass
+            self.mapped = None
+        self.file.close()
@@ -8,6 +8,31 @@ class CircleShape(Shape):
     def render_shape(self, surface: pygame.Surface, position: pygame.Vector2, color):
         pygame.draw.circle(surface, color, (int(position.x), int(position.y)), int(self.radius))
 
+    def get_sprite(self, renderer, color) -> tuple[pygame.Surface, int]:
+        return renderer.get_circle_sprite(self.radius, color)
+
+    def get_bounding_radius(self) -> float:
+        return self.radius
+
+    def get_time_of_impact(self, other: 'Shape', self_pos: pygame.Vector2, other_pos: pygame.Vector2,
+                           relative_velocity: pygame.Vector2, max_time: float) -> float | None:
+        if not isinstance(other, CircleShape):
+            return None
+        # Aims slightly inside the contact distance, so `intersects` holds at the returned time.
+        combined_radii = (self.radius + other.radius) * (1 - 1e-9)
+        distance_x = self_pos.x - other_pos.x
+        distance_y = self_pos.y - other_pos.y
+        a = relative_velocity.x * relative_velocity.x + relative_velocity.y * relative_velocity.y
+        b = distance_x * relative_velocity.x + distance_y * relative_velocity.y
+        if a == 0 or b >= 0:
+            return None
+        c = distance_x * distance_x + distance_y * distance_y - combined_radii * combined_radii
+        discriminant = b * b - a * c
+        if discriminant < 0:
+            return None
+        time = (-b - discriminant ** 0.5) / a
+        return time if 0 <= time <= max_time else None
+
     def intersects(self, other: 'Shape', self_pos: pygame.Vector2, other_pos: pygame.Vector2) -> bool:
         if isinstance(other, CircleShape):
             distance = self_pos.distance_to(other_pos)
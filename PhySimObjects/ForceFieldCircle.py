@@ -4,18 +4,23 @@ from PhySimEngine.Entity import Entity
 from PhySimEngine.Scenario import Scenario
 from PhySimObjects.SimpleObjects.Movable import Movable
 from PhySimObjects.SimpleObjects.Collision import Collision
+from PhySimObjects.SimpleObjects.CircleCollision import CircleCollision
 from PhySimObjects.SimpleObjects.Mass import Mass
 from PhySimObjects.SimpleObjects.RecieveForce import ReceiveForce
 from PhySimObjects.CircleShape import CircleShape
 from PhySimObjects.SimpleObjects.ForceField import ForceField
 
 
-class ForceFieldCircle(Entity, Movable, Collision, Mass, ReceiveForce):
+class ForceFieldCircle(Entity, Movable, CircleCollision, Mass, ReceiveForce):
     """
     A circular entity that is primarily affected by ForceField objects,
     handles screen border collisions, and has basic physics properties.
     It does NOT implement global gravitational attraction or attraction from Attractors.
     """
+    __slots__ = ("velocity", "mass",
+                 "shape", "restitution", "color", "radius", "force_accumulated", "pending_velocity_change",
+                 "pending_position_correction")
+
     def __init__(self, x: int, y: int, radius: float, color: tuple,
                  initial_velocity: pygame.Vector2, mass: float = 1.0,
                  restitution: float = 0.7):
@@ -31,7 +36,7 @@ class ForceFieldCircle(Entity, Movable, Collision, Mass, ReceiveForce):
         self.color = color
         self.radius = radius
 
-        self.net_force_accumulated = pygame.Vector2(0, 0)
+        self.force_accumulated = pygame.Vector2(0, 0)
         self.pending_velocity_change = pygame.Vector2(0, 0)
         self.pending_position_correction = pygame.Vector2(0, 0)
 
@@ -39,91 +44,75 @@ class ForceFieldCircle(Entity, Movable, Collision, Mass, ReceiveForce):
         """Returns the circle's shape for collision detection."""
         return self.shape
 
-    def resolve_collision(self, other: 'Collision'):
-        """
-        Handles collision resolution. For this class, we'll only resolve
-        collisions with other ForceFieldCircles for simplicity.
-        """
-        if isinstance(other, ForceFieldCircle):
-            other_circle = other
-            distance = self.position.distance_to(other_circle.position)
-            combined_radii = self.radius + other_circle.radius
-
-            if distance < combined_radii and distance != 0:
-                overlap = combined_radii - distance
-                direction = (self.position - other_circle.position).normalize()
-
-                self.pending_position_correction += direction * (overlap / 2)
-                other_circle.pending_position_correction -= direction * (overlap / 2)
-
-                relative_velocity = self.velocity - other_circle.velocity
-                velocity_along_normal = relative_velocity.dot(direction)
+    def collides_with(self, other: 'Collision') -> bool:
+        return isinstance(other, ForceFieldCircle)
 
-                if velocity_along_normal < 0:
-                    e = min(self.restitution, other_circle.restitution)
-                    j = -(1 + e) * velocity_along_normal
-                    j_divisor = (1 / self.mass) + (1 / other_circle.mass)
-                    if j_divisor == 0:
-                        return
-
-                    j /= j_divisor
-
-                    impulse = j * direction
-                    self.pending_velocity_change += impulse / self.mass
-                    other_circle.pending_velocity_change -= impulse / other_circle.mass
+    def get_border_radius(self) -> float:
+        return self.radius
 
     def get_mass(self) -> float:
         return self.mass
 
     def apply_force(self, force: pygame.Vector2, delta_time: float):
-        self.net_force_accumulated += force
+        self.force_accumulated += force
 
     def apply_movement(self, delta_time: float):
-        self.position += self.velocity * delta_time
+        self.position.x += self.velocity.x * delta_time
+        self.position.y += self.velocity.y * delta_time
 
     def calculate_physics(self, delta_time: float, scenario: Scenario):
-        for other_entity in scenario.entity_manager.get_entities():
-            if isinstance(other_entity, ForceField):
-                field_force = other_entity.get_applied_force(self)
-                self.apply_force(field_force, delta_time)
+        if scenario.parallel_forces is not None and scenario.parallel_forces.has_force(self):
+            self.apply_force(scenario.parallel_forces.get_force(self), delta_time)
+        elif scenario.force_field_grid is not None:
+            scenario.force_field_grid.add_force(self.position, self.force_accumulated)
+        else:
+            for force_field in scenario.entity_manager.entities_of(ForceField):
+                force_field.add_applied_force(self, self.force_accumulated)
 
-        self.pending_velocity_change = pygame.Vector2(0, 0)
-        self.pending_position_correction = pygame.Vector2(0, 0)
-
-        for other_entity in scenario.entity_manager.get_entities():
-            if other_entity is not self and isinstance(other_entity, Collision):
-                if isinstance(other_entity, ForceFieldCircle):
-                    if self.get_collision_shape().intersects(other_entity.get_collision_shape(), self.position, other_entity.position):
-                        self.resolve_collision(other_entity)
+        self.pending_velocity_change.update(0, 0)
+        self.pending_position_correction.update(0, 0)
 
     def update(self, delta_time: float, scenario: Scenario):
-        if self.mass > 0:
-            acceleration = self.net_force_accumulated / self.mass
-            self.velocity += acceleration * delta_time
-        self.net_force_accumulated = pygame.Vector2(0, 0)
-
-        self.velocity += self.pending_velocity_change
-        self.position += self.pending_position_correction
-
-        self.apply_movement(delta_time)
-
-        screen_rect = scenario.display_surface.get_rect()
+        if scenario.integrator is not None:
+            scenario.integrator.integrate(self, delta_time)
+            self.force_accumulated.update(0, 0)
+        else:
+            if self.mass > 0:
+                self.velocity.x += self.force_accumulated.x / self.mass * delta_time
+                self.velocity.y += self.force_accumulated.y / self.mass * delta_time
+            self.force_accumulated.update(0, 0)
+
+            self.velocity += self.pending_velocity_change
+            self.position += self.pending_position_correction
+
+            self.apply_movement(delta_time)
+
+        if scenario.contact_solver is not None:
+            # The solver already resolved the contacts with the world borders.
+            return
+
+        screen_rect = scenario.world_rect
+        # With continuous collisions the part of the tick after the contact is spent moving away from the wall.
+        rebound = self.restitution if scenario.continuous_collisions else 0.0
         if self.position.x - self.radius < screen_rect.left:
-            self.position.x = screen_rect.left + self.radius
+            self.position.x = screen_rect.left + self.radius + (screen_rect.left + self.radius - self.position.x) * rebound
             self.velocity.x *= -self.restitution
             if abs(self.velocity.x) < 0.1: self.velocity.x = 0
         if self.position.x + self.radius > screen_rect.right:
-            self.position.x = screen_rect.right - self.radius
+            self.position.x = screen_rect.right - self.radius - (self.position.x + self.radius - screen_rect.right) * rebound
             self.velocity.x *= -self.restitution
             if abs(self.velocity.x) < 0.1: self.velocity.x = 0
         if self.position.y - self.radius < screen_rect.top:
-            self.position.y = screen_rect.top + self.radius
+            self.position.y = screen_rect.top + self.radius + (screen_rect.top + self.radius - self.position.y) * rebound
             self.velocity.y *= -self.restitution
             if abs(self.velocity.y) < 0.1: self.velocity.y = 0
         if self.position.y + self.radius > screen_rect.bottom:
-            self.position.y = screen_rect.bottom - self.radius
+            self.position.y = screen_rect.bottom - self.radius - (self.position.y + self.radius - screen_rect.bottom) * rebound
             self.velocity.y *= -self.restitution
             if abs(self.velocity.y) < 0.1: self.velocity.y = 0
 
     def render(self, surface: pygame.Surface):
-        self.shape.render_shape(surface, self.position, self.color)
\ No newline at end of file
+        self.shape.render_shape(surface, self.position, self.color)
+
+    def get_sprite(self, renderer) -> tuple[pygame.Surface, int]:
+        return self.shape.get_sprite(renderer, self.color)
\ No newline at end of file
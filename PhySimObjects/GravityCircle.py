@@ -4,17 +4,22 @@ from PhySimEngine.Entity import Entity
 from PhySimEngine.Scenario import Scenario
 from PhySimObjects.SimpleObjects.Movable import Movable
 from PhySimObjects.SimpleObjects.Collision import Collision
+from PhySimObjects.SimpleObjects.CircleCollision import CircleCollision
 from PhySimObjects.SimpleObjects.Mass import Mass
 from PhySimObjects.SimpleObjects.RecieveForce import ReceiveForce
 from PhySimObjects.CircleShape import CircleShape
 from PhySimObjects.PhysicsHandlers.LocalGravity import LocalGravity
 
 
-class GravityCircle(Entity, Movable, Collision, Mass, ReceiveForce):
+class GravityCircle(Entity, Movable, CircleCollision, Mass, ReceiveForce):
     """
     A circle entity that is movable, can collide, has mass, receives forces (like gravity),
     and is affected by a LocalGravity handler.
     """
+    __slots__ = ("velocity", "mass",
+                 "shape", "_shape", "restitution", "color", "radius", "force_accumulated", "pending_velocity_change",
+                 "pending_position_correction")
+
     def __init__(self, x: int, y: int, radius: float, color: tuple,
                  initial_velocity: pygame.Vector2, mass: float = 1.0,
                  restitution: float = 0.8):
@@ -45,76 +50,67 @@ class GravityCircle(Entity, Movable, Collision, Mass, ReceiveForce):
     def get_collision_shape(self) -> CircleShape:
         return self._shape
 
-    def resolve_collision(self, other: 'Collision'):
-        if isinstance(other, GravityCircle):
-            other_circle = other
-            distance = self.position.distance_to(other_circle.position)
-            combined_radii = self.radius + other_circle.radius
-
-            if distance < combined_radii and distance != 0:
-                overlap = combined_radii - distance
-                direction = (self.position - other_circle.position).normalize()
-
-                self.pending_position_correction += direction * (overlap / 2)
-                other_circle.pending_position_correction -= direction * (overlap / 2)
+    def collides_with(self, other: 'Collision') -> bool:
+        return isinstance(other, GravityCircle)
 
-                relative_velocity = self.velocity - other_circle.velocity
-                velocity_along_normal = relative_velocity.dot(direction)
-
-                if velocity_along_normal < 0:
-                    e = min(self.restitution, other_circle.restitution)
-                    j = -(1 + e) * velocity_along_normal
-                    j /= (1 / self.mass) + (1 / other_circle.mass)
-
-                    impulse = j * direction
-                    self.pending_velocity_change += impulse / self.mass
-                    other_circle.pending_velocity_change -= impulse / other_circle.mass
+    def get_border_radius(self) -> float:
+        return self.radius
 
     def get_mass(self) -> float:
         return self.mass
 
     def calculate_physics(self, delta_time: float, scenario: Scenario):
         if hasattr(scenario, 'local_gravity_handler') and isinstance(scenario.local_gravity_handler, LocalGravity):
-            gravity_force = self.get_mass() * scenario.local_gravity_handler.gravity_vector
-            self.apply_force(gravity_force, delta_time)
+            gravity_vector = scenario.local_gravity_handler.gravity_vector
+            self.force_accumulated.x += self.mass * gravity_vector.x
+            self.force_accumulated.y += self.mass * gravity_vector.y
 
-        self.pending_velocity_change = pygame.Vector2(0, 0)
-        self.pending_position_correction = pygame.Vector2(0, 0)
-
-        for other_entity in scenario.entity_manager.get_entities():
-            if other_entity is not self and isinstance(other_entity, Collision):
-                if self.get_collision_shape().intersects(other_entity.get_collision_shape(), self.position, other_entity.position):
-                    self.resolve_collision(other_entity)
+        self.pending_velocity_change.update(0, 0)
+        self.pending_position_correction.update(0, 0)
 
     def update(self, delta_time: float, scenario: Scenario):
-        if self.mass > 0:
-            acceleration = self.force_accumulated / self.mass
-            self.velocity += acceleration * delta_time
-        self.force_accumulated = pygame.Vector2(0, 0)
+        if scenario.integrator is not None:
+            scenario.integrator.integrate(self, delta_time)
+            self.force_accumulated.update(0, 0)
+        else:
+            if self.mass > 0:
+                self.velocity.x += self.force_accumulated.x / self.mass * delta_time
+                self.velocity.y += self.force_accumulated.y / self.mass * delta_time
+            self.force_accumulated.update(0, 0)
 
-        self.velocity += self.pending_velocity_change
-        self.position += self.pending_position_correction
+            self.velocity += self.pending_velocity_change
+            self.position += self.pending_position_correction
 
-        self.position += self.velocity * delta_time
+            self.position.x += self.velocity.x * delta_time
+            self.position.y += self.velocity.y * delta_time
 
-        screen_rect = scenario.display_surface.get_rect()
+        if scenario.contact_solver is not None:
+            # The solver already resolved the contacts with the world borders.
+            return
+
+        screen_rect = scenario.world_rect
+        # With continuous collisions the part of the tick after the contact is spent moving away from the wall.
+        rebound = self.restitution if scenario.continuous_collisions else 0.0
 
         if self.position.x - self.radius < screen_rect.left:
-            self.position.x = screen_rect.left + self.radius
+            self.position.x = screen_rect.left + self.radius + (screen_rect.left + self.radius - self.position.x) * rebound
             self.velocity.x *= -self.restitution
             if abs(self.velocity.x) < 0.1: self.velocity.x = 0
         if self.position.x + self.radius > screen_rect.right:
-            self.position.x = screen_rect.right - self.radius
+            self.position.x = screen_rect.right - self.radius - (self.position.x + self.radius - screen_rect.right) * rebound
             self.velocity.x *= -self.restitution
             if abs(self.velocity.x) < 0.1: self.velocity.x = 0
         if self.position.y - self.radius < screen_rect.top:
-            self.position.y = screen_rect.top + self.radius
+            self.position.y = screen_rect.top + self.radius + (screen_rect.top + self.radius - self.position.y) * rebound
             self.velocity.y *= -self.restitution
             if abs(self.velocity.y) < 0.1: self.velocity.y = 0
         if self.position.y + self.radius > screen_rect.bottom:
-            self.position.y = screen_rect.bottom - self.radius
+            self.position.y = screen_rect.bottom - self.radius - (self.position.y + self.radius - screen_rect.bottom) * rebound
             self.velocity.y *= -self.restitution
             if abs(self.velocity.y) < 0.1: self.velocity.y = 0
 
     def render(self, surface: pygame.Surface):
-        self._shape.render_shape(surface, self.position, self.color)
\ No newline at end of file
+        self._shape.render_shape(surface, self.position, self.color)
+
+    def get_sprite(self, renderer) -> tuple[pygame.Surface, int]:
+        return self._shape.get_sprite(renderer, self.color)
\ No newline at end of file
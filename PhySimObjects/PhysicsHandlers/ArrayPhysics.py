@@ -0,0 +1,250 @@
+# PhySimObjects/PhysicsHandlers/ArrayPhysics.py
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.EulerIntegrator import EulerIntegrator
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.LocalGravity import LocalGravity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+
+class ArrayPhysics:
+    """
+    Vectorized physics backend for GravityCircle, CircleOrbital and ForceFieldCircle entities.
+    Their state lives in the ArrayStore of the EntityManager and a whole tick is computed with NumPy
+    kernels that mirror the per-entity `calculate_physics`/`update` code.
+    Enable it by returning `"physics_backend": ArrayPhysics()` from `Scenario.configure()`.
+    Other entities still run their own methods, but do not collide with the array-backed ones. Before they run,
+    the array-backed entities are synced, so reading their positions and velocities sees the current tick;
+    changes made to them from outside the kernels are overwritten by the arrays.
+    The kernels integrate with semi-implicit Euler, resolve collisions pairwise and sum the gravity exactly,
+    so scenarios that configure another integrator, a contact solver, continuous collisions, sleeping,
+    parallel forces, a force field grid or Barnes-Hut gravity are rejected when the backend is attached.
+    """
+    GRAVITY_CIRCLE = 0
+    CIRCLE_ORBITAL = 1
+    FORCE_FIELD_CIRCLE = 2
+    KINDS = {GravityCircle: GRAVITY_CIRCLE, CircleOrbital: CIRCLE_ORBITAL, ForceFieldCircle: FORCE_FIELD_CIRCLE}
+    BORDER_KINDS = (GRAVITY_CIRCLE, FORCE_FIELD_CIRCLE)
+
+    # Neighbour cells visited by the collision grid, each unordered pair is produced once.
+    CELL_OFFSETS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, gravity_chunk_size: int = 2_000_000):
+        """
+        Initializes the backend.
+        :param gravity_chunk_size: Maximum number of body pairs evaluated at once by the gravity kernel.
+                                   Bounds the memory of the temporary arrays.
+        """
+        if np is None:
+            raise ImportError("ArrayPhysics requires NumPy. Install it with `pip install numpy`.")
+        self.gravity_chunk_size = gravity_chunk_size
+
+    def attach(self, scenario):
+        """
+        Enables the array store on the entity manager of the scenario.
+        :param scenario: The scenario using this backend.
+        """
+        unsupported = self.get_unsupported_options(scenario)
+        if unsupported:
+            raise ValueError(f"ArrayPhysics does not support {', '.join(unsupported)}")
+        scenario.entity_manager.enable_array_store(self.KINDS)
+
+    @staticmethod
+    def get_unsupported_options(scenario) -> list[str]:
+        """
+        Returns the configured options of the scenario that the kernels would silently ignore.
+        :param scenario: The scenario using this backend.
+        """
+        unsupported = []
+        if scenario.integrator is not None and type(scenario.integrator) is not EulerIntegrator:
+            unsupported.append(f"the {type(scenario.integrator).__name__}")
+        for option in ("contact_solver", "continuous_collisions", "sleep_manager", "parallel_forces",
+                       "force_field_grid"):
+            if getattr(scenario, option):
+                unsupported.append(f'"{option}"')
+        gravity_handler = getattr(scenario, 'global_gravity_handler', None)
+        if isinstance(gravity_handler, GlobalGravity) and gravity_handler.uses_tree():
+            unsupported.append("Barnes-Hut gravity")
+        return unsupported
+
+    def step(self, scenario, delta_time: float):
+        """
+        Advances all entities of the scenario by one tick.
+        :param scenario: The scenario using this backend.
+        :param delta_time: Time in seconds since the last tick.
+        """
+        store = scenario.entity_manager.array_store
+        entities = scenario.entity_manager.get_entities()
+        others = [e for e in entities if not store.contains(e)]
+
+        # Force fields are read by the kernels and don't look at other entities, anything else may.
+        if any(not isinstance(entity, ForceField) for entity in others):
+            scenario.entity_manager.sync_entities()
+        for entity in others:
+            entity.calculate_physics(delta_time, scenario)
+
+        store.force[:] = 0
+        self.apply_local_gravity(store, scenario)
+        self.apply_global_gravity(store, scenario)
+        self.apply_force_fields(store, scenario.entity_manager.entities_of(ForceField))
+        velocity_change, position_correction = self.resolve_collisions(store)
+
+        for entity in others:
+            entity.update(delta_time, scenario)
+
+        self.integrate(store, delta_time, velocity_change, position_correction)
+        self.bounce_off_borders(store, scenario.world_rect)
+        store.entities_stale = True
+
+    def apply_local_gravity(self, store, scenario):
+        if not (hasattr(scenario, 'local_gravity_handler') and isinstance(scenario.local_gravity_handler, LocalGravity)):
+            return
+        rows = store.kind == self.GRAVITY_CIRCLE
+        gravity = scenario.local_gravity_handler.gravity_vector
+        store.force[rows] += store.mass[rows, None] * np.array((gravity.x, gravity.y))
+
+    def apply_global_gravity(self, store, scenario):
+        """Exact pairwise gravity between all CircleOrbitals, evaluated in chunks of target rows."""
+        if not (hasattr(scenario, 'global_gravity_handler') and isinstance(scenario.global_gravity_handler, GlobalGravity)):
+            return
+        rows = np.flatnonzero(store.kind == self.CIRCLE_ORBITAL)
+        if len(rows) < 2:
+            return
+
+        G = scenario.global_gravity_handler.G
+        position = store.position[rows]
+        mass = store.mass[rows]
+        force = np.zeros((len(rows), 2))
+        chunk = max(1, self.gravity_chunk_size // len(rows))
+        for start in range(0, len(rows), chunk):
+            stop = min(start + chunk, len(rows))
+            dx = position[None, :, 0] - position[start:stop, None, 0]
+            dy = position[None, :, 1] - position[start:stop, None, 1]
+            distance_squared = dx * dx + dy * dy
+            distance = np.sqrt(distance_squared)
+            magnitude = G * mass[start:stop, None] * mass[None, :] / np.maximum(distance_squared, 100)
+            scale = np.divide(magnitude, distance, out=np.zeros_like(magnitude), where=distance != 0)
+            force[start:stop, 0] = (dx * scale).sum(axis=1)
+            force[start:stop, 1] = (dy * scale).sum(axis=1)
+        store.force[rows] += force
+
+    def apply_force_fields(self, store, force_fields: tuple[ForceField, ...]):
+        if not force_fields:
+            return
+        rows = np.flatnonzero(store.kind == self.FORCE_FIELD_CIRCLE)
+        position = store.position[rows]
+        for field in force_fields:
+            offset = position - np.array((field.position.x, field.position.y))
+            inside = (offset * offset).sum(axis=1) <= field.radius * field.radius
+            if field.uniform:
+                store.force[rows[inside]] += np.array((field.direction.x, field.direction.y)) * field.strength
+            else:
+                # Fields whose force changes within their radius are evaluated per body.
+                for row, (offset_x, offset_y) in zip(rows[inside], offset[inside]):
+                    store.force[row] += field.get_force(offset_x, offset_y)
+
+    def find_candidate_pairs(self, store) -> tuple:
+        """
+        Uniform grid broad phase over all rows.
+        :return: Two index arrays (i, j) holding every unordered candidate pair once.
+        """
+        count = len(store.position)
+        if count < 2:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        cell_size = max(2 * store.radius.max(), 1.0)
+        cells = np.floor(store.position / cell_size).astype(np.int64)
+        cells -= cells.min(axis=0) - 1
+        stride = cells[:, 1].max() + 2
+        keys = cells[:, 0] * stride + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        first, second = [], []
+        for offset_x, offset_y in self.CELL_OFFSETS:
+            target = sorted_keys + offset_x * stride + offset_y
+            high = np.searchsorted(sorted_keys, target, side='right')
+            if offset_x == 0 and offset_y == 0:
+                low = np.arange(1, count + 1)
+            else:
+                low = np.searchsorted(sorted_keys, target, side='left')
+            lengths = np.maximum(high - low, 0)
+            total = lengths.sum()
+            if total == 0:
+                continue
+            owners = np.repeat(np.arange(count), lengths)
+            starts = np.repeat(low - np.cumsum(lengths) + lengths, lengths)
+            first.append(order[owners])
+            second.append(order[starts + np.arange(total)])
+
+        if not first:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(first), np.concatenate(second)
+
+    def resolve_collisions(self, store) -> tuple:
+        """
+        Vectorized version of `resolve_collision`, only entities of the same kind collide.
+        :return: The pending velocity changes and position corrections of all rows.
+        """
+        velocity_change = np.zeros_like(store.velocity)
+        position_correction = np.zeros_like(store.position)
+        i, j = self.find_candidate_pairs(store)
+        if len(i) == 0:
+            return velocity_change, position_correction
+
+        same_kind = store.kind[i] == store.kind[j]
+        i, j = i[same_kind], j[same_kind]
+        offset = store.position[i] - store.position[j]
+        distance = np.sqrt((offset * offset).sum(axis=1))
+        combined_radii = store.radius[i] + store.radius[j]
+        touching = (distance < combined_radii) & (distance != 0)
+        i, j, offset, distance = i[touching], j[touching], offset[touching], distance[touching]
+
+        direction = offset / distance[:, None]
+        correction = direction * ((combined_radii[touching] - distance) / 2)[:, None]
+        np.add.at(position_correction, i, correction)
+        np.add.at(position_correction, j, -correction)
+
+        relative_velocity = store.velocity[i] - store.velocity[j]
+        velocity_along_normal = (relative_velocity * direction).sum(axis=1)
+        approaching = velocity_along_normal < 0
+        i, j, direction = i[approaching], j[approaching], direction[approaching]
+        e = np.minimum(store.restitution[i], store.restitution[j])
+        impulse_magnitude = -(1 + e) * velocity_along_normal[approaching]
+        impulse_magnitude /= (1 / store.mass[i]) + (1 / store.mass[j])
+        impulse = direction * impulse_magnitude[:, None]
+        np.add.at(velocity_change, i, impulse / store.mass[i, None])
+        np.add.at(velocity_change, j, -impulse / store.mass[j, None])
+        return velocity_change, position_correction
+
+    def integrate(self, store, delta_time: float, velocity_change, position_correction):
+        """Semi-implicit Euler step, in the same order as the `update` methods of the entities."""
+        store.velocity += store.force / store.mass[:, None] * delta_time
+        store.velocity += velocity_change
+        store.position += position_correction
+        store.position += store.velocity * delta_time
+
+    def bounce_off_borders(self, store, world_rect):
+        rows = np.flatnonzero(np.isin(store.kind, self.BORDER_KINDS))
+        if len(rows) == 0:
+            return
+        radius = store.radius[rows]
+        restitution = store.restitution[rows]
+        for axis, low, high in ((0, world_rect.left, world_rect.right), (1, world_rect.top, world_rect.bottom)):
+            position = store.position[rows, axis]
+            velocity = store.velocity[rows, axis]
+            below = position - radius < low
+            position[below] = low + radius[below]
+            velocity[below] *= -restitution[below]
+            above = position + radius > high
+            position[above] = high - radius[above]
+            velocity[above] *= -restitution[above]
+            velocity[(below | above) & (np.abs(velocity) < 0.1)] = 0
+            store.position[rows, axis] = position
+            store.velocity[rows, axis] = velocity
@@ -0,0 +1,155 @@
+# PhySimObjects/PhysicsHandlers/BarnesHutTree.py
+import pygame
+
+
+class BarnesHutTree:
+    """
+    A quadtree storing the total mass and centre of mass of every node.
+    Distant groups of bodies are approximated by a single point mass, which turns the
+    N-body force query from O(n) per body into O(log n).
+    """
+    MAX_DEPTH = 32
+
+    def __init__(self, gravitational_constant: float, theta: float):
+        """
+        Initializes an empty tree.
+        :param gravitational_constant: The gravitational constant (G) used for force queries.
+        :param theta: The opening angle, between 0 and 1. A node is approximated if its size divided by its
+                      distance is smaller than theta and it doesn't contain the queried position. 0 gives exact
+                      results, larger values trade accuracy for speed; 0.5 keeps the mean error near one percent.
+        """
+        if not 0 <= theta <= 1:
+            raise ValueError(f"theta must be between 0 and 1, got {theta}")
+        self.G = gravitational_constant
+        self.theta = theta
+        self.bodies = []
+        self.node_mass = []
+        self.node_x = []
+        self.node_y = []
+        self.node_size = []
+        self.node_centre_x = []
+        self.node_centre_y = []
+        self.node_children = []
+        self.node_bodies = []
+
+    def build(self, bodies: list):
+        """
+        Rebuilds the tree from the given bodies.
+        :param bodies: Entities with a `position` and a `get_mass()` method.
+        """
+        self.bodies = bodies
+        self.node_mass = []
+        self.node_x = []
+        self.node_y = []
+        self.node_size = []
+        self.node_centre_x = []
+        self.node_centre_y = []
+        self.node_children = []
+        self.node_bodies = []
+        if not bodies:
+            return
+
+        xs = [body.position.x for body in bodies]
+        ys = [body.position.y for body in bodies]
+        masses = [body.get_mass() for body in bodies]
+        min_x, max_x = min(xs), max(xs)
+        min_y, max_y = min(ys), max(ys)
+        half_size = max(max_x - min_x, max_y - min_y, 1.0) / 2
+        self._build_node(list(range(len(bodies))), xs, ys, masses,
+                         (min_x + max_x) / 2, (min_y + max_y) / 2, half_size, 0)
+
+    def _build_node(self, indices: list[int], xs: list[float], ys: list[float], masses: list[float],
+                    centre_x: float, centre_y: float, half_size: float, depth: int) -> int:
+        node = len(self.node_mass)
+        total_mass = 0.0
+        weighted_x = 0.0
+        weighted_y = 0.0
+        for i in indices:
+            total_mass += masses[i]
+            weighted_x += masses[i] * xs[i]
+            weighted_y += masses[i] * ys[i]
+
+        self.node_mass.append(total_mass)
+        self.node_x.append(weighted_x / total_mass)
+        self.node_y.append(weighted_y / total_mass)
+        self.node_size.append(2 * half_size)
+        self.node_centre_x.append(centre_x)
+        self.node_centre_y.append(centre_y)
+        self.node_children.append(None)
+        self.node_bodies.append(None)
+
+        if len(indices) == 1 or depth >= self.MAX_DEPTH:
+            self.node_bodies[node] = indices
+            return node
+
+        quadrants = ([], [], [], [])
+        for i in indices:
+            quadrants[(xs[i] >= centre_x) + 2 * (ys[i] >= centre_y)].append(i)
+
+        quarter = half_size / 2
+        children = []
+        for quadrant, members in enumerate(quadrants):
+            if members:
+                child_x = centre_x + (quarter if quadrant & 1 else -quarter)
+                child_y = centre_y + (quarter if quadrant & 2 else -quarter)
+                children.append(self._build_node(members, xs, ys, masses, child_x, child_y, quarter, depth + 1))
+        self.node_children[node] = children
+        return node
+
+    def calculate_force(self, position: pygame.Vector2, mass: float, exclude=None) -> pygame.Vector2:
+        """
+        Calculates the approximated gravitational force of all bodies in the tree on a body.
+        :param position: Position of the body.
+        :param mass: Mass of the body.
+        :param exclude: A body in the tree that should not attract itself, usually the queried body.
+        :return: A pygame.Vector2 representing the force on the body.
+        """
+        if not self.node_mass or mass <= 0:
+            return pygame.Vector2(0, 0)
+
+        x = position.x
+        y = position.y
+        theta_squared = self.theta * self.theta
+        bodies = self.bodies
+        force_x = 0.0
+        force_y = 0.0
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            leaf_bodies = self.node_bodies[node]
+            if leaf_bodies is not None:
+                for i in leaf_bodies:
+                    body = bodies[i]
+                    if body is exclude:
+                        continue
+                    fx, fy = self._point_force(x, y, mass, body.position.x, body.position.y, body.get_mass())
+                    force_x += fx
+                    force_y += fy
+                continue
+
+            dx = self.node_x[node] - x
+            dy = self.node_y[node] - y
+            size = self.node_size[node]
+            # A node around the queried position may hold the excluded body itself, so it is always opened.
+            contains = (abs(x - self.node_centre_x[node]) <= size / 2
+                        and abs(y - self.node_centre_y[node]) <= size / 2)
+            if not contains and size * size < theta_squared * (dx * dx + dy * dy):
+                fx, fy = self._point_force(x, y, mass, self.node_x[node], self.node_y[node], self.node_mass[node])
+                force_x += fx
+                force_y += fy
+            else:
+                stack.extend(self.node_children[node])
+
+        return pygame.Vector2(force_x, force_y)
+
+    def _point_force(self, x: float, y: float, mass: float,
+                     other_x: float, other_y: float, other_mass: float) -> tuple[float, float]:
+        dx = other_x - x
+        dy = other_y - y
+        distance_squared = dx * dx + dy * dy
+        distance = distance_squared ** 0.5
+        if distance == 0:
+            return 0.0, 0.0
+
+        force_magnitude = (self.G * mass * other_mass) / max(distance_squared, 100)
+        return dx / distance * force_magnitude, dy / distance * force_magnitude
@@ -0,0 +1,185 @@
+# PhySimObjects/PhysicsHandlers/BlockTimestepIntegrator.py
+import math
+
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.Integrator import Integrator
+from PhySimObjects.SimpleObjects.Orbital import Orbital
+
+
+class BlockTimestepIntegrator(Integrator):
+    """
+    Hierarchical block timesteps for orbitals under global gravity.
+    At the start of every tick each `Orbital` picks its own step of tick / 2^level from its acceleration,
+    so bodies close to a heavy mass take many small kick-drift-kick (leapfrog) steps within the tick while
+    distant bodies take a single one. All bodies drift on the finest substep, which extrapolates the
+    positions of the bodies that are between two of their steps, but the gravity is only evaluated for
+    the bodies whose step ends, which makes it far cheaper than raising the tick rate of the whole scenario.
+    Like velocity Verlet, the closing half kick of the last step of a tick is applied with the acceleration
+    at the start of that step and corrected with the acceleration of the next tick before its collisions,
+    so the regular `calculate_physics` phase is the only full evaluation.
+    The level is picked from the larger of the acceleration at the start of the tick and the one extrapolated
+    to its end from the change over the previous tick. A body approaching a close pass therefore refines a tick
+    early and only coarsens once the acceleration drops again, which keeps the choice close to symmetric in time
+    like the leapfrog itself. Picking it from the start alone lets the steps grow on the way in to a pass and
+    leaves an energy error behind that fixed-step Verlet doesn't have.
+    Within a tick only the global gravity between CircleOrbitals is re-evaluated. Other integrated
+    entities fall back to a semi-implicit Euler step.
+    The last step, its acceleration and the acceleration at the start of the tick are kept in `states`,
+    bodies that were asleep or removed lose them.
+    """
+
+    def __init__(self, accuracy: float = 0.03, softening: float = 10.0, max_level: int = 6):
+        """
+        :param accuracy: Scales the step of every body, which is accuracy * sqrt(softening / |acceleration|).
+                         The default suits the GravityDemo at 120 tps: bodies within about 280 pixels of its sun
+                         subdivide, down to 8 steps per tick at its surface. On eccentric orbits around it this
+                         keeps the energy error about ten times below velocity Verlet for under twice the steps.
+        :param softening: Length scale of the criterion. GlobalGravity stops growing below a distance of 10.
+        :param max_level: Finest level, a body takes at most 2^max_level steps per tick.
+        """
+        super().__init__()
+        self.accuracy = accuracy
+        self.softening = softening
+        self.max_level = max_level
+        self.body_steps = 0
+        self.levels: dict[int, int] = {}
+
+    def get_level(self, acceleration: pygame.Vector2, delta_time: float) -> int:
+        """
+        Returns the level whose step tick / 2^level is the largest one not exceeding the step the
+        acceleration of a body asks for.
+        :param acceleration: The acceleration of the body at the start of its step.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        magnitude = acceleration.length()
+        if magnitude == 0:
+            return 0
+        step = self.accuracy * (self.softening / magnitude) ** 0.5
+        if step >= delta_time:
+            return 0
+        return min(self.max_level, math.ceil(math.log2(delta_time / step)))
+
+    def evaluate_stages(self, scenario, delta_time: float):
+        sleep_manager = scenario.sleep_manager
+        bodies = [body for body in scenario.entity_manager.entities_of(Orbital)
+                  if self.is_integrated(body) and body.mass > 0
+                  and (sleep_manager is None or not sleep_manager.is_sleeping(body))]
+        previous_states = self.states
+        self.states = {}
+        if not bodies:
+            return
+        gravity_handler = getattr(scenario, 'global_gravity_handler', None)
+        sources = scenario.entity_manager.entities_of(CircleOrbital)
+
+        accelerations = [body.force_accumulated / body.mass for body in bodies]
+        for body, acceleration in zip(bodies, accelerations):
+            state = previous_states.get(body.entity_id)
+            if state is not None:
+                # Corrects the closing half kick of the previous tick with the acceleration of this one.
+                body.velocity += (acceleration - state[2]) * (0.5 * state[0])
+
+        start_positions = [pygame.Vector2(body.position) for body in bodies]
+        start_velocities = [pygame.Vector2(body.velocity) for body in bodies]
+        steps = []
+        levels = []
+        for body, acceleration in zip(bodies, accelerations):
+            state = previous_states.get(body.entity_id)
+            level = self.get_level(acceleration, delta_time)
+            if state is not None:
+                # The acceleration at the end of the tick, extrapolated from its change over the previous one.
+                extrapolated = acceleration + (acceleration - state[3]) * (delta_time / state[4])
+                level = max(level, self.get_level(extrapolated, delta_time))
+            step = delta_time / (1 << level)
+            levels.append(level)
+            steps.append(step)
+            body.velocity += acceleration * (0.5 * step)
+            self.states[body.entity_id] = [step, None, acceleration, acceleration, delta_time]
+
+        finest_level = max(levels)
+        substeps = 1 << finest_level
+        substep = delta_time / substeps
+        self.levels = {}
+        for level in levels:
+            self.levels[level] = self.levels.get(level, 0) + 1
+        self.body_steps += sum(1 << level for level in levels)
+
+        for substep_index in range(1, substeps + 1):
+            for body in bodies:
+                body.position.x += body.velocity.x * substep
+                body.position.y += body.velocity.y * substep
+            if substep_index == substeps:
+                break
+
+            active = [i for i, level in enumerate(levels) if substep_index % (1 << (finest_level - level)) == 0]
+            if not active:
+                continue
+            active_accelerations = self.calculate_accelerations([bodies[i] for i in active], bodies, sources,
+                                                                gravity_handler,
+                                                                (scenario.force_evaluations, substep_index))
+            for i, acceleration in zip(active, active_accelerations):
+                # Closing half kick of the finished step and opening half kick of the next one.
+                bodies[i].velocity += acceleration * steps[i]
+                accelerations[i] = acceleration
+
+        for i, body in enumerate(bodies):
+            # Closing half kick of the last step, with the acceleration at its start until the next tick corrects it.
+            state = self.states[body.entity_id]
+            state[1] = (body.position, body.velocity + accelerations[i] * (0.5 * steps[i]))
+            state[2] = accelerations[i]
+            body.position = start_positions[i]
+            body.velocity = start_velocities[i]
+            body.force_accumulated = pygame.Vector2(0, 0)
+
+    def calculate_accelerations(self, active: list[Entity], bodies: list[Entity], sources: tuple,
+                                gravity_handler, evaluation) -> list[pygame.Vector2]:
+        """
+        Evaluates the global gravity on the bodies whose step ends, at the drifted positions of all bodies.
+        :param active: The bodies to evaluate.
+        :param bodies: All integrated bodies.
+        :param sources: All bodies that attract others.
+        :param gravity_handler: The GlobalGravity of the scenario, if any.
+        :param evaluation: Key of the substep, so cached trees and pair forces of other substeps aren't reused.
+        :return: The acceleration of every active body.
+        """
+        if not isinstance(gravity_handler, GlobalGravity):
+            return [pygame.Vector2(0, 0) for body in active]
+
+        accelerations = []
+        if gravity_handler.uses_tree():
+            gravity_handler.build_tree(sources, evaluation)
+            for body in active:
+                accelerations.append(gravity_handler.calculate_tree_force(body.position, body.mass, body) / body.mass)
+        elif gravity_handler.uses_pair_forces() and len(active) == len(bodies):
+            gravity_handler.compute_pair_forces(sources, evaluation)
+            for body in active:
+                force = pygame.Vector2(0, 0)
+                gravity_handler.add_pair_force(body, force)
+                accelerations.append(force / body.mass)
+        else:
+            for body in active:
+                force = pygame.Vector2(0, 0)
+                for source in sources:
+                    if source is not body:
+                        gravity_handler.add_gravitational_force(force, body.position, body.mass,
+                                                                source.position, source.get_mass())
+                accelerations.append(force / body.mass)
+        return accelerations
+
+    def integrate(self, entity: Entity, delta_time: float):
+        state = self.states.get(entity.entity_id)
+        if state is None or state[1] is None:
+            # Not an orbital, or added after the stages were evaluated, fall back to a semi-implicit Euler step.
+            entity.velocity.x += entity.force_accumulated.x / entity.mass * delta_time
+            entity.velocity.y += entity.force_accumulated.y / entity.mass * delta_time
+            entity.velocity += entity.pending_velocity_change
+            entity.position += entity.pending_position_correction + entity.velocity * delta_time
+            return
+
+        position, velocity = state[1]
+        state[1] = None
+        entity.position = position + entity.pending_position_correction + entity.pending_velocity_change * delta_time
+        entity.velocity = velocity + entity.pending_velocity_change
@@ -0,0 +1,20 @@
+# PhySimObjects/PhysicsHandlers/EulerIntegrator.py
+from PhySimEngine.Entity import Entity
+from PhySimObjects.PhysicsHandlers.Integrator import Integrator
+
+
+class EulerIntegrator(Integrator):
+    """
+    Semi-implicit Euler integration, the same scheme the entities use without an integrator.
+    First order accurate, so orbits slowly drift in energy unless the tick rate is high.
+    """
+
+    def integrate(self, entity: Entity, delta_time: float):
+        entity.velocity.x += entity.force_accumulated.x / entity.mass * delta_time
+        entity.velocity.y += entity.force_accumulated.y / entity.mass * delta_time
+
+        entity.velocity += entity.pending_velocity_change
+        entity.position += entity.pending_position_correction
+
+        entity.position.x += entity.velocity.x * delta_time
+        entity.position.y += entity.velocity.y * delta_time
@@ -0,0 +1,143 @@
+# PhySimObjects/PhysicsHandlers/ForceFieldGrid.py
+import math
+
+import pygame
+
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+
+class ForceFieldGrid:
+    """
+    Precomputed lookup grid for the forces of all ForceField entities, so a ForceFieldCircle finds the
+    combined force at its position with a single cell lookup instead of a distance test per field.
+    Every cell of the world stores the sum of the fields that cover it completely. Uniform fields add
+    their exact constant force; fields whose force changes within the radius (e.g. RadialForceField)
+    are sampled at the cell centre wherever the force varies by less than `tolerance` across the cell.
+    Fields that only cover part of a cell, and non-uniform fields that vary too much within it
+    (e.g. close to the centre of a radial field), are listed with the cell and evaluated exactly.
+    The grid is rebuilt only when a field is added, removed, moved or changed.
+    Select it by returning `"force_field_grid": ForceFieldGrid()` from `Scenario.configure()`.
+    """
+
+    def __init__(self, cell_size: float = 8.0, tolerance: float = 0.05):
+        """
+        :param cell_size: Edge length of a cell. Smaller cells sample non-uniform fields more finely and
+                          leave fewer cells on field borders, at the cost of memory and build time.
+        :param tolerance: Largest error of a sampled force relative to the strength of its field.
+        """
+        self.cell_size = cell_size
+        self.tolerance = tolerance
+        self.fields: tuple[ForceField, ...] = ()
+        self.states: list[tuple] | None = None
+        self.left = 0.0
+        self.top = 0.0
+        self.columns = 0
+        self.rows = 0
+        self.forces_x: list[float] = []
+        self.forces_y: list[float] = []
+        self.edge_fields: dict[int, list[ForceField]] = {}
+
+    def refresh(self, scenario):
+        """
+        Rebuilds the grid if the fields or the world borders changed since the last tick.
+        Called by the scenario before the forces of a tick are evaluated.
+        :param scenario: The scenario whose fields are sampled.
+        """
+        fields = scenario.entity_manager.entities_of(ForceField)
+        world_rect = scenario.world_rect
+        states = [field.get_state() for field in fields]
+        states.append((world_rect.left, world_rect.top, world_rect.width, world_rect.height))
+        if fields is not self.fields or states != self.states:
+            self.build(fields, world_rect)
+            self.states = states
+
+    def build(self, fields: tuple[ForceField, ...], world_rect: pygame.Rect):
+        """
+        Samples the fields into the cells covering the world.
+        :param fields: All force fields of the scenario.
+        :param world_rect: The area covered by the grid. Positions outside of it are evaluated exactly.
+        """
+        cell_size = self.cell_size
+        self.fields = fields
+        self.left = world_rect.left
+        self.top = world_rect.top
+        self.columns = columns = max(1, math.ceil(world_rect.width / cell_size))
+        self.rows = rows = max(1, math.ceil(world_rect.height / cell_size))
+        self.forces_x = forces_x = [0.0] * (columns * rows)
+        self.forces_y = forces_y = [0.0] * (columns * rows)
+        self.edge_fields = edge_fields = {}
+
+        for field in fields:
+            center_x = field.position.x - self.left
+            center_y = field.position.y - self.top
+            radius = field.radius
+            radius_squared = radius * radius
+            first_column = max(0, int((center_x - radius) // cell_size))
+            last_column = min(columns - 1, int((center_x + radius) // cell_size))
+            first_row = max(0, int((center_y - radius) // cell_size))
+            last_row = min(rows - 1, int((center_y + radius) // cell_size))
+            uniform_x, uniform_y = field.get_force(0.0, 0.0) if field.uniform else (0.0, 0.0)
+
+            for row in range(first_row, last_row + 1):
+                cell_top = row * cell_size
+                cell_bottom = cell_top + cell_size
+                # Distance from the centre to the nearest and to the farthest point of the cell along y.
+                near_y = max(cell_top - center_y, 0.0, center_y - cell_bottom)
+                far_y = max(abs(cell_top - center_y), abs(cell_bottom - center_y))
+                for column in range(first_column, last_column + 1):
+                    cell_left = column * cell_size
+                    cell_right = cell_left + cell_size
+                    near_x = max(cell_left - center_x, 0.0, center_x - cell_right)
+                    if near_x * near_x + near_y * near_y > radius_squared:
+                        continue
+                    far_x = max(abs(cell_left - center_x), abs(cell_right - center_x))
+                    cell = row * columns + column
+                    covered = far_x * far_x + far_y * far_y <= radius_squared
+                    if covered and field.uniform:
+                        forces_x[cell] += uniform_x
+                        forces_y[cell] += uniform_y
+                    elif covered and (near_x > 0 or near_y > 0) and self.is_smooth(field, cell_left - center_x,
+                                                                                   cell_top - center_y):
+                        force_x, force_y = field.get_force(cell_left + cell_size / 2 - center_x,
+                                                           cell_top + cell_size / 2 - center_y)
+                        forces_x[cell] += force_x
+                        forces_y[cell] += force_y
+                    else:
+                        edge_fields.setdefault(cell, []).append(field)
+
+    def is_smooth(self, field: ForceField, offset_x: float, offset_y: float) -> bool:
+        """
+        Checks if the force at the centre of a cell stands in for the whole cell, by comparing it with
+        the forces at the corners.
+        :param field: A non-uniform field that covers the cell.
+        :param offset_x: Offset of the left edge of the cell from the centre of the field.
+        :param offset_y: Offset of the top edge of the cell from the centre of the field.
+        """
+        cell_size = self.cell_size
+        center_x, center_y = field.get_force(offset_x + cell_size / 2, offset_y + cell_size / 2)
+        limit = (self.tolerance * field.strength) ** 2
+        for corner_x, corner_y in ((0, 0), (cell_size, 0), (0, cell_size), (cell_size, cell_size)):
+            force_x, force_y = field.get_force(offset_x + corner_x, offset_y + corner_y)
+            if (force_x - center_x) ** 2 + (force_y - center_y) ** 2 > limit:
+                return False
+        return True
+
+    def add_force(self, position: pygame.Vector2, force: pygame.Vector2):
+        """
+        Adds the combined force of all fields at a position to a force vector.
+        :param position: The position in world coordinates.
+        :param force: The vector the force is added to.
+        """
+        column = int((position.x - self.left) // self.cell_size)
+        row = int((position.y - self.top) // self.cell_size)
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            cell = row * self.columns + column
+            force.x += self.forces_x[cell]
+            force.y += self.forces_y[cell]
+            edge_fields = self.edge_fields.get(cell)
+            if edge_fields is not None:
+                for field in edge_fields:
+                    field.add_force_at(position, force)
+        else:
+            for field in self.fields:
+                field.add_force_at(position, force)
@@ -1,19 +1,171 @@
 # PhySimObjects/PhysicsHandlers/GlobalGravity.py
 import pygame
 from PhySimObjects.SimpleObjects.Mass import Mass
+from PhySimObjects.PhysicsHandlers.BarnesHutTree import BarnesHutTree
 
 class GlobalGravity:
     """
     Handles gravitational forces between objects based on their mass and distance.
     Uses Newton's Law of Universal Gravitation: F = G * (m1 * m2) / r^2
     """
-    def __init__(self, gravitational_constant: float):
+    def __init__(self, gravitational_constant: float, theta: float | None = None, symmetric: bool = True):
         """
         Initializes the global gravity handler.
         :param gravitational_constant: The gravitational constant (G) for the simulation.
                                        Adjust this value to control the strength of gravity in your scenario.
+        :param theta: Opening angle for the Barnes-Hut approximation, between 0 and 1. If None (default),
+                      forces are summed exactly over every pair of bodies.
+        :param symmetric: Evaluates every unordered pair of the exact sum once and applies the force to both
+                          bodies with opposite signs, instead of every body summing the pull of all others.
         """
         self.G = gravitational_constant
+        self.theta = theta
+        self.symmetric = symmetric
+        self.tree = BarnesHutTree(gravitational_constant, theta) if theta is not None else None
+        self.tree_evaluation = None
+        self.pair_evaluation = None
+        self.pair_rows: dict[int, int] = {}
+        self.pair_forces_x: list[float] = []
+        self.pair_forces_y: list[float] = []
+
+    def add_gravitational_force(self, force: pygame.Vector2, body1_pos: pygame.Vector2, body1_mass: float,
+                                body2_pos: pygame.Vector2, body2_mass: float):
+        """
+        Adds the gravitational force exerted by body2 on body1 to an accumulator in place.
+        Gives the same result as adding `calculate_gravitational_force` without its temporary vectors.
+        :param force: The accumulator of body1 the force is added to.
+        :param body1_pos: Position of the first body.
+        :param body1_mass: Mass of the first body.
+        :param body2_pos: Position of the second body.
+        :param body2_mass: Mass of the second body.
+        """
+        if body1_mass <= 0 or body2_mass <= 0:
+            return
+
+        direction_x = body2_pos.x - body1_pos.x
+        direction_y = body2_pos.y - body1_pos.y
+        distance_squared = direction_x * direction_x + direction_y * direction_y
+        distance = distance_squared ** 0.5
+        if distance == 0:
+            return
+        if distance_squared < 100:
+            distance_squared = 100
+
+        force_magnitude = (self.G * body1_mass * body2_mass) / distance_squared
+        force.x += direction_x / distance * force_magnitude
+        force.y += direction_y / distance * force_magnitude
+
+    def uses_tree(self) -> bool:
+        """
+        Checks if the Barnes-Hut approximation is enabled.
+        :return: True if forces are answered by the quadtree, False for the exact pairwise path.
+        """
+        return self.tree is not None
+
+    def is_tree_current(self, evaluation: int) -> bool:
+        """
+        Checks if the quadtree was already built for the given force evaluation.
+        :param evaluation: The current force evaluation count of the scenario.
+        :return: True if the tree is up to date, False otherwise.
+        """
+        return self.tree_evaluation == evaluation
+
+    def build_tree(self, bodies: list, evaluation: int):
+        """
+        Builds the Barnes-Hut quadtree of masses and centres of mass. Should be called once per force evaluation.
+        :param bodies: All bodies that attract each other.
+        :param evaluation: The current force evaluation count of the scenario.
+        """
+        self.tree.G = self.G
+        self.tree.build(bodies)
+        self.tree_evaluation = evaluation
+
+    def uses_pair_forces(self) -> bool:
+        """
+        Checks if the exact sum is evaluated once per pair of bodies.
+        :return: True if forces are answered by `add_pair_force`, False if every body sums its own pull.
+        """
+        return self.symmetric and self.tree is None
+
+    def is_pair_forces_current(self, evaluation: int) -> bool:
+        """
+        Checks if the pair forces were already computed for the given force evaluation.
+        :param evaluation: The current force evaluation count of the scenario.
+        :return: True if the pair forces are up to date, False otherwise.
+        """
+        return self.pair_evaluation == evaluation
+
+    def compute_pair_forces(self, bodies: tuple, evaluation: int):
+        """
+        Computes the gravitational force on all bodies, visiting every unordered pair once (Newton's third law).
+        Every body receives the contributions of the other bodies in their order, like the per-body sum.
+        Should be called once per force evaluation.
+        :param bodies: All bodies that attract each other.
+        :param evaluation: The current force evaluation count of the scenario.
+        """
+        count = len(bodies)
+        positions_x = [body.position.x for body in bodies]
+        positions_y = [body.position.y for body in bodies]
+        masses = [body.get_mass() for body in bodies]
+        forces_x = [0.0] * count
+        forces_y = [0.0] * count
+        G = self.G
+
+        for i in range(count):
+            mass = masses[i]
+            if mass <= 0:
+                continue
+            x = positions_x[i]
+            y = positions_y[i]
+            force_x = forces_x[i]
+            force_y = forces_y[i]
+            for j in range(i + 1, count):
+                other_mass = masses[j]
+                if other_mass <= 0:
+                    continue
+                direction_x = positions_x[j] - x
+                direction_y = positions_y[j] - y
+                distance_squared = direction_x * direction_x + direction_y * direction_y
+                distance = distance_squared ** 0.5
+                if distance == 0:
+                    continue
+                if distance_squared < 100:
+                    distance_squared = 100
+
+                force_magnitude = (G * mass * other_mass) / distance_squared
+                pair_force_x = direction_x / distance * force_magnitude
+                pair_force_y = direction_y / distance * force_magnitude
+                force_x += pair_force_x
+                force_y += pair_force_y
+                forces_x[j] -= pair_force_x
+                forces_y[j] -= pair_force_y
+            forces_x[i] = force_x
+            forces_y[i] = force_y
+
+        self.pair_rows = {id(body): row for row, body in enumerate(bodies)}
+        self.pair_forces_x = forces_x
+        self.pair_forces_y = forces_y
+        self.pair_evaluation = evaluation
+
+    def add_pair_force(self, body, force: pygame.Vector2):
+        """
+        Adds the force computed by `compute_pair_forces` for a body to an accumulator in place.
+        :param body: One of the bodies passed to `compute_pair_forces`.
+        :param force: The accumulator the force is added to.
+        """
+        row = self.pair_rows[id(body)]
+        force.x += self.pair_forces_x[row]
+        force.y += self.pair_forces_y[row]
+
+    def calculate_tree_force(self, body_pos: pygame.Vector2, body_mass: float, body=None) -> pygame.Vector2:
+        """
+        Calculates the approximated gravitational force of all bodies in the quadtree on a body.
+        :param body_pos: Position of the body.
+        :param body_mass: Mass of the body.
+        :param body: The body itself, so it is not attracted by its own mass.
+        :return: A pygame.Vector2 representing the force on the body.
+        """
+        return self.tree.calculate_force(body_pos, body_mass, exclude=body)
 
     def calculate_gravitational_force(self, body1_pos: pygame.Vector2, body1_mass: float,
                                       body2_pos: pygame.Vector2, body2_mass: float) -> pygame.Vector2:
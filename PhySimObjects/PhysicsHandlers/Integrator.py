@@ -0,0 +1,49 @@
+# PhySimObjects/PhysicsHandlers/Integrator.py
+from abc import ABC, abstractmethod
+
+from PhySimEngine.Entity import Entity
+from PhySimObjects.SimpleObjects.Mass import Mass
+from PhySimObjects.SimpleObjects.Movable import Movable
+from PhySimObjects.SimpleObjects.RecieveForce import ReceiveForce
+
+
+class Integrator(ABC):
+    """
+    Abstract base class for the numerical integration of movable entities.
+    Entities call `integrate` in their `update` phase, before clearing their accumulated force. Integrators that need
+    the forces at intermediate states evaluate them in `evaluate_stages`, which the scenario calls after the
+    regular `calculate_physics` phase.
+    Per-body state that an integrator carries between its calls is kept in `states`, keyed by entity id, and
+    saved with snapshots.
+    Select one by returning `"integrator": VelocityVerletIntegrator()` from `Scenario.configure()`.
+    """
+
+    def __init__(self):
+        self.states: dict[int, object] = {}
+
+    @staticmethod
+    def is_integrated(entity: Entity) -> bool:
+        """
+        Checks if an entity is moved by the integrator.
+        :param entity: The entity to check.
+        :return: True if the entity has a velocity, a mass and accumulates forces, False otherwise.
+        """
+        return isinstance(entity, Movable) and isinstance(entity, Mass) and isinstance(entity, ReceiveForce)
+
+    def evaluate_stages(self, scenario, delta_time: float):
+        """
+        Evaluates the forces at the intermediate states of a tick. Single stage integrators do nothing.
+        :param scenario: The scenario whose entities are integrated.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        pass
+
+    @abstractmethod
+    def integrate(self, entity: Entity, delta_time: float):
+        """
+        Advances the velocity and position of an entity by one tick, including the pending collision response.
+        The acceleration is `entity.force_accumulated / entity.mass`, divided per component so no vector is allocated.
+        :param entity: The entity to integrate, holding the forces accumulated in this tick.
+        :param delta_time: Time in seconds that the tick covers.
+        """
+        pass
@@ -0,0 +1,212 @@
+# PhySimObjects/PhysicsHandlers/ParallelForces.py
+import os
+from array import array
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import pygame
+
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+# Layout of the shared buffer (float64): header, orbitals (x, y, mass), force fields (x, y, radius, fx, fy),
+# force field circle positions (x, y), gravity results (fx, fy) and force field results (fx, fy).
+HEADER_SIZE = 4
+
+_worker_memory = None
+
+
+def _attach(name: str):
+    global _worker_memory
+    if _worker_memory is None or _worker_memory.name != name:
+        if _worker_memory is not None:
+            _worker_memory.close()
+        _worker_memory = SharedMemory(name=name)
+    return _worker_memory.buf.cast('d')
+
+
+def _compute_gravity(name: str, start: int, stop: int):
+    """Sums the gravitational forces on the orbitals [start, stop) in the same order as CircleOrbital."""
+    data = _attach(name)
+    G = data[0]
+    orbital_count = int(data[1])
+    field_count = int(data[2])
+    circle_count = int(data[3])
+    out = HEADER_SIZE + 3 * orbital_count + 5 * field_count + 2 * circle_count
+    for target in range(start, stop):
+        base = HEADER_SIZE + 3 * target
+        x = data[base]
+        y = data[base + 1]
+        mass = data[base + 2]
+        force_x = 0.0
+        force_y = 0.0
+        for source in range(orbital_count):
+            if mass <= 0:
+                break
+            if source == target:
+                continue
+            other = HEADER_SIZE + 3 * source
+            other_mass = data[other + 2]
+            if other_mass <= 0:
+                continue
+            direction_x = data[other] - x
+            direction_y = data[other + 1] - y
+            distance_squared = direction_x * direction_x + direction_y * direction_y
+            if distance_squared < 100:
+                distance_squared = 100
+            distance = (direction_x * direction_x + direction_y * direction_y) ** 0.5
+            if distance == 0:
+                continue
+            force_magnitude = (G * mass * other_mass) / distance_squared
+            force_x += direction_x / distance * force_magnitude
+            force_y += direction_y / distance * force_magnitude
+        data[out + 2 * target] = force_x
+        data[out + 2 * target + 1] = force_y
+    data.release()
+
+
+def _compute_fields(name: str, start: int, stop: int):
+    """Sums the force field forces on the force field circles [start, stop) in the same order as ForceFieldCircle."""
+    data = _attach(name)
+    orbital_count = int(data[1])
+    field_count = int(data[2])
+    circle_count = int(data[3])
+    fields = HEADER_SIZE + 3 * orbital_count
+    circles = fields + 5 * field_count
+    out = circles + 2 * circle_count + 2 * orbital_count
+    for target in range(start, stop):
+        x = data[circles + 2 * target]
+        y = data[circles + 2 * target + 1]
+        force_x = 0.0
+        force_y = 0.0
+        for field in range(fields, circles, 5):
+            dx = x - data[field]
+            dy = y - data[field + 1]
+            if (dx * dx + dy * dy) ** 0.5 <= data[field + 2]:
+                force_x += data[field + 3]
+                force_y += data[field + 4]
+        data[out + 2 * target] = force_x
+        data[out + 2 * target + 1] = force_y
+    data.release()
+
+
+def _compute_task(task: tuple):
+    kind, name, start, stop = task
+    if kind == "gravity":
+        _compute_gravity(name, start, stop)
+    else:
+        _compute_fields(name, start, stop)
+
+
+class ParallelForces:
+    """
+    Evaluates the global gravity on CircleOrbitals and the ForceField forces on ForceFieldCircles
+    in a pool of worker processes. Positions and masses are shared through a shared memory buffer
+    instead of pickling entities, and every target sums its sources in the same order as the serial
+    path, so the results are bit-for-bit identical.
+    Enable it by returning `"parallel_forces": ParallelForces(workers)` from `Scenario.configure()`.
+    """
+
+    def __init__(self, workers: int = None, chunks_per_worker: int = 4):
+        """
+        Initializes the parallel force evaluation. Worker processes are started on first use.
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        :param chunks_per_worker: Number of target ranges handed to each worker per tick.
+        """
+        self.workers = workers or os.cpu_count()
+        self.chunks_per_worker = chunks_per_worker
+        self.pool = None
+        self.memory = None
+        self.rows = {}
+        self.results = None
+
+    def compute(self, scenario):
+        """
+        Computes the forces of the current tick for all supported entities of the scenario.
+        :param scenario: The scenario whose forces are evaluated.
+        """
+        entity_manager = scenario.entity_manager
+        gravity_handler = getattr(scenario, 'global_gravity_handler', None)
+        if isinstance(gravity_handler, GlobalGravity) and not gravity_handler.uses_tree():
+            orbitals = entity_manager.entities_of(CircleOrbital)
+            G = gravity_handler.G
+        else:
+            orbitals = ()
+            G = 0.0
+        fields = entity_manager.entities_of(ForceField)
+        if not all(field.uniform for field in fields):
+            # Fields whose force changes within their radius are left to the serial path of ForceFieldCircle.
+            fields = ()
+        circles = entity_manager.entities_of(ForceFieldCircle) if fields else ()
+
+        state = array('d', (G, len(orbitals), len(fields), len(circles)))
+        for orbital in orbitals:
+            state.extend((orbital.position.x, orbital.position.y, orbital.get_mass()))
+        for field in fields:
+            force = field.direction * field.strength
+            state.extend((field.position.x, field.position.y, field.radius, force.x, force.y))
+        for circle in circles:
+            state.extend((circle.position.x, circle.position.y))
+        size = len(state) + 2 * len(orbitals) + 2 * len(circles)
+
+        self.ensure_capacity(size * state.itemsize)
+        data = self.memory.buf.cast('d')
+        data[:len(state)] = state
+
+        tasks = self.make_tasks("gravity", len(orbitals)) + self.make_tasks("fields", len(circles))
+        if tasks:
+            self.pool.map(_compute_task, tasks)
+
+        self.results = data[len(state):size].tolist()
+        data.release()
+        self.rows = {id(e): row for row, e in enumerate(orbitals)}
+        self.rows.update({id(e): len(orbitals) + row for row, e in enumerate(circles)})
+
+    def make_tasks(self, kind: str, count: int) -> list[tuple]:
+        if count == 0:
+            return []
+        chunk_count = min(count, self.workers * self.chunks_per_worker)
+        bounds = [count * i // chunk_count for i in range(chunk_count + 1)]
+        return [(kind, self.memory.name, bounds[i], bounds[i + 1]) for i in range(chunk_count)]
+
+    def ensure_capacity(self, size: int):
+        if self.memory is None or self.memory.size < size:
+            if self.memory is not None:
+                self.memory.close()
+                self.memory.unlink()
+            self.memory = SharedMemory(create=True, size=max(size, 1024) * 2)
+        # Started after the first shared memory, so the workers inherit its resource tracker.
+        if self.pool is None:
+            self.pool = Pool(self.workers)
+
+    def has_force(self, entity) -> bool:
+        """
+        Checks if the force on an entity was computed in parallel for the current tick.
+        :param entity: The entity to check.
+        :return: True if `get_force` can be used for the entity, False otherwise.
+        """
+        return id(entity) in self.rows
+
+    def get_force(self, entity) -> pygame.Vector2:
+        """
+        Returns the net force computed for an entity in the current tick.
+        :param entity: A CircleOrbital or ForceFieldCircle.
+        :return: A pygame.Vector2 representing the force on the entity.
+        """
+        row = self.rows[id(entity)]
+        return pygame.Vector2(self.results[2 * row], self.results[2 * row + 1])
+
+    def close(self):
+        """Stops the worker processes and releases the shared memory."""
+        if self.pool is not None:
+            # Lets the workers exit on their own. Once a window was opened, SDL ignores the SIGTERM
+            # `terminate` sends to the workers it forked.
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
@@ -5,6 +5,8 @@ from PhySimEngine.Entity import Entity
 
 
 class ApplyForce(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_applied_force(self, target_entity: Entity) -> pygame.Vector2:
         """
@@ -14,6 +16,15 @@ class ApplyForce(ABC):
         """
         pass
 
+    def add_applied_force(self, target_entity: Entity, force: pygame.Vector2):
+        """
+        Adds the force exerted on a target entity to an accumulator in place.
+        Override it to avoid creating a new vector for every target.
+        :param target_entity: The entity to apply the force to.
+        :param force: The accumulator the force is added to.
+        """
+        force += self.get_applied_force(target_entity)
+
     @abstractmethod
     def get_force_origin(self) -> pygame.Vector2:
         """
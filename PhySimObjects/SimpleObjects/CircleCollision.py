@@ -0,0 +1,77 @@
+from abc import abstractmethod
+
+from PhySimObjects.SimpleObjects.Collision import Collision
+
+
+class CircleCollision(Collision):
+    """
+    Impulse based collision response between two circles.
+    Entities using it have a `position`, `velocity`, `radius`, `mass` and `restitution`, and accumulate the
+    response in `pending_velocity_change` and `pending_position_correction`, which their `update` applies.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def collides_with(self, other: 'Collision') -> bool:
+        """
+        Checks if this circle responds to collisions with another object.
+        :param other: The object this one collides with.
+        :return: True if the other object is a circle this one collides with, False otherwise.
+        """
+        pass
+
+    def resolve_collision(self, other: 'Collision') -> bool:
+        """
+        Pushes both circles apart by half of their overlap each and exchanges the impulse of the collision
+        if they are approaching each other.
+        :param other: The object this one collides with.
+        :return: True if the pair was handled, False if `collides_with` rejects the other object.
+        """
+        if not self.collides_with(other):
+            return False
+        contact = self.get_contact(other)
+        if contact is None:
+            return True
+
+        direction_x, direction_y, overlap, e = contact
+        correction = overlap / 2
+        self.pending_position_correction.x += direction_x * correction
+        self.pending_position_correction.y += direction_y * correction
+        other.pending_position_correction.x -= direction_x * correction
+        other.pending_position_correction.y -= direction_y * correction
+
+        velocity_along_normal = ((self.velocity.x - other.velocity.x) * direction_x
+                                 + (self.velocity.y - other.velocity.y) * direction_y)
+
+        if velocity_along_normal < 0:
+            j = -(1 + e) * velocity_along_normal
+            j_divisor = (1 / self.mass) + (1 / other.mass)
+            if j_divisor == 0:
+                return True
+
+            j /= j_divisor
+
+            impulse_x = direction_x * j
+            impulse_y = direction_y * j
+            self.pending_velocity_change.x += impulse_x / self.mass
+            self.pending_velocity_change.y += impulse_y / self.mass
+            other.pending_velocity_change.x -= impulse_x / other.mass
+            other.pending_velocity_change.y -= impulse_y / other.mass
+        return True
+
+    def get_contact(self, other: 'Collision') -> tuple[float, float, float, float] | None:
+        """
+        Returns the contact of two overlapping circles.
+        :param other: The object this one collides with.
+        :return: The normal pointing from the other circle to this one, the penetration depth and the restitution,
+                 or None if the circles don't touch or `collides_with` rejects the other object.
+        """
+        if not self.collides_with(other):
+            return None
+        distance = self.position.distance_to(other.position)
+        combined_radii = self.radius + other.radius
+        if distance < combined_radii and distance != 0:
+            return ((self.position.x - other.position.x) / distance,
+                    (self.position.y - other.position.y) / distance,
+                    combined_radii - distance, min(self.restitution, other.restitution))
+        return None
@@ -4,6 +4,8 @@ from PhySimObjects.SimpleObjects.Shape import Shape
 
 
 class Collision(ABC):
+    __slots__ = ()
+
     def __init__(self, shape: Shape):
         self.shape = shape
 
@@ -14,6 +16,13 @@ class Collision(ABC):
         pass
 
     @abstractmethod
-    def resolve_collision(self, other: 'Collision'):
-        """Resolves collision between this object and another object."""
+    def resolve_collision(self, other: 'Collision') -> bool:
+        """
+        Resolves collision between this object and another object.
+        The scenario visits every colliding pair once, in no particular order, and calls this method of the
+        first entity and, unless it returns True, the one of the second entity. An implementation that handles
+        the other object therefore updates both of them and returns True, and returns False for objects it
+        leaves to their own `resolve_collision`.
+        :param other: The object this one collides with.
+        :returns: True if the collision of the pair was handled."""
         pass
\ No newline at end of file
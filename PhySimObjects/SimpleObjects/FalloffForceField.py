@@ -0,0 +1,20 @@
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+
+class FalloffForceField(ForceField):
+    """
+    A force field that pushes objects in a specific direction, with a strength that decreases linearly
+    from its centre to zero at its radius.
+    """
+    __slots__ = ()
+    uniform = False
+
+    def add_applied_force(self, target_entity: 'Entity', force: pygame.Vector2):
+        self.add_force_at(target_entity.position, force)
+
+    def get_force(self, offset_x: float, offset_y: float) -> tuple[float, float]:
+        scale = self.strength * (1 - (offset_x * offset_x + offset_y * offset_y) ** 0.5 / self.radius)
+        return self.direction.x * scale, self.direction.y * scale
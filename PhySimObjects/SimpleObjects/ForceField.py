@@ -7,7 +7,11 @@ class ForceField(Entity, ApplyForce):
     """
     An entity that applies a constant force in a specific direction
     to other objects within a defined radius.
+    Subclasses with a force that changes within the radius override `get_force` and set `uniform` to False.
     """
+    __slots__ = ("radius", "strength", "direction", "color")
+    # The force is the same everywhere within the radius.
+    uniform = True
 
     def __init__(self, x: int, y: int, radius: float, strength: float,
                  direction_vector: pygame.Vector2, color: tuple = (150, 255, 150)):
@@ -25,7 +29,37 @@ class ForceField(Entity, ApplyForce):
         if distance > self.radius:
             return pygame.Vector2(0, 0)
 
-        return self.direction * self.strength
+        return pygame.Vector2(self.get_force(target_entity.position.x - self.position.x,
+                                             target_entity.position.y - self.position.y))
+
+    def add_applied_force(self, target_entity: 'Entity', force: pygame.Vector2):
+        if self.position.distance_to(target_entity.position) <= self.radius:
+            force.x += self.direction.x * self.strength
+            force.y += self.direction.y * self.strength
+
+    def add_force_at(self, position: pygame.Vector2, force: pygame.Vector2):
+        """
+        Adds the force the field applies at a position to a force vector.
+        :param position: The position in world coordinates.
+        :param force: The vector the force is added to.
+        """
+        if self.position.distance_to(position) <= self.radius:
+            force_x, force_y = self.get_force(position.x - self.position.x, position.y - self.position.y)
+            force.x += force_x
+            force.y += force_y
+
+    def get_force(self, offset_x: float, offset_y: float) -> tuple[float, float]:
+        """
+        Returns the force at an offset from the centre of the field that lies within its radius.
+        :param offset_x: Offset from the centre along x.
+        :param offset_y: Offset from the centre along y.
+        :return: The force along x and y.
+        """
+        return self.direction.x * self.strength, self.direction.y * self.strength
+
+    def get_state(self) -> tuple:
+        """Returns all values the force of the field depends on, so cached samples can tell when it changed."""
+        return (self.position.x, self.position.y, self.radius, self.strength, self.direction.x, self.direction.y)
 
     def get_force_origin(self) -> pygame.Vector2:
         return self.position
@@ -37,6 +71,10 @@ class ForceField(Entity, ApplyForce):
         pass
 
     def render(self, surface: pygame.Surface):
+        self.render_static(surface)
+
+    def render_static(self, surface: pygame.Surface):
+        """Draws the field. Force fields don't move, so the batched renderer keeps this on its static layer."""
         pygame.draw.circle(surface, (self.color[0], self.color[1], self.color[2], 50),
                            self.position, int(self.radius), 1)
 
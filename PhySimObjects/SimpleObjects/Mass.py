@@ -1,6 +1,8 @@
 from abc import abstractmethod, ABC
 
 class Mass(ABC):
+    __slots__ = ()
+
     def __init__(self, mass: float):
         if mass <= 0:
             raise ValueError("Mass must be a positive value.")
@@ -2,6 +2,8 @@ from abc import abstractmethod, ABC
 import pygame
 
 class Movable(ABC):
+    __slots__ = ()
+
     def __init__(self, velocity: pygame.Vector2):
         self.velocity = velocity
 
@@ -14,6 +14,10 @@ class Orbital(Entity, Movable, Collision, Mass, ReceiveForce, ABC):
     An abstract base class for entities that are movable, collidable,
     have mass, and can receive forces.
     """
+    __slots__ = ("velocity", "shape",
+                 "mass", "acceleration", "force_accumulated", "pending_velocity_change", "pending_position_correction",
+                 "restitution")
+
     def __init__(self, x: int, y: int, velocity: pygame.Vector2, mass: float, shape: Shape, restitution: float = 0.8):
         Entity.__init__(self, x, y)
         Movable.__init__(self, velocity)
@@ -52,10 +56,11 @@ class Orbital(Entity, Movable, Collision, Mass, ReceiveForce, ABC):
         pass
 
     @abstractmethod
-    def resolve_collision(self, other: 'Collision'):
+    def resolve_collision(self, other: 'Collision') -> bool:
         """
         Handles the collision response with another collidable object.
         :param other: Collision object.
+        :return: True if the collision was handled, see `Collision.resolve_collision`.
         """
         pass
 
@@ -0,0 +1,48 @@
+import pygame
+
+from PhySimEngine.Entity import Entity
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+
+
+class RadialForceField(ForceField):
+    """
+    A force field that pushes objects away from its centre, or pulls them towards it with a negative strength.
+    With `falloff` the strength decreases linearly from the centre to zero at the radius.
+    """
+    __slots__ = ("falloff",)
+    uniform = False
+
+    def __init__(self, x: int, y: int, radius: float, strength: float, falloff: bool = False,
+                 color: tuple = (255, 255, 150)):
+        ForceField.__init__(self, x, y, radius, strength, pygame.Vector2(0, 0), color)
+        self.falloff = falloff
+
+    def add_applied_force(self, target_entity: 'Entity', force: pygame.Vector2):
+        self.add_force_at(target_entity.position, force)
+
+    def get_force(self, offset_x: float, offset_y: float) -> tuple[float, float]:
+        distance = (offset_x * offset_x + offset_y * offset_y) ** 0.5
+        if distance == 0:
+            return 0.0, 0.0
+        scale = self.strength / distance
+        if self.falloff:
+            scale *= 1 - distance / self.radius
+        return offset_x * scale, offset_y * scale
+
+    def get_state(self) -> tuple:
+        return ForceField.get_state(self) + (self.falloff,)
+
+    def render_static(self, surface: pygame.Surface):
+        pygame.draw.circle(surface, self.color, self.position, int(self.radius), 1)
+        pygame.draw.circle(surface, self.color, self.position, 15)
+
+        # Eight short arrows around the centre, pointing outwards or inwards.
+        sign = 1 if self.strength >= 0 else -1
+        for angle in range(0, 360, 45):
+            direction = pygame.Vector2(1, 0).rotate(angle)
+            start = self.position + direction * (25 if sign > 0 else 45)
+            end = start + direction * 20 * sign
+            pygame.draw.line(surface, (255, 255, 255), start, end, 2)
+            p1 = end + (direction * -6 * sign).rotate(30)
+            p2 = end + (direction * -6 * sign).rotate(-30)
+            pygame.draw.polygon(surface, (255, 255, 255), [end, p1, p2])
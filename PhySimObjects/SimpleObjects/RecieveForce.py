@@ -3,6 +3,8 @@ import pygame
 
 
 class ReceiveForce(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def apply_force(self, force: pygame.Vector2, delta_time: float):
         """Applies the calculated force to the object."""
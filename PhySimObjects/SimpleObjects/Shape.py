@@ -10,4 +10,19 @@ class Shape(ABC):
     @abstractmethod
     def intersects(self, other: 'Shape', self_pos: pygame.Vector2, other_pos: pygame.Vector2) -> bool:
         """Checks for intersection with another shape."""
-        pass
\ No newline at end of file
+        pass
+
+    def get_time_of_impact(self, other: 'Shape', self_pos: pygame.Vector2, other_pos: pygame.Vector2,
+                           relative_velocity: pygame.Vector2, max_time: float) -> float | None:
+        """
+        Returns the time at which the shape, moving with the given velocity relative to the other shape,
+        first touches it. Shapes without continuous collision support return None.
+        """
+        return None
+
+    def get_bounding_radius(self) -> float | None:
+        """
+        Returns the radius of a circle around the shape's origin that fully contains it.
+        Shapes without a known bound return None, which makes the broad phase test them against every entity.
+        """
+        return None
@@ -0,0 +1,4 @@
+import os
+
+# Scenarios and sprites need a video driver, the dummy one works without a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
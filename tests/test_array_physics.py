@@ -0,0 +1,73 @@
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from Demos.ForceFieldDemo import ForceFieldDemo
+from Demos.GravityDemo import GravityDemo
+from PhySimEngine.Entity import Entity
+from PhySimObjects.PhysicsHandlers.ArrayPhysics import ArrayPhysics
+from PhySimObjects.PhysicsHandlers.EulerIntegrator import EulerIntegrator
+
+
+def get_states(scenario) -> dict:
+    scenario.entity_manager.sync_entities()
+    return {entity.entity_id: (entity.position.x, entity.position.y, entity.velocity.x, entity.velocity.y)
+            for entity in scenario.entity_manager.get_entities() if hasattr(entity, 'velocity')}
+
+
+def assert_backends_agree(demo, ticks: int, **overrides):
+    serial = demo(headless=True, seed=0, **overrides)
+    vectorized = demo(headless=True, seed=0, physics_backend=ArrayPhysics(), **overrides)
+    serial.step(ticks)
+    vectorized.step(ticks)
+    expected = get_states(serial)
+    actual = get_states(vectorized)
+    assert expected.keys() == actual.keys()
+    for entity_id, state in expected.items():
+        assert actual[entity_id] == pytest.approx(state, rel=1e-9, abs=1e-6), entity_id
+
+
+def test_ball_demo_matches_the_entity_code():
+    assert_backends_agree(BallDemo, 60, balls=100)
+
+
+def test_force_field_demo_matches_the_entity_code():
+    assert_backends_agree(ForceFieldDemo, 60)
+
+
+def test_gravity_demo_matches_the_entity_code():
+    assert_backends_agree(GravityDemo, 60, integrator=EulerIntegrator())
+
+
+class Observer(Entity):
+    """An entity outside the array store that reads an array-backed ball every tick."""
+
+    def __init__(self, target):
+        super().__init__(0, 0)
+        self.target = target
+        self.seen = []
+
+    def calculate_physics(self, delta_time: float, scenario):
+        self.seen.append(pygame.Vector2(self.target.position))
+
+    def update(self, delta_time: float, scenario):
+        pass
+
+    def render(self, surface: pygame.Surface):
+        pass
+
+
+def test_other_entities_see_the_current_tick():
+    reference = BallDemo(headless=True, seed=0, balls=10, physics_backend=ArrayPhysics())
+    positions = []
+    for _ in range(5):
+        reference.entity_manager.apply_changes()
+        positions.append(pygame.Vector2(reference.entity_manager.get_entities()[0].position))
+        reference.step()
+
+    scenario = BallDemo(headless=True, seed=0, balls=10, physics_backend=ArrayPhysics())
+    scenario.entity_manager.apply_changes()
+    observer = Observer(scenario.entity_manager.get_entities()[0])
+    scenario.entity_manager.add(observer)
+    scenario.step(5)
+    assert observer.seen == positions
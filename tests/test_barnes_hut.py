@@ -0,0 +1,63 @@
+import random
+
+import pygame
+import pytest
+
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.BarnesHutTree import BarnesHutTree
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+
+G = 1000
+
+
+def create_bodies(count: int, seed: int = 0) -> list[GravityCircle]:
+    rng = random.Random(seed)
+    return [GravityCircle(rng.uniform(0, 800), rng.uniform(0, 600), 5, (255, 255, 255), pygame.Vector2(0, 0),
+                          mass=rng.uniform(1, 50)) for _ in range(count)]
+
+
+def exact_force(body, bodies) -> pygame.Vector2:
+    gravity = GlobalGravity(G)
+    force = pygame.Vector2(0, 0)
+    for other in bodies:
+        if other is not body:
+            gravity.add_gravitational_force(force, body.position, body.get_mass(), other.position, other.get_mass())
+    return force
+
+
+def get_relative_errors(theta: float, bodies: list) -> list[float]:
+    tree = BarnesHutTree(G, theta)
+    tree.build(bodies)
+    errors = []
+    for body in bodies:
+        expected = exact_force(body, bodies)
+        errors.append((tree.calculate_force(body.position, body.get_mass(), body) - expected).length()
+                      / expected.length())
+    return errors
+
+
+def test_zero_theta_matches_the_exact_sum():
+    assert max(get_relative_errors(0, create_bodies(200))) < 1e-9
+
+
+def test_approximation_stays_close_to_the_exact_sum():
+    errors = get_relative_errors(0.5, create_bodies(200))
+    assert sum(errors) / len(errors) < 0.02
+
+
+def test_body_never_attracts_itself():
+    # Two heavy bodies next to each other in one quadrant, far from the rest: at large theta the node holding
+    # both would be approximated for either of them if it wasn't opened.
+    bodies = [GravityCircle(700, 500, 5, (255, 255, 255), pygame.Vector2(0, 0), mass=1000),
+              GravityCircle(710, 500, 5, (255, 255, 255), pygame.Vector2(0, 0), mass=1),
+              GravityCircle(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0), mass=1)]
+    tree = BarnesHutTree(G, 1)
+    tree.build(bodies)
+    for body in bodies:
+        force = tree.calculate_force(body.position, body.get_mass(), body)
+        assert (force - exact_force(body, bodies)).length() < 1e-6 * max(force.length(), 1)
+
+
+def test_theta_outside_the_valid_range_is_rejected():
+    with pytest.raises(ValueError):
+        BarnesHutTree(G, 1.5)
@@ -0,0 +1,70 @@
+import random
+
+import pygame
+
+from PhySimEngine.EntityManager import EntityManager
+from PhySimEngine.Scenario import Scenario
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+def create_circles(count: int, seed: int = 0) -> EntityManager:
+    rng = random.Random(seed)
+    entity_manager = EntityManager()
+    for _ in range(count):
+        entity_manager.add(GravityCircle(rng.uniform(0, 400), rng.uniform(0, 300), rng.uniform(2, 15), (255, 255, 255),
+                                         pygame.Vector2(rng.uniform(-300, 300), rng.uniform(-300, 300))))
+    entity_manager.apply_changes()
+    return entity_manager
+
+
+def get_pair_ids(pairs) -> set:
+    return {frozenset((entity.entity_id, other.entity_id)) for entity, other in pairs}
+
+
+def test_spatial_hash_finds_every_overlapping_pair_once():
+    entity_manager = create_circles(300)
+    entity_manager.update_broad_phase()
+    pairs = list(entity_manager.get_collision_pairs())
+    assert len(pairs) == len(get_pair_ids(pairs))
+
+    entities = entity_manager.get_entities()
+    expected = {frozenset((entity.entity_id, other.entity_id))
+                for i, entity in enumerate(entities) for other in entities[i + 1:]
+                if entity.position.distance_to(other.position) < entity.radius + other.radius}
+    assert expected
+    assert expected <= get_pair_ids(pairs)
+
+
+def test_swept_broad_phase_finds_pairs_that_meet_within_the_tick():
+    entity_manager = EntityManager()
+    entity_manager.add(GravityCircle(0, 0, 5, (255, 255, 255), pygame.Vector2(6000, 0)))
+    entity_manager.add(GravityCircle(200, 0, 5, (255, 255, 255), pygame.Vector2(0, 0)))
+    entity_manager.apply_changes()
+
+    entity_manager.update_broad_phase()
+    assert not list(entity_manager.get_collision_pairs())
+    entity_manager.update_broad_phase(1 / 60)
+    assert len(list(entity_manager.get_collision_pairs())) == 1
+
+
+class OneSidedCircle(ForceFieldCircle):
+    """Handles GravityCircles from its own side only, like a custom entity written against the contract."""
+    __slots__ = ()
+
+    def resolve_collision(self, other) -> bool:
+        if not isinstance(other, GravityCircle):
+            return False
+        self.pending_velocity_change.x += 1
+        other.pending_velocity_change.x -= 1
+        return True
+
+
+def test_pairs_are_resolved_independent_of_their_order():
+    for order in (0, 1):
+        custom = OneSidedCircle(0, 0, 10, (255, 255, 255), pygame.Vector2(0, 0))
+        plain = GravityCircle(5, 0, 10, (255, 255, 255), pygame.Vector2(0, 0))
+        pair = (custom, plain) if order == 0 else (plain, custom)
+        assert Scenario.resolve_pair(*pair)
+        assert custom.pending_velocity_change.x == 1
+        assert plain.pending_velocity_change.x == -1
@@ -0,0 +1,37 @@
+import pygame
+import pytest
+
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.ForceFieldCircle import ForceFieldCircle
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+@pytest.mark.parametrize("cls", [GravityCircle, CircleOrbital, ForceFieldCircle])
+def test_collision_conserves_momentum_and_separates_the_circles(cls):
+    first = cls(0, 0, 10, (255, 255, 255), pygame.Vector2(50, 0), mass=2, restitution=1)
+    second = cls(15, 0, 10, (255, 255, 255), pygame.Vector2(-10, 0), mass=3, restitution=1)
+    assert first.resolve_collision(second)
+
+    assert tuple(first.pending_position_correction) == pytest.approx((-2.5, 0))
+    assert tuple(second.pending_position_correction) == pytest.approx((2.5, 0))
+    momentum = first.mass * first.pending_velocity_change + second.mass * second.pending_velocity_change
+    assert tuple(momentum) == pytest.approx((0, 0))
+    # An elastic collision swaps the velocities in the frame of the centre of mass.
+    assert first.velocity.x + first.pending_velocity_change.x == pytest.approx(-22)
+    assert second.velocity.x + second.pending_velocity_change.x == pytest.approx(38)
+
+
+def test_contacts_of_both_orders_are_mirrored():
+    first = GravityCircle(0, 0, 10, (255, 255, 255), pygame.Vector2(0, 0), restitution=0.3)
+    second = GravityCircle(12, 5, 8, (255, 255, 255), pygame.Vector2(0, 0), restitution=0.6)
+    normal_x, normal_y, depth, restitution = first.get_contact(second)
+    assert second.get_contact(first) == pytest.approx((-normal_x, -normal_y, depth, restitution))
+    assert (depth, restitution) == pytest.approx((5, 0.3))
+
+
+def test_circles_of_different_classes_ignore_each_other():
+    ball = GravityCircle(0, 0, 10, (255, 255, 255), pygame.Vector2(0, 0))
+    orbital = CircleOrbital(5, 0, 10, (255, 255, 255), pygame.Vector2(0, 0))
+    assert not ball.resolve_collision(orbital)
+    assert not orbital.resolve_collision(ball)
+    assert ball.get_contact(orbital) is None
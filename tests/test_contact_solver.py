@@ -0,0 +1,52 @@
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.ContactSolver import BOTTOM, ContactSolver
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+def create_scene(*balls: GravityCircle, **options) -> BallDemo:
+    scenario = BallDemo(headless=True, seed=0, balls=0, contact_solver=ContactSolver(), **options)
+    for ball in balls:
+        scenario.entity_manager.add(ball)
+    scenario.entity_manager.apply_changes()
+    return scenario
+
+
+@pytest.mark.parametrize("tps", [60, 360])
+def test_stack_comes_to_rest_on_the_floor(tps):
+    bottom = 768
+    balls = [GravityCircle(500, bottom - 10 - 20 * level, 10, (255, 255, 255), pygame.Vector2(0, 0),
+                           restitution=0.3) for level in range(6)]
+    scenario = create_scene(*balls, tps=tps)
+    scenario.step(5 * tps)
+    settled = [pygame.Vector2(ball.position) for ball in balls]
+    scenario.step(tps)
+    for level, ball in enumerate(balls):
+        # At 60 ticks per second the stack keeps trembling by a fraction of a pixel.
+        assert ball.position.distance_to(settled[level]) < 0.5
+        assert ball.position.x == 500
+        assert ball.position.y == pytest.approx(bottom - 10 - 20 * level, abs=3.5)
+    assert scenario.contact_solver.impulses[(balls[0].entity_id, BOTTOM)] > 0
+
+
+def test_head_on_collision_conserves_momentum():
+    first = GravityCircle(400, 300, 10, (255, 255, 255), pygame.Vector2(300, 0), mass=1, restitution=1)
+    second = GravityCircle(425, 300, 10, (255, 255, 255), pygame.Vector2(-100, 0), mass=3, restitution=1)
+    scenario = create_scene(first, second)
+    scenario.local_gravity_handler.gravity_vector.update(0, 0)
+    scenario.step(10)
+    assert first.mass * first.velocity.x + second.mass * second.velocity.x == pytest.approx(0)
+    # Elastic, so the bodies leave with the velocities they had in the frame of the centre of mass, reversed.
+    assert first.velocity.x == pytest.approx(-300)
+    assert second.velocity.x == pytest.approx(100)
+
+
+def test_fast_contacts_bounce_and_slow_ones_settle():
+    fast = GravityCircle(300, 758, 10, (255, 255, 255), pygame.Vector2(0, 200), restitution=0.5)
+    slow = GravityCircle(600, 758, 10, (255, 255, 255), pygame.Vector2(0, 10), restitution=0.5)
+    scenario = create_scene(fast, slow)
+    scenario.step()
+    assert fast.velocity.y == pytest.approx(-0.5 * (200 + 300 / 360), rel=1e-6)
+    assert slow.velocity.y == pytest.approx(0, abs=1e-9)
@@ -0,0 +1,59 @@
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimObjects.CircleShape import CircleShape
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+def create_scene(*balls: GravityCircle, continuous_collisions: bool) -> BallDemo:
+    # At 10 ticks per second the fast balls below move much further than their size within one tick.
+    scenario = BallDemo(headless=True, seed=0, balls=0, tps=10, continuous_collisions=continuous_collisions)
+    scenario.local_gravity_handler.gravity_vector.update(0, 0)
+    for ball in balls:
+        scenario.entity_manager.add(ball)
+    scenario.entity_manager.apply_changes()
+    return scenario
+
+
+def fast_pair() -> tuple[GravityCircle, GravityCircle]:
+    fast = GravityCircle(100, 300, 5, (255, 255, 255), pygame.Vector2(3000, 0), restitution=1)
+    still = GravityCircle(250, 300, 5, (255, 255, 255), pygame.Vector2(0, 0), restitution=1)
+    return fast, still
+
+
+def test_time_of_impact_of_circles():
+    shape, other = CircleShape(5), CircleShape(10)
+    position, other_position = pygame.Vector2(0, 0), pygame.Vector2(100, 0)
+    assert shape.get_time_of_impact(other, position, other_position, pygame.Vector2(170, 0), 1) == pytest.approx(0.5)
+    # Too slow to reach it within the tick, moving away from it, and passing it at a distance.
+    assert shape.get_time_of_impact(other, position, other_position, pygame.Vector2(50, 0), 1) is None
+    assert shape.get_time_of_impact(other, position, other_position, pygame.Vector2(-170, 0), 1) is None
+    assert shape.get_time_of_impact(other, position, other_position, pygame.Vector2(170, 40), 1) is None
+
+
+def test_fast_ball_tunnels_without_continuous_collisions():
+    fast, still = fast_pair()
+    create_scene(fast, still, continuous_collisions=False).step()
+    assert tuple(fast.position) == (400, 300) and tuple(fast.velocity) == (3000, 0)
+    assert tuple(still.position) == (250, 300) and tuple(still.velocity) == (0, 0)
+
+
+def test_fast_ball_hits_the_other_one_at_the_time_of_impact():
+    fast, still = fast_pair()
+    create_scene(fast, still, continuous_collisions=True).step()
+    # They touch after (250 - 10 - 100) / 3000 s, then the elastic collision swaps their velocities.
+    assert tuple(fast.velocity) == pytest.approx((0, 0), abs=1e-6)
+    assert tuple(still.velocity) == pytest.approx((3000, 0))
+    assert tuple(fast.position) == pytest.approx((240, 300))
+    assert tuple(still.position) == pytest.approx((250 + 3000 * (0.1 - 140 / 3000), 300))
+
+
+@pytest.mark.parametrize("continuous_collisions, expected", [(False, 1014), (True, 954)])
+def test_border_contacts_spend_the_rest_of_the_tick_moving_away(continuous_collisions, expected):
+    ball = GravityCircle(974, 300, 10, (255, 255, 255), pygame.Vector2(1000, 0), restitution=1)
+    scenario = create_scene(ball, continuous_collisions=continuous_collisions)
+    assert scenario.world_rect.right == 1024
+    scenario.step()
+    assert ball.position.x == pytest.approx(expected)
+    assert ball.velocity.x == -1000
@@ -0,0 +1,70 @@
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.ControlServer import ControlServer
+from PhySimObjects.GravityCircle import GravityCircle
+
+BALL = {"x": 100, "y": 100, "radius": 5, "color": [255, 0, 0], "initial_velocity": [0, 50]}
+
+
+class BrokenCircle(GravityCircle):
+    """A circle whose constructor fails for arguments that pass the annotation checks."""
+
+    def __init__(self, x: int, y: int, radius: float):
+        raise ZeroDivisionError("no room for this circle")
+
+
+def run_commands(*messages) -> tuple[BallDemo, list[dict]]:
+    server = ControlServer(port=0, entity_types={"GravityCircle": GravityCircle, "BrokenCircle": BrokenCircle})
+    scenario = BallDemo(headless=True, seed=0, balls=3, control_server=server)
+    scenario.entity_manager.apply_changes()
+    replies = []
+    server.send = lambda writer, message: replies.append(message)
+    server.commands.extend((None, message) for message in messages)
+    server.apply_commands(scenario)
+    scenario.entity_manager.apply_changes()
+    return scenario, replies
+
+
+def test_valid_commands_change_the_scenario():
+    scenario, replies = run_commands({"command": "add", "entity": "GravityCircle", "args": BALL},
+                                     {"command": "remove", "entity_id": 0},
+                                     {"command": "set_speed", "speed": 2})
+    assert [reply["ok"] for reply in replies] == [True, True, True]
+    ids = [entity.entity_id for entity in scenario.entity_manager.get_entities()]
+    assert replies[0]["entity_id"] in ids and 0 not in ids
+    assert scenario.speed == 2
+
+
+@pytest.mark.parametrize("args", [
+    dict(BALL, radius="5"),
+    dict(BALL, radius=True),
+    dict(BALL, initial_velocity=[1]),
+    dict(BALL, mass=float("nan")),
+    dict(BALL, bogus=1),
+    {"x": 1},
+])
+def test_invalid_entity_arguments_are_answered_with_an_error(args):
+    scenario, replies = run_commands({"command": "add", "entity": "GravityCircle", "args": args})
+    assert replies[0]["ok"] is False
+    assert len(scenario.entity_manager.get_entities()) == 3
+
+
+def test_errors_of_the_entity_constructor_are_answered():
+    broken = {"command": "add", "entity": "BrokenCircle", "args": {"x": 1, "y": 2, "radius": 3}}
+    scenario, replies = run_commands(broken, {"command": "pause"})
+    assert replies[0]["ok"] is False
+    assert "ZeroDivisionError: no room for this circle" in replies[0]["error"]
+    assert replies[1]["ok"] is True
+
+
+@pytest.mark.parametrize("entity_id", [True, 1.9, "1", None, float("inf")])
+def test_remove_only_accepts_integer_ids(entity_id):
+    scenario, replies = run_commands({"command": "remove", "entity_id": entity_id})
+    assert replies[0]["ok"] is False
+    assert len(scenario.entity_manager.get_entities()) == 3
+
+
+def test_remove_accepts_integral_floats():
+    scenario, replies = run_commands({"command": "remove", "entity_id": 1.0})
+    assert replies[0] == {"entity_id": 1, "ok": True, "type": "reply", "command": "remove"}
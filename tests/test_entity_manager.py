@@ -0,0 +1,78 @@
+import pygame
+
+from PhySimEngine.EntityManager import EntityManager
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+from PhySimObjects.SimpleObjects.Movable import Movable
+
+
+def create_circle(x: float = 0) -> GravityCircle:
+    return GravityCircle(x, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))
+
+
+def test_ids_are_stable_and_never_reused():
+    entity_manager = EntityManager()
+    circles = [create_circle(i) for i in range(5)]
+    for circle in circles:
+        entity_manager.add(circle)
+    entity_manager.apply_changes()
+    assert [circle.entity_id for circle in circles] == [0, 1, 2, 3, 4]
+
+    entity_manager.remove(circles[1])
+    entity_manager.remove(circles[3])
+    added = create_circle()
+    entity_manager.add(added)
+    entity_manager.apply_changes()
+    assert added.entity_id == 5
+    assert entity_manager.get_entities() == (circles[0], circles[2], circles[4], added)
+    assert entity_manager.get_entity(2) is circles[2]
+    assert entity_manager.get_entity(3) is None
+
+
+def test_changes_are_queued_until_they_are_applied():
+    entity_manager = EntityManager()
+    circle = create_circle()
+    entity_manager.add(circle)
+    assert entity_manager.get_entities() == ()
+    entity_manager.apply_changes()
+    entity_manager.remove(circle)
+    entity_manager.remove(circle)
+    assert entity_manager.get_entities() == (circle,)
+    entity_manager.apply_changes()
+    assert entity_manager.get_entities() == ()
+
+
+def test_the_entity_snapshot_is_shared_until_entities_change():
+    entity_manager = EntityManager()
+    entity_manager.add(create_circle())
+    entity_manager.apply_changes()
+    snapshot = entity_manager.get_entities()
+    entity_manager.apply_changes()
+    assert entity_manager.get_entities() is snapshot
+    entity_manager.add(create_circle())
+    entity_manager.apply_changes()
+    assert entity_manager.get_entities() is not snapshot
+    assert len(snapshot) == 1
+
+
+def test_type_indexes_follow_additions_and_removals():
+    entity_manager = EntityManager()
+    circle = create_circle()
+    orbital = CircleOrbital(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))
+    field = ForceField(0, 0, 50, 10, pygame.Vector2(1, 0))
+    for entity in (circle, orbital, field):
+        entity_manager.add(entity)
+    entity_manager.apply_changes()
+    assert entity_manager.entities_of(Movable) == (circle, orbital)
+    assert entity_manager.entities_of(CircleOrbital) == (orbital,)
+    assert entity_manager.collidables() == (circle, orbital)
+
+    # The indexes built by the queries above are updated in place from now on.
+    added = CircleOrbital(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))
+    entity_manager.add(added)
+    entity_manager.remove(orbital)
+    entity_manager.apply_changes()
+    for cls in (Movable, CircleOrbital, ForceField):
+        assert entity_manager.entities_of(cls) == tuple(e for e in entity_manager.get_entities() if isinstance(e, cls))
+    assert entity_manager.collidables() == (circle, added)
@@ -0,0 +1,40 @@
+import pytest
+
+from Demos.BallDemo import BallDemo
+
+# Frame times of a a jittery render loop, none of them over the limit of 8 ticks at 360 tps.
+FRAME_TIMES = (1 / 60, 1 / 72, 1 / 144, 1 / 90) * 5
+
+
+def get_states(scenario) -> list:
+    return [(tuple(entity.position), tuple(entity.velocity)) for entity in scenario.entity_manager.get_entities()]
+
+
+def test_frames_are_consumed_in_ticks_of_constant_length():
+    scenario = BallDemo(headless=True, seed=0, balls=40)
+    for frame_time in FRAME_TIMES:
+        scenario.advance_fixed(frame_time)
+    scenario.entity_manager.sync_entities()
+
+    reference = BallDemo(headless=True, seed=0, balls=40)
+    reference.step(scenario.tick_count)
+    assert scenario.tick_count == int(sum(FRAME_TIMES) * 360)
+    assert get_states(scenario) == get_states(reference)
+    assert 0 <= scenario.accumulator < 1 / 360
+
+
+def test_slow_frames_run_at_most_max_substeps():
+    scenario = BallDemo(headless=True, seed=0, balls=10, max_substeps=8)
+    scenario.advance_fixed(1.0)
+    assert scenario.tick_count == 8
+    assert scenario.accumulator <= 1 / 360
+
+
+def test_previous_positions_are_those_of_the_second_to_last_tick():
+    scenario = BallDemo(headless=True, seed=0, balls=10)
+    scenario.advance_fixed(3.5 / 360)
+    reference = BallDemo(headless=True, seed=0, balls=10)
+    reference.step(2)
+    previous = [tuple(scenario.previous_positions[entity]) for entity in scenario.entity_manager.get_entities()]
+    assert previous == [position for position, velocity in get_states(reference)]
+    assert scenario.accumulator * 360 == pytest.approx(0.5)
@@ -0,0 +1,74 @@
+import random
+
+import pygame
+import pytest
+
+from Demos.ForceFieldDemo import ForceFieldDemo
+from PhySimObjects.PhysicsHandlers.ForceFieldGrid import ForceFieldGrid
+from PhySimObjects.SimpleObjects.FalloffForceField import FalloffForceField
+from PhySimObjects.SimpleObjects.ForceField import ForceField
+from PhySimObjects.SimpleObjects.RadialForceField import RadialForceField
+
+WORLD = pygame.Rect(0, 0, 640, 480)
+
+
+def compare_with_direct_evaluation(fields, grid: ForceFieldGrid) -> float:
+    """Returns the largest difference between the grid and a sum over every field, at random positions."""
+    grid.build(tuple(fields), WORLD)
+    generator = random.Random(0)
+    largest_error = 0.0
+    for _ in range(3000):
+        # Includes positions outside of the world, which the grid evaluates exactly.
+        position = pygame.Vector2(generator.uniform(-50, 690), generator.uniform(-50, 530))
+        expected = pygame.Vector2(0, 0)
+        for field in fields:
+            field.add_force_at(position, expected)
+        force = pygame.Vector2(0, 0)
+        grid.add_force(position, force)
+        largest_error = max(largest_error, force.distance_to(expected))
+    return largest_error
+
+
+def test_uniform_fields_are_looked_up_exactly():
+    fields = [ForceField(200, 200, 150, 500, pygame.Vector2(1, 0)),
+              ForceField(300, 250, 100, 700, pygame.Vector2(-0.7, 0.7)),
+              ForceField(630, 10, 60, 300, pygame.Vector2(0, 1))]
+    assert compare_with_direct_evaluation(fields, ForceFieldGrid()) == pytest.approx(0, abs=1e-9)
+
+
+@pytest.mark.parametrize("cell_size", [4, 8, 20])
+def test_sampled_fields_stay_within_the_tolerance(cell_size):
+    fields = [RadialForceField(200, 200, 150, 500),
+              RadialForceField(400, 300, 120, -400, falloff=True),
+              FalloffForceField(300, 250, 100, 700, pygame.Vector2(0, -1)),
+              ForceField(320, 240, 200, 100, pygame.Vector2(1, 1))]
+    grid = ForceFieldGrid(cell_size=cell_size, tolerance=0.05)
+    # Each of the overlapping non-uniform fields may be off by the tolerance of its strength.
+    assert compare_with_direct_evaluation(fields, grid) <= 0.05 * (500 + 400 + 700)
+    assert grid.edge_fields
+
+
+def test_grid_is_rebuilt_only_when_a_field_changes():
+    grid = ForceFieldGrid()
+    scenario = ForceFieldDemo(headless=True, seed=0, force_field_grid=grid)
+    scenario.step()
+    forces = grid.forces_x
+    scenario.step()
+    assert grid.forces_x is forces
+
+    field = scenario.entity_manager.entities_of(ForceField)[0]
+    field.position.x += 100
+    scenario.step()
+    assert grid.forces_x is not forces
+    force = pygame.Vector2(0, 0)
+    grid.add_force(pygame.Vector2(field.position.x + 120, field.position.y), force)
+    assert tuple(force) == pytest.approx((500, 0))
+
+
+def test_circles_move_the_same_with_and_without_the_grid():
+    direct = ForceFieldDemo(headless=True, seed=0)
+    looked_up = ForceFieldDemo(headless=True, seed=0, force_field_grid=ForceFieldGrid())
+    direct.step(120)
+    looked_up.step(120)
+    for entity, other in zip(direct.entity_manager.get_entities(), looked_up.entity_manager.get_entities()):
+        assert tuple(other.position) == pytest.approx(tuple(entity.position))
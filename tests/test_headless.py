@@ -0,0 +1,30 @@
+from Demos.BallDemo import BallDemo
+
+
+def get_states(scenario) -> list:
+    return [(tuple(entity.position), tuple(entity.velocity)) for entity in scenario.entity_manager.get_entities()]
+
+
+def test_headless_scenario_opens_no_window():
+    scenario = BallDemo(headless=True, seed=0, balls=10)
+    assert scenario.display_surface is None
+    assert scenario.input_manager is None
+    assert scenario.renderer is None
+
+
+def test_run_for_advances_fixed_ticks():
+    scenario = BallDemo(headless=True, seed=0, balls=10)
+    scenario.run_for(1.5)
+    assert scenario.tick_count == 540
+    scenario.step(3)
+    assert scenario.tick_count == 543
+
+
+def test_runs_with_the_same_seed_are_identical():
+    first = BallDemo(headless=True, seed=3, balls=50)
+    second = BallDemo(headless=True, seed=3, balls=50)
+    first.step(200)
+    second.step(120)
+    second.step(80)
+    assert get_states(first) == get_states(second)
+    assert get_states(first) != get_states(BallDemo(headless=True, seed=4, balls=50))
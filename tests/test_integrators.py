@@ -0,0 +1,85 @@
+import pygame
+import pytest
+
+from Demos.GravityDemo import GravityDemo
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.PhysicsHandlers.BlockTimestepIntegrator import BlockTimestepIntegrator
+from PhySimObjects.PhysicsHandlers.EulerIntegrator import EulerIntegrator
+from PhySimObjects.PhysicsHandlers.RK4Integrator import RK4Integrator
+from PhySimObjects.PhysicsHandlers.VelocityVerletIntegrator import VelocityVerletIntegrator
+
+G = 0.1
+CENTRAL_MASS = 100000000
+
+
+def create_orbit(integrator, eccentricity: float = 0.0, radius: float = 300) -> GravityDemo:
+    """A body on a Kepler orbit around the sun of GravityDemo, starting at the apoapsis."""
+    scenario = GravityDemo(headless=True, seed=0, bodies=0, G=G, integrator=integrator)
+    scenario.entity_manager.apply_changes()
+    sun = scenario.entity_manager.get_entities()[0]
+    speed = (G * CENTRAL_MASS * (1 - eccentricity) / radius) ** 0.5
+    scenario.entity_manager.add(CircleOrbital(sun.position.x + radius, sun.position.y, 5, (255, 255, 255),
+                                              pygame.Vector2(0, speed), mass=10))
+    scenario.entity_manager.apply_changes()
+    return scenario
+
+
+def get_energy(scenario) -> float:
+    bodies = scenario.entity_manager.get_entities()
+    energy = sum(0.5 * body.mass * body.velocity.length_squared() for body in bodies)
+    for i, body in enumerate(bodies):
+        for other in bodies[i + 1:]:
+            energy -= G * body.mass * other.mass / max(body.position.distance_to(other.position), 10)
+    return energy
+
+
+def get_energy_error(integrator, seconds: float = 10, **orbit) -> float:
+    scenario = create_orbit(integrator, **orbit)
+    start = get_energy(scenario)
+    scenario.run_for(seconds)
+    return abs(get_energy(scenario) / start - 1)
+
+
+def get_largest_energy_error(integrator, ticks: int = 1200, **orbit) -> float:
+    scenario = create_orbit(integrator, **orbit)
+    start = get_energy(scenario)
+    largest = 0
+    for _ in range(ticks):
+        scenario.step()
+        largest = max(largest, abs(get_energy(scenario) / start - 1))
+    return largest
+
+
+def test_euler_matches_the_default_update():
+    default = create_orbit(None)
+    euler = create_orbit(EulerIntegrator())
+    default.step(120)
+    euler.step(120)
+    for body, other in zip(default.entity_manager.get_entities(), euler.entity_manager.get_entities()):
+        assert tuple(other.position) == pytest.approx(tuple(body.position))
+        assert tuple(other.velocity) == pytest.approx(tuple(body.velocity))
+
+
+@pytest.mark.parametrize("integrator, tolerance", [(VelocityVerletIntegrator, 1e-4), (RK4Integrator, 1e-6)])
+def test_higher_order_integrators_conserve_orbital_energy(integrator, tolerance):
+    assert get_energy_error(integrator(), eccentricity=0.5) < tolerance
+    assert get_energy_error(integrator(), eccentricity=0.5) < get_energy_error(EulerIntegrator(), eccentricity=0.5)
+
+
+def test_block_timesteps_match_verlet_far_from_the_sun():
+    verlet = create_orbit(VelocityVerletIntegrator(), radius=400)
+    block = create_orbit(BlockTimestepIntegrator(), radius=400)
+    verlet.step(600)
+    block.step(600)
+    assert block.integrator.levels == {0: 2}
+    for body, other in zip(verlet.entity_manager.get_entities(), block.entity_manager.get_entities()):
+        assert tuple(other.position) == pytest.approx(tuple(body.position))
+        assert tuple(other.velocity) == pytest.approx(tuple(body.velocity))
+
+
+def test_block_timesteps_subdivide_close_passes():
+    # The periapsis of this orbit is 75 pixels from the centre of the sun, 10 pixels above its surface.
+    block = BlockTimestepIntegrator()
+    block_error = get_largest_energy_error(block, eccentricity=0.6)
+    assert block.body_steps > 1.5 * 2 * 1200
+    assert block_error < get_largest_energy_error(VelocityVerletIntegrator(), eccentricity=0.6) / 10
@@ -0,0 +1,42 @@
+from Demos.ForceFieldDemo import ForceFieldDemo
+from Demos.GravityDemo import GravityDemo
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+from PhySimObjects.PhysicsHandlers.ParallelForces import ParallelForces
+
+
+def get_states(scenario) -> list:
+    return [(tuple(entity.position), tuple(getattr(entity, "velocity", ())))
+            for entity in scenario.entity_manager.get_entities()]
+
+
+def run(scenario, ticks: int) -> list:
+    try:
+        scenario.step(ticks)
+    finally:
+        scenario.close()
+    return get_states(scenario)
+
+
+def test_gravity_matches_the_serial_sum_bit_for_bit():
+    serial = GravityDemo(headless=True, seed=0, bodies=30)
+    parallel = GravityDemo(headless=True, seed=0, bodies=30, parallel_forces=ParallelForces(workers=2))
+    for scenario in (serial, parallel):
+        # The workers sum every target over all sources like the per-body path, not once per pair.
+        scenario.global_gravity_handler = GlobalGravity(0.1, symmetric=False)
+    assert run(parallel, 120) == run(serial, 120)
+    assert len(parallel.parallel_forces.rows) == 31
+
+
+def test_force_fields_match_the_serial_sum_bit_for_bit():
+    serial = ForceFieldDemo(headless=True, seed=0)
+    parallel = ForceFieldDemo(headless=True, seed=0, parallel_forces=ParallelForces(workers=2))
+    assert run(parallel, 120) == run(serial, 120)
+    assert len(parallel.parallel_forces.rows) == 25
+    assert parallel.parallel_forces.pool is None
+
+
+def test_workers_stop_after_a_window_was_opened():
+    scenario = GravityDemo(seed=0, bodies=10, parallel_forces=ParallelForces(workers=2))
+    scenario.render()
+    run(scenario, 3)
+    assert scenario.parallel_forces.pool is None
@@ -0,0 +1,38 @@
+import json
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.Profiler import Profiler
+
+
+def test_every_tick_records_its_phases_and_counters():
+    profiler = Profiler(capacity=8)
+    scenario = BallDemo(headless=True, seed=0, balls=30, profiler=profiler)
+    scenario.step(5)
+    frames = profiler.get_frames()
+    assert [frame["frame"] for frame in frames] == [0, 1, 2, 3, 4]
+    for frame in frames:
+        assert frame["ticks"] == 1 and frame["entities"] == 30
+        assert frame["physics_ms"] > 0
+        phases = sum(frame[f"{phase}_ms"] for phase in ("apply_changes", "broad_phase", "forces", "collisions",
+                                                        "update"))
+        assert phases <= frame["physics_ms"]
+
+
+def test_the_ring_buffer_keeps_the_newest_frames():
+    profiler = Profiler(capacity=4)
+    BallDemo(headless=True, seed=0, balls=5, profiler=profiler).step(10)
+    assert [frame["frame"] for frame in profiler.get_frames()] == [6, 7, 8, 9]
+    profiler.reset()
+    assert profiler.get_frames() == []
+
+
+def test_per_class_times_are_exported(tmp_path):
+    profiler = Profiler(per_class=True)
+    BallDemo(headless=True, seed=0, balls=5, profiler=profiler).step(3)
+    path = tmp_path / "profile.json"
+    profiler.export_json(str(path))
+    with open(path) as file:
+        frames = json.load(file)
+    assert len(frames) == 3
+    assert all(frame["GravityCircle_ms"] > 0 for frame in frames)
+    assert profiler.get_averages(3)["ticks"] == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from Benchmarks.ScaleBenchmark import ScaleBenchmark, PHASES, compare, measure
+
+
+def suite(ticks_per_second: float, render_ms: float = 1.0, peak_mib: float = 10.0, forces_ms: float = 1.0) -> dict:
+    return {"results": [{"scene": "ball", "count": 100, "ticks_per_second": ticks_per_second, "render_ms": render_ms,
+                         "peak_mib": peak_mib, "phase_ms": {"forces_ms": forces_ms, "update_ms": 0.01}}]}
+
+
+@pytest.mark.parametrize("scene, count", [("ball", 100), ("gravity", 100), ("force_field", 100), ("gravity", 1001)])
+def test_scenes_are_built_at_the_requested_size(scene, count):
+    scenario = ScaleBenchmark(scene, count)
+    scenario.entity_manager.apply_changes()
+    fields = 4 if scene == "force_field" else 0
+    assert len(scenario.entity_manager.get_entities()) == count + fields
+    assert (scenario.global_gravity_handler.theta is not None) == (count > 1000)
+    scenario.close()
+
+
+def test_measure_reports_throughput_phases_rendering_and_memory():
+    result = measure("ball", 100, ticks=3, time_budget=1.0)
+    assert result["scene"] == "ball" and result["count"] == 100
+    assert 1 <= result["ticks"] <= 3
+    assert result["ticks_per_second"] > 0 and result["render_ms"] > 0 and result["peak_mib"] > 0
+    assert set(result["phase_ms"]) <= {f"{phase}_ms" for phase in PHASES}
+    assert "forces_ms" in result["phase_ms"]
+
+
+def test_compare_accepts_changes_within_the_threshold():
+    assert compare(suite(100), suite(95, render_ms=1.05, peak_mib=10.5, forces_ms=1.09), 0.1) == []
+
+
+def test_compare_reports_every_regression():
+    found = compare(suite(100), suite(80, render_ms=2.0, peak_mib=20.0, forces_ms=2.0), 0.1)
+    assert len(found) == 4
+    assert found[0] == "ball 100: 100.00 -> 80.00 ticks/s"
+    assert any("forces ms/tick" in line for line in found)
+
+
+def test_compare_ignores_tiny_phase_changes_and_new_scenes():
+    current = suite(100, forces_ms=1.04)
+    current["results"][0]["phase_ms"]["update_ms"] = 0.03
+    current["results"].append(dict(current["results"][0], count=1000, ticks_per_second=1))
+    assert compare(suite(100), current, 0.1) == []
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from PhySimEngine import ShardedWorld as sharded_world
+from PhySimEngine.ShardedWorld import ShardedWorld
+
+
+def run_world(columns: int, rows: int, ticks: int = 120) -> tuple[ShardedWorld, np.ndarray, np.ndarray]:
+    """Runs 1000 falling balls and returns the world, their final positions and the ids of the bodies."""
+    world = ShardedWorld((0, 0, 1200, 900), columns, rows, gravity=(0, 300), max_radius=10)
+    generator = np.random.default_rng(0)
+    try:
+        world.add_bodies(position=generator.uniform((0, 0), (1200, 900), (1000, 2)),
+                         velocity=generator.uniform(-100, 100, (1000, 2)), radius=8, mass=1.0, restitution=0.3,
+                         color=generator.integers(0, 256, (1000, 3)))
+        world.step(ticks, 1 / 60)
+        bodies = world.get_bodies()
+    finally:
+        world.close()
+    return world, bodies.position, bodies.ids
+
+
+@pytest.mark.parametrize("columns, rows", [(2, 2), (3, 2)])
+def test_tiles_agree_with_a_single_tile(columns, rows):
+    _, expected, _ = run_world(1, 1)
+    world, position, ids = run_world(columns, rows)
+    assert ids.tolist() == list(range(1000))
+    # Contacts across a border are summed in another order than within a tile.
+    assert position == pytest.approx(expected, abs=1e-3)
+    assert len(world.tile_cpu_times) == columns * rows
+
+
+def test_outboxes_grow_when_many_bodies_cross(monkeypatch):
+    _, expected, _ = run_world(1, 1, ticks=60)
+    monkeypatch.setattr(sharded_world.Outbox.__init__, "__defaults__", (1,))
+    _, position, ids = run_world(2, 2, ticks=60)
+    assert ids.tolist() == list(range(1000))
+    assert position == pytest.approx(expected, abs=1e-3)
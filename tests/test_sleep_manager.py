@@ -0,0 +1,64 @@
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.SleepManager import SleepManager
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+@pytest.fixture(scope="module")
+def settled_path(tmp_path_factory) -> str:
+    """A snapshot of a ball pile that has come to rest."""
+    path = str(tmp_path_factory.mktemp("sleep") / "settled.snap")
+    scenario = BallDemo(headless=True, seed=0, balls=60, sleep_manager=SleepManager())
+    scenario.step(2000)
+    scenario.save_snapshot(path)
+    return path
+
+
+def load_settled(path: str) -> BallDemo:
+    scenario = BallDemo(headless=True, seed=0, balls=0, sleep_manager=SleepManager())
+    scenario.load_snapshot(path)
+    return scenario
+
+
+def get_sleepers(scenario) -> list:
+    return [entity for entity in scenario.entity_manager.get_entities() if scenario.sleep_manager.is_sleeping(entity)]
+
+
+def test_settled_pile_falls_asleep_and_snapshots_keep_it_asleep(settled_path):
+    scenario = load_settled(settled_path)
+    sleepers = get_sleepers(scenario)
+    assert len(sleepers) > 50
+    assert all(body.velocity == (0, 0) for body in sleepers)
+    scenario.step(10)
+    assert get_sleepers(scenario) == sleepers
+
+
+def test_changed_gravity_wakes_the_sleepers(settled_path):
+    scenario = load_settled(settled_path)
+    scenario.local_gravity_handler.gravity_vector.y *= -1
+    scenario.step(2)
+    assert not get_sleepers(scenario)
+
+
+def test_hit_sleeper_wakes_and_takes_its_share_of_the_impulse(settled_path):
+    scenario = load_settled(settled_path)
+    sleeper = min(get_sleepers(scenario), key=lambda body: body.position.y)
+    ball = GravityCircle(sleeper.position.x, sleeper.position.y - 2 * sleeper.radius + 1, sleeper.radius,
+                         (255, 0, 0), pygame.Vector2(0, 400), mass=sleeper.mass, restitution=0.3)
+    scenario.entity_manager.add(ball)
+    scenario.step()
+    assert not scenario.sleep_manager.is_sleeping(sleeper)
+    assert sleeper.velocity.y > 0
+    assert ball.velocity.y < 400
+
+
+def test_removed_body_wakes_the_sleepers_it_touched(settled_path):
+    scenario = load_settled(settled_path)
+    sleepers = get_sleepers(scenario)
+    lowest = max(sleepers, key=lambda body: body.position.y)
+    scenario.entity_manager.remove(lowest)
+    scenario.step()
+    assert len(get_sleepers(scenario)) < len(sleepers) - 1
+    assert lowest.entity_id not in scenario.sleep_manager.rest_times
@@ -0,0 +1,96 @@
+import pickle
+import struct
+
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine import Snapshot
+from PhySimEngine.ContactSolver import ContactSolver
+from PhySimEngine.SleepManager import SleepManager
+from PhySimObjects.GravityCircle import GravityCircle
+from PhySimObjects.PhysicsHandlers.VelocityVerletIntegrator import VelocityVerletIntegrator
+
+
+def get_states(scenario) -> list:
+    return [(entity.entity_id, tuple(entity.position), tuple(entity.velocity))
+            for entity in scenario.entity_manager.get_entities()]
+
+
+@pytest.mark.parametrize("create_options", [
+    dict,
+    lambda: {"contact_solver": ContactSolver(iterations=8)},
+    lambda: {"integrator": VelocityVerletIntegrator()},
+    lambda: {"sleep_manager": SleepManager()},
+])
+def test_loaded_snapshot_continues_like_the_original_run(tmp_path, create_options):
+    path = str(tmp_path / "balls.snap")
+    original = BallDemo(headless=True, seed=0, balls=80, **create_options())
+    original.step(600)
+    original.save_snapshot(path)
+
+    restored = BallDemo(headless=True, seed=1, balls=3, **create_options())
+    restored.load_snapshot(path)
+    assert restored.tick_count == original.tick_count
+    assert get_states(restored) == get_states(original)
+
+    original.step(300)
+    restored.step(300)
+    assert get_states(restored) == get_states(original)
+    assert restored.entity_manager.next_id == original.entity_manager.next_id
+
+
+class Payload:
+    pass
+
+
+class PayloadCircle(GravityCircle):
+    """A circle with an attribute whose class a snapshot may only restore when it is allowed."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.payload = Payload()
+
+
+def write_circles(path: str, entities: list):
+    for entity_id, entity in enumerate(entities):
+        entity.entity_id = entity_id
+    Snapshot.write_snapshot(path, tuple(entities), 0, len(entities))
+
+
+def test_unknown_attribute_classes_are_only_restored_when_allowed(tmp_path):
+    path = str(tmp_path / "payload.snap")
+    write_circles(path, [PayloadCircle(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))])
+    with pytest.raises(ValueError):
+        Snapshot.read_snapshot(path)
+    entities, _, _, _ = Snapshot.read_snapshot(path, allowed_classes=(Payload,))
+    assert isinstance(entities[0].payload, Payload)
+
+
+class Exploit:
+    def __reduce__(self):
+        return print, ("snapshot code ran",)
+
+
+def test_crafted_state_cannot_call_functions(tmp_path):
+    path = str(tmp_path / "crafted.snap")
+    write_circles(path, [GravityCircle(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))])
+    with open(path, "r+b") as file:
+        data = file.read()
+        blob = pickle.dumps({}, protocol=pickle.HIGHEST_PROTOCOL)
+        file.seek(len(data) - len(blob) - Snapshot.OBJECTS_HEADER.size)
+        crafted = pickle.dumps({"contact_impulses": Exploit()})
+        file.write(Snapshot.OBJECTS_HEADER.pack(len(crafted)))
+        file.write(crafted)
+    with pytest.raises(ValueError):
+        Snapshot.read_snapshot(path)
+
+
+def test_other_versions_are_rejected(tmp_path):
+    path = str(tmp_path / "version.snap")
+    write_circles(path, [GravityCircle(0, 0, 5, (255, 255, 255), pygame.Vector2(0, 0))])
+    with open(path, "r+b") as file:
+        file.seek(len(Snapshot.MAGIC))
+        file.write(struct.pack("<H", Snapshot.VERSION + 1))
+    with pytest.raises(ValueError, match="version"):
+        Snapshot.read_snapshot(path)
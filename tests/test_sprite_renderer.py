@@ -0,0 +1,99 @@
+import pygame
+import pytest
+
+from Demos.BallDemo import BallDemo
+from Demos.ForceFieldDemo import ForceFieldDemo
+from Demos.GravityDemo import GravityDemo
+from PhySimEngine.SpriteRenderer import SpriteRenderer
+from PhySimObjects.GravityCircle import GravityCircle
+
+
+class CrossedCircle(GravityCircle):
+    """Draws more than its sprite would show, so it has to be rendered on its own."""
+    __slots__ = ()
+
+    def render(self, surface: pygame.Surface):
+        super().render(surface)
+        pygame.draw.line(surface, (255, 255, 255), self.position - (10, 10), self.position + (10, 10))
+
+
+def render_frame(cls, **overrides) -> bytes:
+    scenario = cls(seed=1, **overrides)
+    scenario.step(30)
+    scenario.render()
+    return pygame.image.tobytes(scenario.display_surface, "RGB")
+
+
+@pytest.mark.parametrize("cls", [BallDemo, ForceFieldDemo, GravityDemo])
+def test_batched_frames_match_the_entity_render_methods(cls):
+    assert render_frame(cls, batched_rendering=True) == render_frame(cls, batched_rendering=False)
+
+
+def test_sprites_are_shared_and_overridden_render_methods_are_kept():
+    scenario = BallDemo(seed=1, balls=0)
+    for x in (100, 200, 300):
+        scenario.entity_manager.add(GravityCircle(x, 100, 10, (255, 0, 0), pygame.Vector2(0, 0)))
+    scenario.entity_manager.add(CrossedCircle(400, 100, 10, (255, 0, 0), pygame.Vector2(0, 0)))
+    scenario.entity_manager.apply_changes()
+    scenario.render()
+
+    renderer: SpriteRenderer = scenario.renderer
+    assert len(renderer.sprites) == 1
+    assert len(renderer.sprite_entities) == 3
+    assert [type(entity) for entity in renderer.other_entities] == [CrossedCircle]
+    assert scenario.display_surface.get_at((395, 95))[:3] == (255, 255, 255)
+
+
+@pytest.mark.parametrize("cls, max_dirty_fraction", [(BallDemo, 0.25), (BallDemo, 1.0), (ForceFieldDemo, 1.0)])
+def test_dirty_frames_match_full_frames(cls, max_dirty_fraction):
+    scenario = cls(headless=True, seed=1, balls=40)
+    size = (scenario.width, scenario.height)
+    full_surface, dirty_surface = pygame.Surface(size), pygame.Surface(size)
+    full, dirty = SpriteRenderer(), SpriteRenderer(max_dirty_fraction=max_dirty_fraction)
+    partial_frames = 0
+    for _ in range(240):
+        scenario.step()
+        full.render(full_surface, scenario.entity_manager, (0, 20, 30))
+        dirty_rects = dirty.render_dirty(dirty_surface, scenario.entity_manager, (0, 20, 30))
+        partial_frames += dirty_rects is not None
+        assert pygame.image.tobytes(dirty_surface, "RGB") == pygame.image.tobytes(full_surface, "RGB")
+    assert partial_frames > 0
+
+
+def test_dirty_rendering_only_redraws_what_changed():
+    scenario = BallDemo(headless=True, seed=1, balls=0)
+    resting = GravityCircle(100, 758, 10, (255, 0, 0), pygame.Vector2(0, 0))
+    falling = GravityCircle(500, 100, 10, (0, 255, 0), pygame.Vector2(0, 0))
+    scenario.entity_manager.add(resting)
+    scenario.entity_manager.add(falling)
+    scenario.entity_manager.apply_changes()
+    surface = pygame.Surface((scenario.width, scenario.height))
+    renderer = SpriteRenderer(max_dirty_fraction=1.0)
+    assert renderer.render_dirty(surface, scenario.entity_manager, (0, 20, 30)) is None
+
+    # A tick only moves the falling ball by a fraction of a pixel, its sprite moves within a few.
+    scenario.step(36)
+    dirty_rects = renderer.render_dirty(surface, scenario.entity_manager, (0, 20, 30))
+    assert len(dirty_rects) == 1 and dirty_rects[0].collidepoint(falling.position)
+    assert renderer.render_dirty(surface, scenario.entity_manager, (0, 20, 30)) == []
+
+    # New entities and a new background redraw the whole surface.
+    scenario.entity_manager.add(GravityCircle(300, 300, 10, (0, 0, 255), pygame.Vector2(0, 0)))
+    scenario.entity_manager.apply_changes()
+    assert renderer.render_dirty(surface, scenario.entity_manager, (0, 20, 30)) is None
+    assert renderer.render_dirty(surface, scenario.entity_manager, (20, 0, 30)) is None
+
+
+def test_frames_without_a_tick_are_skipped(monkeypatch):
+    scenario = BallDemo(seed=1, balls=20, dirty_rendering=True)
+    calls = []
+    render_dirty = scenario.renderer.render_dirty
+    monkeypatch.setattr(scenario.renderer, "render_dirty", lambda *args: calls.append(args) or render_dirty(*args))
+    scenario.render()
+    scenario.render()
+    assert len(calls) == 1
+    scenario.step()
+    scenario.render()
+    scenario.pause()
+    scenario.render()
+    assert len(calls) == 3
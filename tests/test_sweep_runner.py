@@ -0,0 +1,41 @@
+import csv
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.SweepRunner import SweepRunner
+
+
+def without_times(rows: list[dict]) -> list[dict]:
+    return [{key: value for key, value in row.items() if key != "seconds"} for row in rows]
+
+
+def test_grid_runs_every_combination_in_order():
+    sweep = SweepRunner(BallDemo, {"restitution": [0.3, 0.9], "seed": [0, 1]}, ticks=30, workers=1)
+    rows = sweep.run()
+    assert [(row["restitution"], row["seed"]) for row in rows] == [(0.3, 0), (0.3, 1), (0.9, 0), (0.9, 1)]
+    assert all(row["ticks"] == 30 and row["entities"] == 200 for row in rows)
+
+
+def test_parallel_runs_reproduce_the_serial_ones():
+    grid = {"balls": [20, 50], "seed": [0, 1]}
+    serial = SweepRunner(BallDemo, grid, ticks=60, workers=1).run()
+    parallel = SweepRunner(BallDemo, grid, ticks=60, workers=2).run()
+    assert without_times(parallel) == without_times(serial)
+    assert serial[0]["kinetic_energy"] != serial[1]["kinetic_energy"]
+
+
+def test_rows_are_written_as_csv(tmp_path):
+    rows = SweepRunner(BallDemo, {"seed": [0, 1]}, ticks=10, workers=1).run()
+    path = tmp_path / "sweep.csv"
+    SweepRunner.write_csv(rows, str(path))
+    with open(path, newline="") as file:
+        written = list(csv.DictReader(file))
+    assert [row["seed"] for row in written] == ["0", "1"]
+    assert list(written[0]) == list(rows[0])
+
+
+def test_parallel_runs_finish_after_a_window_was_opened():
+    # SDL ignores SIGTERM from then on, also in the forked workers.
+    scenario = BallDemo(seed=0, balls=3)
+    scenario.render()
+    rows = SweepRunner(BallDemo, {"seed": [0, 1, 2]}, ticks=10, workers=2).run()
+    assert [row["seed"] for row in rows] == [0, 1, 2]
@@ -0,0 +1,66 @@
+import random
+
+import pygame
+import pytest
+
+from Demos.GravityDemo import GravityDemo
+from PhySimObjects.CircleOrbital import CircleOrbital
+from PhySimObjects.PhysicsHandlers.GlobalGravity import GlobalGravity
+
+
+def create_bodies(count: int) -> list[CircleOrbital]:
+    generator = random.Random(0)
+    bodies = [CircleOrbital(generator.uniform(0, 800), generator.uniform(0, 600), 5, (255, 255, 255),
+                            pygame.Vector2(0, 0), mass=generator.uniform(1, 1000)) for _ in range(count)]
+    # Bodies on top of each other, closer than the softening distance and without mass.
+    bodies[1].position.update(bodies[0].position)
+    bodies[2].position.update(bodies[0].position.x + 3, bodies[0].position.y)
+    bodies[3].mass = 0
+    return bodies
+
+
+def test_pair_forces_match_the_per_body_sum():
+    bodies = create_bodies(60)
+    gravity = GlobalGravity(0.1)
+    gravity.compute_pair_forces(tuple(bodies), 0)
+    for body in bodies:
+        expected = pygame.Vector2(0, 0)
+        for other in bodies:
+            if other is not body:
+                gravity.add_gravitational_force(expected, body.position, body.get_mass(), other.position,
+                                                other.get_mass())
+        force = pygame.Vector2(0, 0)
+        gravity.add_pair_force(body, force)
+        assert tuple(force) == pytest.approx(tuple(expected), rel=1e-9, abs=1e-9)
+    assert gravity.pair_forces_x[3] == gravity.pair_forces_y[3] == 0
+
+
+def test_pair_forces_conserve_momentum():
+    bodies = create_bodies(60)
+    gravity = GlobalGravity(0.1)
+    gravity.compute_pair_forces(tuple(bodies), 0)
+    largest = max(map(abs, gravity.pair_forces_x + gravity.pair_forces_y))
+    assert abs(sum(gravity.pair_forces_x)) < largest * 1e-12
+    assert abs(sum(gravity.pair_forces_y)) < largest * 1e-12
+
+
+def test_pairs_are_evaluated_once_per_force_evaluation():
+    scenario = GravityDemo(headless=True, seed=0)
+    gravity = scenario.global_gravity_handler
+    assert gravity.uses_pair_forces() and not GlobalGravity(0.1, theta=0.5).uses_pair_forces()
+    scenario.step()
+    forces = gravity.pair_forces_x
+    assert gravity.is_pair_forces_current(scenario.force_evaluations)
+    assert len(forces) == len(scenario.entity_manager.entities_of(CircleOrbital))
+    scenario.step()
+    assert gravity.pair_forces_x is not forces
+
+
+def test_orbits_match_the_per_body_sum():
+    symmetric = GravityDemo(headless=True, seed=0)
+    per_body = GravityDemo(headless=True, seed=0)
+    per_body.global_gravity_handler.symmetric = False
+    symmetric.step(240)
+    per_body.step(240)
+    for entity, other in zip(symmetric.entity_manager.get_entities(), per_body.entity_manager.get_entities()):
+        assert tuple(entity.position) == pytest.approx(tuple(other.position), rel=1e-6)
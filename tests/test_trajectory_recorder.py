@@ -0,0 +1,64 @@
+import pytest
+
+from Demos.BallDemo import BallDemo
+from PhySimEngine.TrajectoryRecorder import TrajectoryReader, TrajectoryRecorder
+
+
+def get_records(scenario, tick: int) -> list:
+    return [(tick, entity.entity_id, entity.position.x, entity.position.y, entity.velocity.x, entity.velocity.y)
+            for entity in scenario.entity_manager.get_entities()]
+
+
+def test_reader_returns_the_recorded_states_by_tick(tmp_path):
+    path = str(tmp_path / "balls.traj")
+    scenario = BallDemo(headless=True, seed=0, balls=30, recorder=TrajectoryRecorder(path, every=2, chunk_records=7))
+    expected = {}
+    for tick in range(1, 21):
+        scenario.step()
+        if tick % 2 == 0:
+            expected[tick] = get_records(scenario, tick)
+    scenario.close()
+
+    reader = TrajectoryReader(path)
+    try:
+        assert reader.get_ticks() == list(range(0, 21, 2))
+        assert len(reader) == 11 * 30
+        for tick, records in expected.items():
+            assert reader.get_tick(tick) == records
+        assert reader.get_tick(3) == []
+        array = reader.as_array()
+        assert list(array["tick"][::30]) == reader.get_ticks()
+        assert array["x"][-1] == expected[20][-1][2]
+    finally:
+        reader.close()
+    # Arrays outlive the reader that returned them.
+    assert array["vy"][-1] == expected[20][-1][5]
+
+
+def test_restart_from_a_snapshot_replaces_the_later_records(tmp_path):
+    path = str(tmp_path / "balls.traj")
+    snapshot = str(tmp_path / "balls.snap")
+    scenario = BallDemo(headless=True, seed=0, balls=10, recorder=TrajectoryRecorder(path))
+    scenario.step(5)
+    scenario.save_snapshot(snapshot)
+    scenario.step(5)
+    scenario.load_snapshot(snapshot)
+    scenario.step(2)
+    scenario.close()
+
+    reader = TrajectoryReader(path)
+    try:
+        assert reader.get_ticks() == list(range(8))
+    finally:
+        reader.close()
+
+
+def test_appending_with_another_interval_is_rejected(tmp_path):
+    path = str(tmp_path / "balls.traj")
+    scenario = BallDemo(headless=True, seed=0, balls=10, recorder=TrajectoryRecorder(path, every=2))
+    scenario.step(2)
+    scenario.close()
+
+    scenario = BallDemo(headless=True, seed=0, balls=10, recorder=TrajectoryRecorder(path, every=3))
+    with pytest.raises(ValueError):
+        scenario.step()